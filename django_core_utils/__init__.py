@@ -0,0 +1 @@
+default_app_config = 'django_core_utils.apps.CoreUtilsConfig'
@@ -10,16 +10,28 @@ django_core_utils admin core functionality.
 from __future__ import absolute_import
 
 from django.contrib import admin
+from django.contrib.admin.utils import model_ngettext
+from django.contrib.admin.views.main import ChangeList
 from django.contrib.auth.admin import GroupAdmin
+from django.contrib.auth.models import User
+from django.contrib.sites.models import Site
 from django.contrib.sites.shortcuts import get_current_site
+from django.core.exceptions import FieldDoesNotExist
+from django.utils.translation import ugettext_lazy as _
 
 from python_core_utils.core import class_name
 
 from . import constants
 from . import forms
+from . import search
+from .paginators import ApproximateCountPaginator
+from .signals import track_count
 
 DISPLAY_NAME_SIZE = 32
 
+# Related models too large to render as select widget choices
+RAW_ID_RELATED_MODELS = (User, Site)
+
 
 def create_admin_class(target_class_name,
                        base_classes,
@@ -40,18 +52,38 @@ def admin_class_name(clasz):
     return class_name(clasz) + "Admin"
 
 
+def raw_id_related_fields(clasz, excluded=()):
+    """
+    Return editable relation fields to large related tables
+    """
+    return tuple(
+        field.name for field in clasz._meta.get_fields()
+        if (field.many_to_one or field.many_to_many) and
+        not field.auto_created and field.editable and
+        field.related_model in RAW_ID_RELATED_MODELS and
+        field.name not in excluded)
+
+
 def admin_site_register(clasz, base_classes, attrs):
     """
     Register model class with admin site
     Dynamically create the associated admin class
+    Relations to large tables use raw id widgets unless
+    raw_id_fields is included in attrs
     """
+    admin_class = create_admin_class(
+        admin_class_name(clasz),
+        base_classes,
+        attrs)
+    if 'raw_id_fields' not in attrs:
+        excluded = (tuple(admin_class.raw_id_fields) +
+                    tuple(admin_class.readonly_fields) +
+                    tuple(getattr(admin_class, 'autocomplete_fields', ())))
+        admin_class.raw_id_fields = (
+            tuple(admin_class.raw_id_fields) +
+            raw_id_related_fields(clasz, excluded))
 
-    admin.site.register(
-        clasz,
-        create_admin_class(
-            admin_class_name(clasz),
-            base_classes,
-            attrs))
+    admin.site.register(clasz, admin_class)
 
 
 def name_model_fields():
@@ -131,6 +163,105 @@ def core_display_list_fields():
     return ("id", "update_time", "update_user")
 
 
+def list_select_related_fields(model, list_display):
+    """Return foreign key names displayed in a change list.
+    """
+    names = []
+    for name in list_display:
+        try:
+            field = model._meta.get_field(name)
+        except FieldDoesNotExist:
+            continue
+        if field.many_to_one and name != field.attname:
+            names.append(name)
+    return tuple(names)
+
+
+def list_only_fields(model_admin, model, list_display):
+    """Return model fields required to display change list rows.
+
+    Callables contribute their admin_order_field.  Returns None when
+    a column cannot be mapped to a model field, in which case all
+    fields have to be loaded.
+    """
+    opts = model._meta
+    names = [opts.pk.name]
+    for name in list_display:
+        try:
+            names.append(opts.get_field(name).name)
+            continue
+        except FieldDoesNotExist:
+            pass
+        attr = name if callable(name) else (
+            getattr(model_admin, name, None) or getattr(model, name, None))
+        order_field = getattr(attr, 'admin_order_field', None)
+        if not order_field or '__' in order_field:
+            return None
+        try:
+            names.append(opts.get_field(order_field).name)
+        except FieldDoesNotExist:
+            return None
+    return tuple(sorted(set(names), key=names.index))
+
+
+class VersionedChangeList(ChangeList):
+    """Change list loading only the displayed columns.
+
+    Only result rows are deferred, action querysets load complete
+    instances.
+    """
+    def get_results(self, request):
+        fields = self.model_admin.get_list_only_fields(request)
+        if fields:
+            self.queryset = self.queryset.only(*fields)
+        super(VersionedChangeList, self).get_results(request)
+
+
+def report_action(modeladmin, request, queryset, count, action_name):
+    """Report the number of instances updated by an action.
+    """
+    modeladmin.message_user(
+        request,
+        _("Successfully %(action)s %(count)d %(items)s.") % {
+            "action": action_name, "count": count,
+            "items": model_ngettext(queryset.model, count)})
+
+
+def enable_selected(modeladmin, request, queryset):
+    """Enable selected instances using a single update."""
+    count = queryset.filter(enabled=False).versioned_update(
+        user=request.user, enabled=True)
+    report_action(modeladmin, request, queryset, count, _("enabled"))
+enable_selected.short_description = _(
+    "Enable selected %(verbose_name_plural)s")
+
+
+def disable_selected(modeladmin, request, queryset):
+    """Disable selected instances using a single update."""
+    count = queryset.filter(enabled=True).versioned_update(
+        user=request.user, enabled=False)
+    report_action(modeladmin, request, queryset, count, _("disabled"))
+disable_selected.short_description = _(
+    "Disable selected %(verbose_name_plural)s")
+
+
+def soft_delete_selected(modeladmin, request, queryset):
+    """Logically delete selected instances using a single update."""
+    count = queryset.soft_delete(user=request.user)
+    report_action(modeladmin, request, queryset, count, _("deleted"))
+soft_delete_selected.short_description = _(
+    "Soft delete selected %(verbose_name_plural)s")
+
+
+def restore_selected(modeladmin, request, queryset):
+    """Restore logically deleted instances using a single update."""
+    count = queryset.filter(deleted=True).versioned_update(
+        user=request.user, deleted=False)
+    report_action(modeladmin, request, queryset, count, _("restored"))
+restore_selected.short_description = _(
+    "Restore selected %(verbose_name_plural)s")
+
+
 class GroupAdmin(GroupAdmin):
     """
     Override GroupAdmin to allow user management
@@ -169,9 +300,43 @@ class VersionedModelAdmin(ModelAdminMixin, admin.ModelAdmin):
         "site", "update_time", "update_user", "effective_user",
         "uuid", "version")
     ordering = ("id",)
+    paginator = ApproximateCountPaginator
+    show_full_result_count = False
+    actions = (enable_selected, disable_selected,
+               soft_delete_selected, restore_selected)
 
     limit_qs_to_request_user = False
 
+    # Fields loaded for change list rows; inferred from list_display
+    # when None, disabled when empty.
+    list_only_fields = None
+
+    def __init__(self, model, admin_site):
+        super(VersionedModelAdmin, self).__init__(model, admin_site)
+        if issubclass(self.paginator, ApproximateCountPaginator):
+            track_count(model)
+
+    def get_list_select_related(self, request):
+        """Return related fields joined in change list queries.
+
+        Unless set explicitly, inferred from the foreign keys in
+        list_display so each row costs no additional queries.
+        """
+        if self.list_select_related is not False:
+            return self.list_select_related
+        return list_select_related_fields(
+            self.model, self.get_list_display(request))
+
+    def get_list_only_fields(self, request):
+        """Return fields loaded for change list rows, None for all."""
+        if self.list_only_fields is not None:
+            return self.list_only_fields
+        return list_only_fields(self, self.model,
+                                self.get_list_display(request))
+
+    def get_changelist(self, request, **kwargs):
+        return VersionedChangeList
+
     def save_model(self, request, obj, form, change):
         """Given a model instance save it to the database.
 
@@ -220,6 +385,13 @@ class BaseNamedModelAdmin(VersionedModelAdmin):
     get_alias.short_description = "alias"
     get_alias.admin_order_field = "alias"
 
+    def get_search_results(self, request, queryset, search_term):
+        """Use the full text index of registered models."""
+        if search_term and search.is_registered(self.model):
+            return search.search(queryset, search_term), False
+        return super(BaseNamedModelAdmin, self).get_search_results(
+            request, queryset, search_term)
+
     def get_queryset(self, request):
         # Eliminate 'UNKNOWN' from the result set for 'most' users
         # @TODO: revisit approach; impacts performance, usability
@@ -12,3 +12,7 @@ class CoreUtilsConfig(AppConfig):
     """CoreUtils application configuration class.
     """
     name = 'django_core_utils'
+
+    def ready(self):
+        from .signals import connect_signals
+        connect_signals()
@@ -0,0 +1,202 @@
+"""
+.. module::  django_core_utils.bulk
+   :synopsis:  django_core_utils bulk data loading module.
+
+django_core_utils bulk data loading module.
+The *bulk* module implements set based helpers for loading versioned
+model data, maintaining version and update time, normalized name keys,
+cached row counts and full text indexes as instances are saved.
+"""
+from __future__ import absolute_import
+
+from collections import OrderedDict
+
+from django.db import connections, transaction
+from django.db.models import Case, Q, Value, When
+
+from . import counters, search
+from .paginators import adjust_cached_count
+
+UPSERT_BATCH_SIZE = 500
+USER_FIELDS = ("creation_user", "update_user", "effective_user")
+NAME_KEY_FIELDS = ("name_key", "alias_key")
+
+
+def supports_native_upsert(connection):
+    """Check if connection supports INSERT ... ON CONFLICT DO UPDATE."""
+    if connection.vendor == "postgresql":
+        return True
+    if connection.vendor == "sqlite":
+        return connection.Database.sqlite_version_info >= (3, 24, 0)
+    return False
+
+
+def _field_value(field, obj):
+    return field.to_python(getattr(obj, field.attname))
+
+
+def native_upsert(model, key_field, objs, update_fields, connection):
+    """Insert or update objs with one INSERT ... ON CONFLICT per batch.
+
+    Conflicting rows have update_fields replaced and their version
+    incremented; inserted rows keep the version of the instance.
+    """
+    opts = model._meta
+    qn = connection.ops.quote_name
+    table = qn(opts.db_table)
+    fields = [field for field in opts.local_concrete_fields
+              if field is not opts.pk]
+    assignments = ["{0} = excluded.{0}".format(qn(field.column))
+                   for field in update_fields]
+    assignments.append("{0} = {1}.{0} + 1".format(qn("version"), table))
+    sql = "INSERT INTO {} ({}) VALUES {{}} ON CONFLICT ({}) " \
+        "DO UPDATE SET {}".format(
+            table, ", ".join(qn(field.column) for field in fields),
+            qn(key_field.column), ", ".join(assignments))
+    row = "({})".format(", ".join(["%s"] * len(fields)))
+    batch_size = max(connection.ops.bulk_batch_size(fields, objs), 1)
+    with connection.cursor() as cursor:
+        for start in range(0, len(objs), batch_size):
+            batch = objs[start:start + batch_size]
+            params = []
+            for obj in batch:
+                params.extend(
+                    field.get_db_prep_save(field.pre_save(obj, True),
+                                           connection)
+                    for field in fields)
+            cursor.execute(sql.format(", ".join([row] * len(batch))), params)
+
+
+def update_rows(manager, key_field, objs, fields, user=None):
+    """Update fields of the existing rows of objs with CASE updates.
+
+    One versioned update is issued per batch, split at the backend
+    query parameter limit, so that no full rows are inserted for
+    existing instances.
+    """
+    connection = connections[manager.db]
+    # parameters per row: the key condition and value of each field,
+    # and the key filter
+    size = max(connection.ops.bulk_batch_size(
+        fields * 2 + [key_field], objs), 1)
+    for start in range(0, len(objs), size):
+        chunk = objs[start:start + size]
+        keys = [_field_value(key_field, obj) for obj in chunk]
+        values = dict(
+            (field.attname, Case(*[
+                When(Q(**{key_field.attname: obj_key}), then=Value(
+                    getattr(obj, field.attname), output_field=field))
+                for obj, obj_key in zip(chunk, keys)], output_field=field))
+            for field in fields)
+        manager.filter(**{"{}__in".format(key_field.attname): keys}).\
+            versioned_update(user=user, **values)
+
+
+def upsert(manager, records, key="name", update_fields=None,
+           batch_size=UPSERT_BATCH_SIZE, user=None, site=None):
+    """Insert or update instances identified by a unique key field.
+
+    Existing rows are read with one query per batch to classify records
+    as created, updated or unchanged.  Created records are then written
+    with INSERT ... ON CONFLICT where the backend supports it, otherwise
+    with bulk_create, and changed rows with CASE updates.
+    Version, update time, users and normalized name keys are maintained.
+    Of records sharing a key, only the last one is written.
+
+    :param manager: Model manager.
+    :type manager: Manager.
+    :param records: Field value dicts, each including key.
+    :type records: iterable.
+    :param key: Unique key field name.
+    :type key: str.
+    :param update_fields: Field names compared and updated; defaults
+        to the fields present in records.
+    :type update_fields: list.
+    :param batch_size: Number of records per batch.
+    :type batch_size: int.
+    :param user: Creation, update and effective user.
+    :type user: User.
+    :param site: Site of created instances.
+    :type site: Site.
+    :returns:  dict of created, updated and unchanged counts.
+    """
+    model = manager.model
+    opts = model._meta
+    key_field = opts.get_field(key)
+    unique_records = OrderedDict()
+    for record in records:
+        unique_records[key_field.to_python(record[key])] = record
+    records = list(unique_records.values())
+    if update_fields is None:
+        names = set()
+        for record in records:
+            names.update(record)
+        names.discard(key)
+        update_fields = sorted(names)
+    compared = [opts.get_field(name) for name in update_fields]
+    written = list(compared)
+    if hasattr(model, "set_name_keys") and \
+            set(update_fields).intersection(("name", "alias")):
+        written.extend(opts.get_field(name) for name in NAME_KEY_FIELDS)
+    maintained = ["update_time"]
+    if user is not None:
+        maintained.extend(("update_user", "effective_user"))
+    written.extend(opts.get_field(name) for name in maintained)
+
+    connection = connections[manager.db]
+    native = key_field.unique and supports_native_upsert(connection)
+    defaults = {}
+    if user is not None:
+        defaults.update((name, user) for name in USER_FIELDS)
+    if site is not None:
+        defaults["site"] = site
+    counts = dict(created=0, updated=0, unchanged=0)
+
+    with transaction.atomic(using=manager.db):
+        for start in range(0, len(records), batch_size):
+            objs = []
+            for record in records[start:start + batch_size]:
+                values = dict(defaults)
+                values.update(record)
+                obj = model(**values)
+                if hasattr(obj, "set_name_keys"):
+                    obj.set_name_keys()
+                objs.append(obj)
+            keys = [_field_value(key_field, obj) for obj in objs]
+            existing = dict(
+                (row[0], row[1:]) for row in manager.filter(
+                    **{"{}__in".format(key): keys}).order_by().values_list(
+                        key, *[field.attname for field in compared]))
+
+            created, changed = [], []
+            for obj, obj_key in zip(objs, keys):
+                if obj_key not in existing:
+                    obj.version += 1
+                    created.append(obj)
+                elif tuple(_field_value(field, obj)
+                           for field in compared) != existing[obj_key]:
+                    changed.append(obj)
+            counts["created"] += len(created)
+            counts["updated"] += len(changed)
+            counts["unchanged"] += len(objs) - len(created) - len(changed)
+            if not created and not changed:
+                continue
+
+            if native:
+                native_upsert(model, key_field, created, written, connection)
+            else:
+                manager.bulk_create(created)
+            update_rows(manager, key_field, changed, [
+                field for field in written if field.name not in maintained],
+                user)
+            counters.objects_created(model, created, manager.db)
+
+            if search.is_registered(model):
+                search.index_instances(
+                    model, manager.filter(**{"{}__in".format(key): [
+                        _field_value(key_field, obj)
+                        for obj in created + changed]}).values_list(
+                            "pk", *search.SEARCH_FIELDS), manager.db)
+
+    adjust_cached_count(model, counts["created"])
+    return counts
@@ -0,0 +1,97 @@
+"""
+.. module::  django_core_utils.caching
+   :synopsis:  django_core_utils response caching module.
+
+django_core_utils response caching module.
+The *caching* module implements generation counters, bumped when the
+underlying data changes, and a view mixin caching responses keyed on
+the request path and the current generation.
+"""
+from __future__ import absolute_import
+
+import hashlib
+import time
+
+from django.core.cache import cache
+from django.utils.encoding import force_bytes
+from rest_framework import status
+from rest_framework.response import Response
+
+USER_GENERATION_KEY = "django_core_utils.generation.user"
+RESPONSE_KEY_PREFIX = "django_core_utils.response"
+DEFAULT_RESPONSE_TIMEOUT = 300
+
+
+def _initial_generation():
+    # Time based, so that an evicted counter does not restart at a
+    # generation whose responses may still be cached.
+    return int(time.time() * 1000)
+
+
+def generation(key):
+    """Return current generation for key.
+    """
+    value = cache.get(key)
+    if value is None:
+        cache.add(key, _initial_generation(), None)
+        value = cache.get(key)
+    return value
+
+
+def bump_generation(key):
+    """Increment generation for key, invalidating dependent entries.
+    """
+    try:
+        return cache.incr(key)
+    except ValueError:
+        value = _initial_generation()
+        cache.set(key, value, None)
+        return value
+
+
+def hexdigest(*parts):
+    """Return a digest of parts suitable for cache keys and ETags.
+    """
+    return hashlib.md5(force_bytes(":".join(
+        str(part) for part in parts))).hexdigest()
+
+
+class CachedResponseMixin(object):
+    """View mixin caching successful GET responses.
+
+    Response data is cached under a key derived from the view, the
+    full request path, the accepted format and the generation stored
+    under cache_generation_key.  Bumping the generation invalidates all
+    entries.  Responses carry an ETag, and requests with a matching
+    If-None-Match header receive a 304 response.
+    """
+    cache_generation_key = None
+    cache_timeout = DEFAULT_RESPONSE_TIMEOUT
+
+    def response_cache_key(self, request):
+        """Return response cache key."""
+        renderer = getattr(request, "accepted_renderer", None)
+        return "{}.{}.{}".format(
+            RESPONSE_KEY_PREFIX,
+            self.__class__.__name__,
+            hexdigest(generation(self.cache_generation_key),
+                      request.get_full_path(),
+                      getattr(renderer, "format", "")))
+
+    def get(self, request, *args, **kwargs):
+        key = self.response_cache_key(request)
+        etag = '"{}"'.format(hexdigest(key))
+        if etag in request.META.get("HTTP_IF_NONE_MATCH", ""):
+            response = Response(status=status.HTTP_304_NOT_MODIFIED)
+        else:
+            data = cache.get(key)
+            if data is None:
+                response = super(CachedResponseMixin, self).get(
+                    request, *args, **kwargs)
+                if response.status_code != status.HTTP_200_OK:
+                    return response
+                cache.set(key, response.data, self.cache_timeout)
+            else:
+                response = Response(data)
+        response["ETag"] = etag
+        return response
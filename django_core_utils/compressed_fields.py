@@ -0,0 +1,173 @@
+"""
+.. module::  django_core_utils.compressed_fields
+   :synopsis:  django_core_utils compressed text model fields module.
+
+django_core_utils compressed text model fields module.
+The *compressed_fields* module implements a text model field stored
+compressed in a binary column, for large and rarely read text such as
+descriptions.  Stored values start with a header byte identifying the
+compression; values shorter than a threshold are stored uncompressed.
+Values are decompressed on first attribute access.
+"""
+from __future__ import absolute_import
+
+import zlib
+
+from django import forms
+from django.core.exceptions import ImproperlyConfigured
+from django.db import DEFAULT_DB_ALIAS, connections, models, transaction
+from django.utils import six
+
+from .json_fields import LazyDecodingDescriptor
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover
+    zstandard = None
+
+HEADER_RAW = b"\x00"
+HEADER_ZLIB = b"\x01"
+HEADER_ZSTD = b"\x02"
+COMPRESSION_THRESHOLD = 256
+ZLIB = "zlib"
+ZSTD = "zstd"
+MIGRATION_BATCH_SIZE = 1000
+
+
+class EncodedBytes(six.binary_type):
+    """Database value of a compressed text field, not yet decoded."""
+
+
+def compress_text(value, compression=ZLIB, threshold=COMPRESSION_THRESHOLD):
+    """Return text as header prefixed, possibly compressed, bytes."""
+    data = value.encode("utf-8")
+    if len(data) < threshold:
+        return HEADER_RAW + data
+    if compression == ZSTD:
+        compressed = HEADER_ZSTD + zstandard.ZstdCompressor().compress(data)
+    else:
+        compressed = HEADER_ZLIB + zlib.compress(data)
+    if len(compressed) >= len(data) + 1:
+        return HEADER_RAW + data
+    return compressed
+
+
+def decompress_text(value):
+    """Return the text of header prefixed, possibly compressed, bytes."""
+    value = bytes(value)
+    header, data = value[:1], value[1:]
+    if header == HEADER_ZLIB:
+        data = zlib.decompress(data)
+    elif header == HEADER_ZSTD:
+        if zstandard is None:
+            raise ImproperlyConfigured(
+                "zstandard is required to read zstd compressed text")
+        data = zstandard.ZstdDecompressor().decompress(data)
+    return data.decode("utf-8")
+
+
+class CompressedTextField(models.BinaryField):
+    """Text stored compressed in a binary column.
+
+    :param compression: zlib, or zstd when zstandard is installed.
+    :param threshold: Minimum encoded size, in bytes, compressed.
+    """
+    description = "Compressed text"
+    encoded_type = EncodedBytes
+
+    def __init__(self, *args, **kwargs):
+        self.compression = kwargs.pop("compression", ZLIB)
+        self.threshold = kwargs.pop("threshold", COMPRESSION_THRESHOLD)
+        if self.compression == ZSTD and zstandard is None:
+            raise ImproperlyConfigured(
+                "zstandard is required for zstd compressed text")
+        kwargs.setdefault("editable", True)
+        super(CompressedTextField, self).__init__(*args, **kwargs)
+
+    def deconstruct(self):
+        name, path, args, kwargs = super(
+            CompressedTextField, self).deconstruct()
+        if self.compression != ZLIB:
+            kwargs["compression"] = self.compression
+        if self.threshold != COMPRESSION_THRESHOLD:
+            kwargs["threshold"] = self.threshold
+        return name, path, args, kwargs
+
+    def contribute_to_class(self, cls, name, *args, **kwargs):
+        super(CompressedTextField, self).contribute_to_class(
+            cls, name, *args, **kwargs)
+        setattr(cls, self.attname, LazyDecodingDescriptor(self))
+
+    def decode(self, value):
+        """Decode a database value."""
+        return decompress_text(value)
+
+    def from_db_value(self, value, *args):
+        if value is None:
+            return value
+        return EncodedBytes(value)
+
+    def to_python(self, value):
+        if isinstance(value, EncodedBytes):
+            return self.decode(value)
+        return value
+
+    def get_prep_value(self, value):
+        if value is None:
+            return value
+        if isinstance(value, EncodedBytes):
+            return value
+        return compress_text(six.text_type(value), self.compression,
+                             self.threshold)
+
+    def value_to_string(self, obj):
+        return self.to_python(self.value_from_object(obj))
+
+    def formfield(self, **kwargs):
+        defaults = dict(form_class=forms.CharField, widget=forms.Textarea)
+        defaults.update(kwargs)
+        return models.Field.formfield(self, **defaults)
+
+
+def compress_column(model, source, target, batch_size=MIGRATION_BATCH_SIZE,
+                    using=DEFAULT_DB_ALIAS):
+    """Copy a text column into a compressed text column in batches.
+
+    Intended for data migrations, between adding the compressed field
+    and removing the text field, e.g.:
+
+        def forwards(apps, schema_editor):
+            compress_column(apps.get_model('app', 'Model'),
+                            'description', 'compressed_description')
+
+    Each batch is written in its own transaction by CASE updates, one
+    per batch unless split at the backend query parameter limit.
+
+    :returns:  Number of updated rows.
+    """
+    field = model._meta.get_field(target)
+    operations = connections[using].ops
+    queryset = model._default_manager.using(using).order_by("pk")
+    count = 0
+    last_pk = None
+    while True:
+        batch = queryset if last_pk is None else queryset.filter(
+            pk__gt=last_pk)
+        rows = list(batch.values_list("pk", source)[:batch_size])
+        if not rows:
+            break
+        values = [(pk, value) for pk, value in rows if value is not None]
+        # parameters per row: the pk condition, value and pk filter
+        size = max(
+            operations.bulk_batch_size([source, target, "pk"], values), 1)
+        with transaction.atomic(using=using):
+            for start in range(0, len(values), size):
+                chunk = values[start:start + size]
+                count += queryset.filter(
+                    pk__in=[pk for pk, _ in chunk]).update(**{
+                        target: models.Case(*[
+                            models.When(pk=pk, then=models.Value(
+                                value, output_field=field))
+                            for pk, value in chunk], output_field=field)})
+        last_pk = rows[-1][0]
+    return count
@@ -12,5 +12,8 @@ HTTP_POST = "POST"
 HTTP_DELETE = "DELETE"
 HTTP_PUT = "PUT"
 
+QUERY_PARAM_IDS = "ids"
+QUERY_PARAM_UUIDS = "uuids"
+
 SITE_LABEL = "sl"
 UNKNOWN = "UNKNOWN"
@@ -0,0 +1,252 @@
+"""
+.. module::  django_core_utils.counters
+   :synopsis:  django_core_utils denormalized related counts module.
+
+django_core_utils denormalized related counts module.
+The *counters* module implements a counter model field holding the
+number of related instances of an owner, either the members of one of
+its many to many fields or the children referring to it through a
+foreign key.  Counters are maintained incrementally by signals, the
+many to many sync helper and bulk upserts, and recomputed in batches
+by reconcile_counters, e.g. with the reconcile_counters command:
+
+    class Team(VersionedModel):
+        members = fields.many_to_many_field(User)
+        member_count = counter_field('members')
+        project_count = counter_field(('projects.Project', 'team'))
+"""
+from __future__ import absolute_import
+
+from collections import Counter, defaultdict
+
+from django.apps import apps
+from django.db import DEFAULT_DB_ALIAS, models
+from django.db.models import Count, F
+from django.db.models.signals import (m2m_changed, post_delete, post_init,
+                                      post_save)
+from django.utils import six
+
+RECONCILE_BATCH_SIZE = 1000
+_MISSING = object()
+
+# child model -> [(foreign key, owner model, counter field name)]
+_children = defaultdict(list)
+# through model -> [(many to many field, owner model, counter field name)]
+_members = defaultdict(list)
+
+
+class CounterField(models.IntegerField):
+    """Denormalized count of related instances.
+
+    :param relation: Name of a many to many field of the model, or a
+        (model or 'app_label.Model', foreign key name) pair of
+        children referring to the model.
+    """
+    description = "Related instance count"
+
+    def __init__(self, relation, *args, **kwargs):
+        self.relation = relation
+        kwargs.setdefault("default", 0)
+        kwargs.setdefault("editable", False)
+        super(CounterField, self).__init__(*args, **kwargs)
+
+    def deconstruct(self):
+        name, path, args, kwargs = super(CounterField, self).deconstruct()
+        relation = self.relation
+        if not isinstance(relation, six.string_types):
+            model, field_name = relation
+            if not isinstance(model, six.string_types):
+                model = model._meta.label
+            relation = (model, field_name)
+        args = [relation] + list(args)
+        return name, path, args, kwargs
+
+    def related_field(self):
+        """Return the many to many field or child foreign key counted."""
+        if isinstance(self.relation, six.string_types):
+            return self.model._meta.get_field(self.relation)
+        model, field_name = self.relation
+        if isinstance(model, six.string_types):
+            model = apps.get_model(model)
+        return model._meta.get_field(field_name)
+
+
+def counter_fields(model):
+    """Return the counter fields of model."""
+    return [field for field in model._meta.concrete_fields
+            if isinstance(field, CounterField)]
+
+
+def adjust_counter(model, name, pks, delta, using=DEFAULT_DB_ALIAS):
+    """Add delta to a counter of the instances with the given pks."""
+    pks = [pk for pk in pks if pk is not None]
+    if not pks or not delta:
+        return
+    model._default_manager.using(using).filter(pk__in=pks).update(
+        **{name: F(name) + delta})
+
+
+def register_counters(model):
+    """Connect the signal handlers maintaining the counters of model.
+    """
+    for field in counter_fields(model):
+        related = field.related_field()
+        if related.many_to_many:
+            through = related.remote_field.through
+            entry = (related, model, field.name)
+            if entry not in _members[through]:
+                _members[through].append(entry)
+            m2m_changed.connect(
+                _members_changed, sender=through,
+                dispatch_uid="django_core_utils.counters.members")
+        else:
+            child = related.model
+            entry = (related, model, field.name)
+            if entry not in _children[child]:
+                _children[child].append(entry)
+            post_init.connect(
+                _child_initialized, sender=child,
+                dispatch_uid="django_core_utils.counters.initialized")
+            post_save.connect(
+                _child_saved, sender=child,
+                dispatch_uid="django_core_utils.counters.saved")
+            post_delete.connect(
+                _child_deleted, sender=child,
+                dispatch_uid="django_core_utils.counters.deleted")
+
+
+def register_all_counters():
+    """Register the counters of all installed models."""
+    for model in apps.get_models():
+        register_counters(model)
+
+
+def _original_attname(attname):
+    return "_counter_original_{}".format(attname)
+
+
+def _child_initialized(sender, instance, **kwargs):
+    for foreign_key, _, _ in _children[sender]:
+        setattr(instance, _original_attname(foreign_key.attname),
+                instance.__dict__.get(foreign_key.attname, _MISSING))
+
+
+def _child_saved(sender, instance, created=False, raw=False,
+                 using=DEFAULT_DB_ALIAS, **kwargs):
+    if raw:
+        # fixtures carry counter values
+        return
+    for foreign_key, owner, name in _children[sender]:
+        original_attname = _original_attname(foreign_key.attname)
+        value = getattr(instance, foreign_key.attname)
+        original = getattr(instance, original_attname, _MISSING)
+        if created:
+            adjust_counter(owner, name, [value], 1, using)
+        elif original is not _MISSING and original != value:
+            adjust_counter(owner, name, [original], -1, using)
+            adjust_counter(owner, name, [value], 1, using)
+        setattr(instance, original_attname, value)
+
+
+def _child_deleted(sender, instance, using=DEFAULT_DB_ALIAS, **kwargs):
+    for foreign_key, owner, name in _children[sender]:
+        adjust_counter(owner, name, [getattr(instance, foreign_key.attname)],
+                       -1, using)
+
+
+def objects_created(model, objs, using=DEFAULT_DB_ALIAS):
+    """Increment counters of the owners of bulk created instances."""
+    for foreign_key, owner, name in _children.get(model, ()):
+        counts = Counter(getattr(obj, foreign_key.attname) for obj in objs)
+        for pk, count in counts.items():
+            adjust_counter(owner, name, [pk], count, using)
+
+
+def _through_columns(m2m_field):
+    through = m2m_field.remote_field.through
+    return (through._meta.get_field(m2m_field.m2m_field_name()).attname,
+            through._meta.get_field(
+                m2m_field.m2m_reverse_field_name()).attname)
+
+
+def _member_rows(m2m_field, instance, reverse, pk_set, using):
+    """Return (owner, member) id pairs of instance, within pk_set."""
+    through = m2m_field.remote_field.through
+    owner_column, member_column = _through_columns(m2m_field)
+    if reverse:
+        lookup = {member_column: instance.pk}
+        if pk_set is not None:
+            lookup["{}__in".format(owner_column)] = pk_set
+    else:
+        lookup = {owner_column: instance.pk}
+        if pk_set is not None:
+            lookup["{}__in".format(member_column)] = pk_set
+    return list(through._default_manager.using(using).filter(
+        **lookup).values_list(owner_column, member_column))
+
+
+def _members_changed(sender, instance, action, reverse, pk_set,
+                     using=DEFAULT_DB_ALIAS, **kwargs):
+    for m2m_field, owner, name in _members[sender]:
+        key = "_counter_{}_{}".format(sender._meta.label_lower, name)
+        if action in ("pre_remove", "pre_clear"):
+            # removed rows, excluding ids of non members
+            setattr(instance, key, _member_rows(
+                m2m_field, instance, reverse, pk_set, using))
+        elif action in ("post_remove", "post_clear"):
+            rows = instance.__dict__.pop(key, [])
+            owners = Counter(owner_id for owner_id, _ in rows)
+            for owner_id, count in owners.items():
+                adjust_counter(owner, name, [owner_id], -count, using)
+        elif action == "post_add" and pk_set:
+            if reverse:
+                adjust_counter(owner, name, pk_set, 1, using)
+            else:
+                adjust_counter(owner, name, [instance.pk], len(pk_set),
+                               using)
+
+
+def _actual_counts(field, pks, using):
+    related = field.related_field()
+    if related.many_to_many:
+        owner_column, _ = _through_columns(related)
+        queryset = related.remote_field.through._default_manager
+        column = owner_column
+    else:
+        queryset = related.model._default_manager
+        column = related.attname
+    rows = queryset.using(using).filter(
+        **{"{}__in".format(column): pks}).order_by().values(
+            column).annotate(count=Count("pk")).values_list(column, "count")
+    return dict(rows)
+
+
+def reconcile_counters(model, batch_size=RECONCILE_BATCH_SIZE,
+                       using=DEFAULT_DB_ALIAS):
+    """Recompute the counters of model in batches of instances.
+
+    :returns:  Number of corrected counter values.
+    """
+    fields = counter_fields(model)
+    if not fields:
+        return 0
+    queryset = model._default_manager.using(using).order_by("pk")
+    names = [field.name for field in fields]
+    corrected = 0
+    last_pk = None
+    while True:
+        batch = queryset if last_pk is None else queryset.filter(
+            pk__gt=last_pk)
+        rows = list(batch.values_list("pk", *names)[:batch_size])
+        if not rows:
+            break
+        pks = [row[0] for row in rows]
+        for index, field in enumerate(fields, 1):
+            counts = _actual_counts(field, pks, using)
+            for row in rows:
+                count = counts.get(row[0], 0)
+                if row[index] != count:
+                    corrected += queryset.filter(pk=row[0]).update(
+                        **{field.name: count})
+        last_pk = pks[-1]
+    return corrected
@@ -20,12 +20,19 @@ from django.utils.translation import gettext as _
 from macaddress.fields import MACAddressField
 from phonenumber_field.modelfields import PhoneNumberField
 from timezone_field import TimeZoneField
-from jsonfield import JSONField
 from djmoney.models.fields import MoneyField
 import moneyed
 
 from python_core_utils.core import class_name
 
+from .compressed_fields import CompressedTextField
+from .counters import CounterField
+from .json_fields import JSONField
+from .lazy_fields import (LazyMACAddressField, LazyMoneyField,
+                          LazyPhoneNumberField, LazyTimeZoneField)
+from .money_fields import MinorUnitMoneyField
+from .network_fields import PackedIPAddressField, PackedMACAddressField
+
 
 # Note: each factory function has '_field' suffix to minimize conflicts with
 # core and 3rd party python modules and foster naming consistency albeit
@@ -218,6 +225,20 @@ def text_field(**kwargs):
 URL_FIELD_MAX_LENGTH = 255
 
 
+def compressed_text_field(**kwargs):
+    """Return a new instance of compressed text model field.
+
+    Alternative to text_field for large, rarely read text; accepts
+    the compressed_fields.CompressedTextField compression and
+    threshold arguments.
+    """
+    defaults = dict(
+        blank=True,
+        null=True)
+    defaults.update(kwargs)
+    return CompressedTextField(**defaults)
+
+
 def url_field(**kwargs):
     """Return a new instance of url model field.
     """
@@ -323,15 +344,44 @@ def latitude_field(**kwargs):
     return geo_location_field(**defaults)
 
 
-def mac_address_field(**kwargs):
+def mac_address_field(lazy=False, **kwargs):
     """Return a new instance of mac address model field.
+
+    When lazy, values are decoded on first attribute access.
+    """
+    defaults = dict(
+        unique=True,
+        null=False,
+        blank=False)
+    defaults.update(kwargs)
+    return (LazyMACAddressField if lazy else MACAddressField)(**defaults)
+
+
+def packed_ip_address_field(**kwargs):
+    """Return a new instance of packed ip address model field.
+
+    Supports indexed network range lookups, e.g.
+    address__in_cidr='10.0.0.0/8'.
+    """
+    defaults = dict(
+        db_index=True,
+        null=False,
+        blank=False)
+    defaults.update(kwargs)
+    return PackedIPAddressField(**defaults)
+
+
+def packed_mac_address_field(**kwargs):
+    """Return a new instance of packed mac address model field.
+
+    Supports indexed vendor prefix lookups, e.g. mac__prefix='00:1b:63'.
     """
     defaults = dict(
         unique=True,
         null=False,
         blank=False)
     defaults.update(kwargs)
-    return MACAddressField(**defaults)
+    return PackedMACAddressField(**defaults)
 
 NAME_FIELD_MAX_LENGTH = 255
 
@@ -349,6 +399,19 @@ def name_field(**kwargs):
     return char_field(**defaults)
 
 
+def name_key_field(**kwargs):
+    """Return a new instance of normalized name lookup key model field.
+    """
+    defaults = dict(
+        max_length=NAME_FIELD_MAX_LENGTH,
+        db_index=True,
+        editable=False,
+        null=True,
+        blank=True)
+    defaults.update(kwargs)
+    return char_field(**defaults)
+
+
 def user_field(**kwargs):
     """Return a new instance of a user model field.
     """
@@ -372,25 +435,29 @@ def user_agent_field(**kwargs):
 DEFAULT_TIMEZONE = 'America/New_York'
 
 
-def timezone_field(**kwargs):
+def timezone_field(lazy=False, **kwargs):
     """Create time zone field instance.
+
+    When lazy, values are decoded on first attribute access.
     """
     defaults = dict(
         null=False,
         blank=False,
         default=DEFAULT_TIMEZONE)
     defaults.update(kwargs)
-    return TimeZoneField(**defaults)
+    return (LazyTimeZoneField if lazy else TimeZoneField)(**defaults)
 
 
-def phone_number_field(**kwargs):
+def phone_number_field(lazy=False, **kwargs):
     """Create phone number field instance.
+
+    When lazy, values are decoded on first attribute access.
     """
     defaults = dict(
         null=False,
         blank=False)
     defaults.update(kwargs)
-    return PhoneNumberField(**defaults)
+    return (LazyPhoneNumberField if lazy else PhoneNumberField)(**defaults)
 
 
 def email_field(**kwargs):
@@ -467,16 +534,23 @@ def percentage_field(**kwargs):
 
 def json_field(**kwargs):
     """Create a json field instance.
+
+    Accepts the json_fields.JSONField indexed_paths and lazy arguments,
+    e.g. json_field(indexed_paths=['status', 'owner.id']).
     """
     defaults = dict(
+        default=dict,
         null=False,
         blank=False)
     defaults.update(kwargs)
     return JSONField(**defaults)
 
 
-def money_field(**kwargs):
+def money_field(lazy=False, **kwargs):
     """Create a money field instance.
+
+    When lazy, database amounts are stored as read and Money values
+    are built, and interned, on attribute access.
     """
     defaults = dict(
         null=False,
@@ -486,4 +560,35 @@ def money_field(**kwargs):
         default=moneyed.Money('0.00', "USD"),
         default_currency="USD")
     defaults.update(kwargs)
-    return MoneyField(**defaults)
+    return (LazyMoneyField if lazy else MoneyField)(**defaults)
+
+
+def minor_unit_money_field(**kwargs):
+    """Create an integer minor unit money field instance.
+
+    Stores e.g. cents, avoiding a decimal column and Money construction
+    in aggregations; see money_fields.MoneyQuerySetMixin.
+    """
+    defaults = dict(
+        null=False,
+        blank=False,
+        decimal_places=2,
+        default=moneyed.Money('0.00', "USD"),
+        default_currency="USD")
+    defaults.update(kwargs)
+    return MinorUnitMoneyField(**defaults)
+
+
+def counter_field(relation, **kwargs):
+    """Create a denormalized related count field instance.
+
+    relation is a many to many field name of the model, or a
+    (model or 'app_label.Model', foreign key name) pair of children;
+    see counters.CounterField.
+    """
+    defaults = dict(
+        null=False,
+        blank=True,
+        default=0)
+    defaults.update(kwargs)
+    return CounterField(relation, **defaults)
@@ -0,0 +1,46 @@
+"""
+.. module::  django_core_utils.filters
+   :synopsis:  Django rest framework custom filter backends module.
+
+Django rest framework custom filter backends module.
+
+"""
+from __future__ import absolute_import
+
+from rest_framework.filters import BaseFilterBackend
+
+from . import search
+from .permissions import IsCreatorOrReadOnly
+
+
+class IsCreatorFilterBackend(BaseFilterBackend):
+    """
+    Filter backend applying the IsCreatorOrReadOnly ownership rule.
+
+    Write requests only see instances created by the request user, so
+    list, bulk and detail writes are restricted in SQL rather than by
+    checking each fetched instance.
+    """
+    permission_class = IsCreatorOrReadOnly
+
+    def filter_queryset(self, request, queryset, view):
+        return self.permission_class().filter_queryset(
+            request, queryset, view)
+
+
+class NamedModelSearchFilter(BaseFilterBackend):
+    """
+    Filter backend searching named model name, alias and description.
+
+    Results of models registered for full text search are ordered by
+    rank.  A search_limit truncates results, and should only be set when
+    this is the last filter backend.
+    """
+    search_param = 'search'
+    search_limit = None
+
+    def filter_queryset(self, request, queryset, view):
+        text = request.query_params.get(self.search_param, '').strip()
+        if not text:
+            return queryset
+        return search.search(queryset, text, self.search_limit)
@@ -11,14 +11,22 @@ from __future__ import absolute_import
 
 from django.core import validators
 from django import forms
-from django.contrib.admin.widgets import FilteredSelectMultiple
+from django.contrib import admin
+from django.contrib.admin.widgets import ManyToManyRawIdWidget
 from django.contrib.auth.models import Group, User
+from django.db.models import ManyToManyRel
 
 from python_core_utils.core import dict_merge
 
 from . import models
 from . import text
 from . import fields
+from .utils import sync_many_to_many
+
+
+def _ids(instances):
+    """Return the primary keys of instances."""
+    return [instance.pk for instance in instances]
 
 
 class VersionedModelAdminForm(forms.ModelForm):
@@ -45,15 +53,18 @@ class VersionedModelAdminForm(forms.ModelForm):
         Allows grouping of elements to manage which elements
         are in the group
         """
+        def update():
+            sync_many_to_many(getattr(group, set_name),
+                              _ids(self.cleaned_data[field_name]))
+
         if commit:
-            setattr(group, set_name,
-                    self.cleaned_data[field_name])
+            update()
         else:
             old_save_m2m = self.save_m2m
 
             def new_save_m2m():
                 old_save_m2m()
-                setattr(group, set_name, self.cleaned_data[field_name])
+                update()
             self.save_m2m = new_save_m2m
         return group
 
@@ -93,13 +104,22 @@ class OptionalNamedModelAdminForm(BasedNamedModelAdminForm):
         model = models.OptionalNamedModel
 
 
+def group_users_widget(admin_site=None):
+    """Return raw id widget for group users.
+
+    Avoids rendering every user into the change form.
+    """
+    rel = ManyToManyRel(User._meta.get_field('groups'), User)
+    return ManyToManyRawIdWidget(rel, admin_site or admin.site)
+
+
 class GroupAdminForm(forms.ModelForm):
     """
     Admin form with editable user list
     """
     users = forms.ModelMultipleChoiceField(
         queryset=User.objects.all(),
-        widget=FilteredSelectMultiple('Users', False),
+        widget=group_users_widget(),
         required=False)
 
     class Meta:
@@ -111,21 +131,26 @@ class GroupAdminForm(forms.ModelForm):
         instance = kwargs.get('instance', None)
         if instance is not None:
             initial = kwargs.get('initial', {})
-            initial['users'] = instance.user_set.all()
+            initial['users'] = instance.user_set.values_list(
+                'pk', flat=True)
             kwargs['initial'] = initial
         super(GroupAdminForm, self).__init__(*args, **kwargs)
 
     def save(self, commit=True):
         group = super(GroupAdminForm, self).save(commit=commit)
 
+        def update():
+            sync_many_to_many(group.user_set,
+                              _ids(self.cleaned_data['users']))
+
         if commit:
-            group.user_set = self.cleaned_data['users']
+            update()
         else:
             old_save_m2m = self.save_m2m
 
             def new_save_m2m():
                 old_save_m2m()
-                group.user_set = self.cleaned_data['users']
+                update()
             self.save_m2m = new_save_m2m
         return group
 
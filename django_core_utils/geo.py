@@ -0,0 +1,264 @@
+"""
+.. module::  django_core_utils.geo
+   :synopsis:  django_core_utils geo location module.
+
+django_core_utils geo location module.
+The *geo* module implements proximity queries over latitude and
+longitude pairs without a spatial database.  An indexed geohash column
+is kept in sync with the pair; within_radius and nearest prefilter
+rows by geohash cell ranges and refine by haversine distance, using
+numpy when available.
+"""
+from __future__ import absolute_import
+
+import math
+
+from django.db import models
+from django.db.models import Q
+
+from . import fields
+
+try:
+    import numpy
+except ImportError:  # pragma: no cover
+    numpy = None
+
+BASE32 = "0123456789bcdefghjkmnpqrstuvwxyz"
+# sorts after every geohash character, bounding cell prefix ranges
+PREFIX_RANGE_END = "~"
+GEOHASH_PRECISION = 12
+# finest precision tried by nearest searches
+NEAREST_PRECISION = 7
+EARTH_RADIUS_KM = 6371.0088
+KM_PER_DEGREE = math.pi * EARTH_RADIUS_KM / 180
+# instances fetched per query, within SQLite parameter limits
+FETCH_BATCH_SIZE = 500
+
+
+def geohash_encode(latitude, longitude, precision=GEOHASH_PRECISION):
+    """Return the geohash of a latitude and longitude."""
+    lat_range, lon_range = [-90.0, 90.0], [-180.0, 180.0]
+    latitude, longitude = float(latitude), float(longitude)
+    chars, bits, bit, even = [], 0, 0, True
+    while len(chars) < precision:
+        value, interval = (longitude, lon_range) if even else (
+            latitude, lat_range)
+        middle = (interval[0] + interval[1]) / 2
+        bits <<= 1
+        if value >= middle:
+            bits |= 1
+            interval[0] = middle
+        else:
+            interval[1] = middle
+        even = not even
+        bit += 1
+        if bit == 5:
+            chars.append(BASE32[bits])
+            bits, bit = 0, 0
+    return "".join(chars)
+
+
+def cell_size(precision):
+    """Return geohash cell height and width in degrees."""
+    lon_bits = (5 * precision + 1) // 2
+    lat_bits = 5 * precision // 2
+    return 180.0 / 2 ** lat_bits, 360.0 / 2 ** lon_bits
+
+
+def cell_neighbourhood(latitude, longitude, precision):
+    """Return the geohash cell of a point and its neighbour cells."""
+    height, width = cell_size(precision)
+    latitude, longitude = float(latitude), float(longitude)
+    cells = set()
+    for lat_offset in (-height, 0, height):
+        lat = latitude + lat_offset
+        if not -90 <= lat <= 90:
+            continue
+        for lon_offset in (-width, 0, width):
+            lon = (longitude + lon_offset + 180) % 360 - 180
+            cells.add(geohash_encode(lat, lon, precision))
+    return sorted(cells)
+
+
+def covering_precision(latitude, radius_km):
+    """Return the finest precision whose cells span radius_km.
+
+    Points within radius_km of a point then fall in its cell
+    neighbourhood.  Returns 0 when no cell is large enough.
+    """
+    lat_degrees = radius_km / KM_PER_DEGREE
+    # longitude span at the poleward edge of the circle
+    cos_lat = math.cos(math.radians(
+        min(abs(float(latitude)) + lat_degrees, 89.9)))
+    lon_degrees = radius_km / (KM_PER_DEGREE * cos_lat)
+    for precision in range(GEOHASH_PRECISION, 0, -1):
+        height, width = cell_size(precision)
+        if height >= lat_degrees and width >= lon_degrees:
+            return precision
+    return 0
+
+
+def cells_filter(cells, field_name="geohash"):
+    """Return a filter selecting rows in geohash cells as range scans."""
+    condition = Q()
+    for cell in cells:
+        condition |= Q(**{"{}__gte".format(field_name): cell,
+                          "{}__lt".format(field_name): cell +
+                          PREFIX_RANGE_END})
+    return condition
+
+
+def distances(latitude, longitude, latitudes, longitudes):
+    """Return haversine distances in km from a point to many points."""
+    if numpy is not None:
+        lat1, lon1 = numpy.radians(float(latitude)), numpy.radians(
+            float(longitude))
+        lat2 = numpy.radians(numpy.asarray(latitudes, dtype=float))
+        lon2 = numpy.radians(numpy.asarray(longitudes, dtype=float))
+        value = numpy.sin((lat2 - lat1) / 2) ** 2 + numpy.cos(lat1) * \
+            numpy.cos(lat2) * numpy.sin((lon2 - lon1) / 2) ** 2
+        return 2 * EARTH_RADIUS_KM * numpy.arcsin(
+            numpy.sqrt(numpy.minimum(value, 1.0)))
+    lat1, lon1 = math.radians(float(latitude)), math.radians(float(longitude))
+    cos_lat1 = math.cos(lat1)
+    result = []
+    for lat2, lon2 in zip(latitudes, longitudes):
+        lat2, lon2 = math.radians(float(lat2)), math.radians(float(lon2))
+        value = math.sin((lat2 - lat1) / 2) ** 2 + cos_lat1 * \
+            math.cos(lat2) * math.sin((lon2 - lon1) / 2) ** 2
+        result.append(2 * EARTH_RADIUS_KM * math.asin(
+            math.sqrt(min(value, 1.0))))
+    return result
+
+
+class GeohashField(models.CharField):
+    """Geohash of a latitude and longitude field pair, set on save.
+    """
+    def __init__(self, *args, **kwargs):
+        self.latitude_field = kwargs.pop("latitude_field", "latitude")
+        self.longitude_field = kwargs.pop("longitude_field", "longitude")
+        kwargs.setdefault("max_length", GEOHASH_PRECISION)
+        super(GeohashField, self).__init__(*args, **kwargs)
+
+    def deconstruct(self):
+        name, path, args, kwargs = super(GeohashField, self).deconstruct()
+        if self.latitude_field != "latitude":
+            kwargs["latitude_field"] = self.latitude_field
+        if self.longitude_field != "longitude":
+            kwargs["longitude_field"] = self.longitude_field
+        return name, path, args, kwargs
+
+    def pre_save(self, model_instance, add):
+        latitude = getattr(model_instance, self.latitude_field)
+        longitude = getattr(model_instance, self.longitude_field)
+        value = None
+        if latitude is not None and longitude is not None:
+            value = geohash_encode(latitude, longitude, self.max_length)
+        setattr(model_instance, self.attname, value)
+        return value
+
+
+def geohash_field(**kwargs):
+    """Return a new instance of geohash model field.
+    """
+    defaults = dict(
+        db_index=True,
+        editable=False,
+        null=True,
+        blank=True)
+    defaults.update(kwargs)
+    return GeohashField(**defaults)
+
+
+class GeoQuerySetMixin(object):
+    """Proximity query methods of geo located model querysets.
+    """
+    geohash_field_name = "geohash"
+    latitude_field_name = "latitude"
+    longitude_field_name = "longitude"
+
+    def _distances(self, latitude, longitude, precision):
+        """Return pks and distances of instances in the cell
+        neighbourhood of a point, or of all instances for precision 0.
+        """
+        queryset = self.order_by()
+        if precision:
+            queryset = queryset.filter(cells_filter(
+                cell_neighbourhood(latitude, longitude, precision),
+                self.geohash_field_name))
+        rows = list(queryset.values_list(
+            "pk", self.latitude_field_name, self.longitude_field_name))
+        return [row[0] for row in rows], distances(
+            latitude, longitude, [row[1] for row in rows],
+            [row[2] for row in rows])
+
+    def _ranked_instances(self, ranked):
+        """Return the instances of (distance, pk) pairs in order, with
+        distance attributes, fetched in batches.
+        """
+        pks = [pk for _, pk in ranked]
+        instances = {}
+        for start in range(0, len(pks), FETCH_BATCH_SIZE):
+            instances.update(
+                self.in_bulk(pks[start:start + FETCH_BATCH_SIZE]))
+        result = []
+        for distance, pk in ranked:
+            instance = instances[pk]
+            instance.distance = distance
+            result.append(instance)
+        return result
+
+    def within_radius(self, latitude, longitude, radius_km):
+        """Return instances within radius_km of a point.
+
+        Each instance has a distance attribute, in km.
+
+        :returns:  List of instances ordered by distance.
+        """
+        pks, km = self._distances(
+            latitude, longitude, covering_precision(latitude, radius_km))
+        return self._ranked_instances(sorted(
+            (distance, pk) for pk, distance in zip(pks, km)
+            if distance <= radius_km))
+
+    def nearest(self, latitude, longitude, count=1):
+        """Return the count instances nearest to a point.
+
+        Searches increasingly coarse cell neighbourhoods until the
+        count nearest candidates are closer than the neighbourhood
+        edge.  Each instance has a distance attribute, in km.
+
+        :returns:  List of instances ordered by distance.
+        """
+        for precision in range(NEAREST_PRECISION, -1, -1):
+            pks, km = self._distances(latitude, longitude, precision)
+            ranked = sorted(zip(km, pks))[:count]
+            if precision == 0:
+                break
+            height, width = cell_size(precision)
+            reach = KM_PER_DEGREE * min(height, width * math.cos(
+                math.radians(min(abs(float(latitude)), 89.9))))
+            if len(ranked) == count and ranked[-1][0] <= reach:
+                break
+        return self._ranked_instances(ranked)
+
+
+class GeoQuerySet(GeoQuerySetMixin, models.QuerySet):
+    """Geo located model queryset class."""
+
+
+class GeoLocatedModel(models.Model):
+    """Abstract base class for geo located model instances.
+
+    Combine with other base classes by deriving their queryset from
+    GeoQuerySetMixin.
+    """
+    latitude = fields.latitude_field(null=True, blank=True)
+    longitude = fields.longitude_field(null=True, blank=True)
+    geohash = geohash_field()
+
+    objects = models.Manager.from_queryset(GeoQuerySet)()
+
+    class Meta(object):
+        """Meta class declaration."""
+        abstract = True
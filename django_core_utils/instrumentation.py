@@ -0,0 +1,182 @@
+"""
+.. module::  django_core_utils.instrumentation
+   :synopsis:  django_core_utils request instrumentation module.
+
+django_core_utils request instrumentation module.
+The *instrumentation* module records the database, serialization and
+rendering cost of requests handled by the generic views, exposing it through
+Server-Timing headers and log records, and enforcing per view query
+budgets in development and test environments.
+"""
+from __future__ import absolute_import
+
+import logging
+import time
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+
+logger = logging.getLogger(__name__)
+
+SERVER_TIMING_HEADER = "Server-Timing"
+BUDGET_ACTION_WARN = "warn"
+BUDGET_ACTION_RAISE = "raise"
+
+# serializer class -> subclass timing data output
+_timed_serializer_classes = {}
+
+
+class QueryBudgetExceeded(Exception):
+    """Raised when a view exceeds its query budget."""
+
+
+class QueryRecorder(object):
+    """Context manager recording query count and database time.
+
+    Uses connection execute wrappers where available, falling back
+    to query capture on older Django versions.
+    """
+    def __init__(self, using=DEFAULT_DB_ALIAS):
+        self.using = using
+        self.count = 0
+        self.duration = 0.0
+        self._context = None
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.time()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.count += 1
+            self.duration += time.time() - start
+
+    def __enter__(self):
+        connection = connections[self.using]
+        if hasattr(connection, "execute_wrapper"):
+            self._context = connection.execute_wrapper(self)
+        else:
+            from django.test.utils import CaptureQueriesContext
+            self._context = CaptureQueriesContext(connection)
+        self._context.__enter__()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self._context.__exit__(exc_type, exc_value, traceback)
+        queries = getattr(self._context, "captured_queries", None)
+        if queries is not None:
+            self.count = len(queries)
+            self.duration = sum(float(query["time"]) for query in queries)
+
+
+def server_timing(metrics):
+    """Format request metrics as a Server-Timing header value.
+    """
+    return ", ".join((
+        'db;dur={:.2f};desc="{} queries"'.format(
+            metrics["db_ms"], metrics["queries"]),
+        "serialize;dur={:.2f}".format(metrics["serialize_ms"]),
+        "render;dur={:.2f}".format(metrics["render_ms"]),
+        "total;dur={:.2f}".format(metrics["total_ms"])))
+
+
+def timed_serializer_class(serializer_class):
+    """Return a subclass of serializer_class timing its data output.
+
+    The time taken to build data is added to the serialize_duration of
+    the context view.
+    """
+    if getattr(serializer_class, "timed_data", False):
+        return serializer_class
+    try:
+        return _timed_serializer_classes[serializer_class]
+    except KeyError:
+        pass
+
+    def data(self):
+        start = time.time()
+        try:
+            return super(timed_class, self).data
+        finally:
+            view = self.context.get("view")
+            if hasattr(view, "serialize_duration"):
+                view.serialize_duration += time.time() - start
+
+    timed_class = type(str(serializer_class.__name__), (serializer_class,),
+                       dict(__module__=serializer_class.__module__,
+                            timed_data=True, data=property(data)))
+    _timed_serializer_classes[serializer_class] = timed_class
+    return timed_class
+
+
+def budget_enforced():
+    """Check if query budgets are enforced.
+
+    Budgets are enforced when DEBUG or QUERY_BUDGET_ENFORCE are set.
+    """
+    return settings.DEBUG or getattr(settings, "QUERY_BUDGET_ENFORCE", False)
+
+
+class QueryBudgetMixin(object):
+    """View mixin recording per request cost.
+
+    Records the query count, database time, serializer output time and
+    response rendering time, adds them to the response as a
+    Server-Timing header and logs them.  Views may declare a
+    query_budget; when exceeded and budgets are enforced, a warning is
+    logged or QueryBudgetExceeded is raised depending on
+    query_budget_action.
+    """
+    query_budget = None
+    query_budget_action = BUDGET_ACTION_WARN
+    query_budget_using = DEFAULT_DB_ALIAS
+
+    def get_serializer(self, *args, **kwargs):
+        """Return the view serializer, timing its data output.
+        """
+        serializer = super(QueryBudgetMixin, self).get_serializer(
+            *args, **kwargs)
+        serializer.__class__ = timed_serializer_class(type(serializer))
+        return serializer
+
+    def dispatch(self, request, *args, **kwargs):
+        start = time.time()
+        self.serialize_duration = 0.0
+        with QueryRecorder(self.query_budget_using) as recorder:
+            response = super(QueryBudgetMixin, self).dispatch(
+                request, *args, **kwargs)
+            render_start = time.time()
+            if callable(getattr(response, "render", None)):
+                response = response.render()
+            render_duration = time.time() - render_start
+        metrics = dict(
+            view=self.__class__.__name__,
+            method=request.method,
+            path=request.path,
+            status=response.status_code,
+            queries=recorder.count,
+            db_ms=recorder.duration * 1000,
+            serialize_ms=self.serialize_duration * 1000,
+            render_ms=render_duration * 1000,
+            total_ms=(time.time() - start) * 1000)
+        response[SERVER_TIMING_HEADER] = server_timing(metrics)
+        logger.info("%(view)s %(method)s %(path)s: %(queries)d queries "
+                    "db %(db_ms).2fms serialize %(serialize_ms).2fms "
+                    "render %(render_ms).2fms "
+                    "total %(total_ms).2fms", metrics,
+                    extra=dict(request_metrics=metrics))
+        self.check_query_budget(metrics)
+        return response
+
+    def check_query_budget(self, metrics):
+        """Check request metrics against the view query budget.
+        """
+        budget = self.query_budget
+        if budget is None or metrics["queries"] <= budget:
+            return
+        if not budget_enforced():
+            return
+        msg = "{} {} exceeded query budget: {} queries, budget {}".format(
+            metrics["view"], metrics["method"], metrics["queries"], budget)
+        if self.query_budget_action == BUDGET_ACTION_RAISE:
+            raise QueryBudgetExceeded(msg)
+        logger.warning(msg)
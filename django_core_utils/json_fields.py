@@ -0,0 +1,253 @@
+"""
+.. module::  django_core_utils.json_fields
+   :synopsis:  django_core_utils json model fields module.
+
+django_core_utils json model fields module.
+The *json_fields* module implements a json model field stored in the
+backend json column type (jsonb on PostgreSQL, json on MySQL and text
+queried with the JSON1 functions on SQLite) supporting key path
+lookups, indexed key path companion columns and lazy decoding.
+"""
+from __future__ import absolute_import
+
+import json
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import models
+from django.utils import six
+
+PATH_SEPARATOR = "."
+PATH_VALUE_MAX_LENGTH = 255
+
+
+class EncodedValue(six.text_type):
+    """Database value of a lazily decoded field, not yet decoded."""
+
+
+def load_deferred(instance, *attnames):
+    """Load field values of instance from the database when any of them
+    is deferred.
+
+    Companion fields, such as a money currency, are loaded together, as
+    refresh_from_db reads loaded values through the model descriptors.
+    """
+    if any(attname not in instance.__dict__ for attname in attnames):
+        instance.refresh_from_db(fields=list(attnames))
+
+
+class LazyDecodingDescriptor(object):
+    """Model field descriptor decoding database values on first access.
+
+    The field from_db_value returns an instance of the field
+    encoded_type, decoded by the field decode method when the attribute
+    is first read.  Unread values are saved without being decoded and
+    encoded again.  Deferred values are loaded on access.
+    """
+    def __init__(self, field):
+        self.field = field
+
+    def __get__(self, instance, owner):
+        if instance is None:
+            return self
+        load_deferred(instance, self.field.attname)
+        value = instance.__dict__[self.field.attname]
+        if isinstance(value, self.field.encoded_type):
+            value = self.field.decode(value)
+            instance.__dict__[self.field.attname] = value
+        return value
+
+    def __set__(self, instance, value):
+        instance.__dict__[self.field.attname] = value
+
+
+def path_column_name(name, path):
+    """Return indexed key path companion field name."""
+    return "{}_{}".format(name, path.replace(PATH_SEPARATOR, "_"))
+
+
+def path_value(value, path):
+    """Return the value at a dotted key path of a decoded document.
+
+    Scalars are returned as text, and missing keys or containers
+    as None.
+    """
+    for key in path.split(PATH_SEPARATOR):
+        if isinstance(value, dict):
+            value = value.get(key)
+        elif isinstance(value, list) and key.isdigit() and \
+                int(key) < len(value):
+            value = value[int(key)]
+        else:
+            return None
+    if value is None or isinstance(value, (dict, list)):
+        return None
+    if isinstance(value, six.string_types):
+        return value
+    return json.dumps(value)
+
+
+class JSONPathField(models.CharField):
+    """Indexed companion column holding a json document key path value.
+
+    Added by JSONField for each of its indexed paths; not added again
+    when already declared, as in migration states.
+    """
+    def contribute_to_class(self, cls, name, *args, **kwargs):
+        if name in [field.name for field in cls._meta.local_fields]:
+            return
+        super(JSONPathField, self).contribute_to_class(
+            cls, name, *args, **kwargs)
+
+
+class KeyValueField(models.Field):
+    """Output field of key transforms, allowing nested key transforms."""
+    def get_transform(self, name):
+        transform = super(KeyValueField, self).get_transform(name)
+        if transform:
+            return transform
+        return KeyTransformFactory(name)
+
+
+class KeyTransform(models.Transform):
+    """Json document key path transform.
+
+    Compares with scalar values as stored on SQLite, and as text on
+    PostgreSQL and MySQL.
+    """
+    def __init__(self, key, *args, **kwargs):
+        kwargs.setdefault("output_field", KeyValueField())
+        super(KeyTransform, self).__init__(*args, **kwargs)
+        self.key = key
+
+    def _path(self, compiler, connection):
+        keys = [self.key]
+        previous = self.lhs
+        while isinstance(previous, KeyTransform):
+            keys.insert(0, previous.key)
+            previous = previous.lhs
+        lhs, params = compiler.compile(previous)
+        return lhs, params, keys
+
+    def as_sql(self, compiler, connection):
+        lhs, params, keys = self._path(compiler, connection)
+        return "JSON_UNQUOTE(JSON_EXTRACT({}, %s))".format(lhs), \
+            params + [_json_path(keys)]
+
+    def as_sqlite(self, compiler, connection):
+        lhs, params, keys = self._path(compiler, connection)
+        return "json_extract({}, %s)".format(lhs), \
+            params + [_json_path(keys)]
+
+    def as_postgresql(self, compiler, connection):
+        lhs, params, keys = self._path(compiler, connection)
+        return "({} #>> %s)".format(lhs), params + [keys]
+
+
+def _json_path(keys):
+    return "$" + "".join(
+        "[{}]".format(key) if key.isdigit() else '."{}"'.format(key)
+        for key in keys)
+
+
+class KeyTransformFactory(object):
+    """Key transform factory."""
+    def __init__(self, key):
+        self.key = key
+
+    def __call__(self, *args, **kwargs):
+        return KeyTransform(self.key, *args, **kwargs)
+
+
+class JSONField(models.Field):
+    """Json document model field stored in the backend json column type.
+
+    :param indexed_paths: Dotted document key paths maintained in
+        indexed companion columns named <field>_<path>, set on save.
+        Saves with update_fields should list the companion fields.
+    :param lazy: Decode documents on first attribute access.
+    :param encoder: Json encoder class.
+    """
+    description = "JSON document"
+    empty_strings_allowed = False
+    encoded_type = EncodedValue
+
+    def __init__(self, *args, **kwargs):
+        self.indexed_paths = tuple(kwargs.pop("indexed_paths", ()))
+        self.lazy = kwargs.pop("lazy", False)
+        self.encoder = kwargs.pop("encoder", DjangoJSONEncoder)
+        super(JSONField, self).__init__(*args, **kwargs)
+
+    def deconstruct(self):
+        name, path, args, kwargs = super(JSONField, self).deconstruct()
+        if self.indexed_paths:
+            kwargs["indexed_paths"] = list(self.indexed_paths)
+        if self.lazy:
+            kwargs["lazy"] = True
+        if self.encoder is not DjangoJSONEncoder:
+            kwargs["encoder"] = self.encoder
+        return name, path, args, kwargs
+
+    def db_type(self, connection):
+        if connection.vendor == "postgresql":
+            return "jsonb"
+        if connection.vendor == "mysql":
+            return "json"
+        return "text"
+
+    def contribute_to_class(self, cls, name, *args, **kwargs):
+        super(JSONField, self).contribute_to_class(cls, name, *args, **kwargs)
+        for path in self.indexed_paths:
+            JSONPathField(
+                max_length=PATH_VALUE_MAX_LENGTH, db_index=True,
+                null=True, blank=True, editable=False).contribute_to_class(
+                    cls, path_column_name(name, path))
+        if self.lazy:
+            setattr(cls, self.attname, LazyDecodingDescriptor(self))
+
+    @property
+    def indexed_field_names(self):
+        """Return indexed key path companion field names."""
+        return [path_column_name(self.name, path)
+                for path in self.indexed_paths]
+
+    def decode(self, value):
+        """Decode a database value."""
+        return json.loads(value)
+
+    def from_db_value(self, value, *args):
+        # psycopg2 decodes jsonb values
+        if value is None or not isinstance(value, six.string_types):
+            return value
+        if self.lazy:
+            return EncodedValue(value)
+        return self.decode(value)
+
+    def to_python(self, value):
+        if isinstance(value, EncodedValue):
+            return self.decode(value)
+        return value
+
+    def get_prep_value(self, value):
+        if value is None:
+            return value
+        if isinstance(value, EncodedValue):
+            return six.text_type(value)
+        return json.dumps(value, cls=self.encoder)
+
+    def pre_save(self, model_instance, add):
+        if self.indexed_paths:
+            value = getattr(model_instance, self.attname)
+            for path in self.indexed_paths:
+                setattr(model_instance, path_column_name(self.name, path),
+                        path_value(value, path))
+        # undecoded lazy values are saved as read
+        return model_instance.__dict__.get(self.attname)
+
+    def value_to_string(self, obj):
+        return self.get_prep_value(self.value_from_object(obj))
+
+    def get_transform(self, name):
+        transform = super(JSONField, self).get_transform(name)
+        if transform:
+            return transform
+        return KeyTransformFactory(name)
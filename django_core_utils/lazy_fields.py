@@ -0,0 +1,189 @@
+"""
+.. module::  django_core_utils.lazy_fields
+   :synopsis:  django_core_utils lazily decoded model fields module.
+
+django_core_utils lazily decoded model fields module.
+The *lazy_fields* module implements variants of the third party time
+zone, phone number, money and mac address model fields which keep
+database values as read and decode them on first attribute access.
+Values read only for serialization, or saved unchanged, are never
+decoded.  Immutable decoded values, time zones and money amounts, are
+interned in bounded caches as they repeat across rows.
+"""
+from __future__ import absolute_import
+
+from decimal import Decimal
+
+import pytz
+from django.utils import six
+from djmoney.models.fields import MoneyField, MoneyFieldProxy
+from djmoney.money import Money
+from macaddress.fields import MACAddressField
+from phonenumber_field.modelfields import PhoneNumberField
+from phonenumber_field.phonenumber import to_python as to_phone_number
+from timezone_field import TimeZoneField
+
+from .json_fields import EncodedValue, LazyDecodingDescriptor, load_deferred
+
+CACHE_SIZE = 1024
+
+
+class EncodedInteger(int):
+    """Integer database value of a lazily decoded field."""
+
+
+class BoundedCache(object):
+    """Dictionary cache cleared when holding more than size entries."""
+    def __init__(self, size=CACHE_SIZE):
+        self.size = size
+        self._values = {}
+
+    def get(self, key, factory):
+        """Return the cached value of key, created by factory if missing.
+        """
+        try:
+            return self._values[key]
+        except KeyError:
+            if len(self._values) >= self.size:
+                self._values.clear()
+            value = self._values[key] = factory(key)
+            return value
+
+    def clear(self):
+        """Clear the cache."""
+        self._values.clear()
+
+
+_timezone_cache = BoundedCache()
+_money_cache = BoundedCache()
+
+
+def encoded(value):
+    """Mark a database value as not yet decoded."""
+    if isinstance(value, six.string_types):
+        return EncodedValue(value)
+    if isinstance(value, six.integer_types) and not isinstance(value, bool):
+        return EncodedInteger(value)
+    return value
+
+
+class LazyFieldDescriptor(LazyDecodingDescriptor):
+    """Lazy decoding descriptor, converting assigned values when the
+    field convert_on_set is set.
+    """
+    def __set__(self, instance, value):
+        if self.field.convert_on_set and \
+                not isinstance(value, self.field.encoded_type):
+            value = self.field.to_python(value)
+        instance.__dict__[self.field.attname] = value
+
+
+class LazyDecodingMixin(object):
+    """Lazy decoding model field mixin.
+
+    Classes define decode, converting a plain database value.
+    """
+    encoded_type = (EncodedValue, EncodedInteger)
+    convert_on_set = False
+
+    def contribute_to_class(self, cls, name, *args, **kwargs):
+        super(LazyDecodingMixin, self).contribute_to_class(
+            cls, name, *args, **kwargs)
+        setattr(cls, self.attname, LazyFieldDescriptor(self))
+
+    def from_db_value(self, value, *args):
+        if value is None:
+            return value
+        return encoded(value)
+
+    def to_python(self, value):
+        if isinstance(value, self.encoded_type):
+            return self.decode(value)
+        return super(LazyDecodingMixin, self).to_python(value)
+
+    def get_prep_value(self, value):
+        if isinstance(value, EncodedValue):
+            return six.text_type(value)
+        if isinstance(value, EncodedInteger):
+            return int(value)
+        return super(LazyDecodingMixin, self).get_prep_value(value)
+
+    def value_to_string(self, obj):
+        value = obj.__dict__.get(self.attname)
+        if isinstance(value, EncodedValue):
+            return six.text_type(value)
+        return super(LazyDecodingMixin, self).value_to_string(obj)
+
+
+class LazyTimeZoneField(LazyDecodingMixin, TimeZoneField):
+    """Time zone field decoding to interned pytz time zones on access.
+    """
+    def decode(self, value):
+        if not value:
+            return None
+        return _timezone_cache.get(six.text_type(value), pytz.timezone)
+
+
+class LazyPhoneNumberField(LazyDecodingMixin, PhoneNumberField):
+    """Phone number field decoding to PhoneNumber on access.
+
+    Phone numbers are mutable and not interned.
+    """
+    convert_on_set = True
+
+    def decode(self, value):
+        return to_phone_number(six.text_type(value))
+
+    def to_python(self, value):
+        if isinstance(value, self.encoded_type):
+            return self.decode(value)
+        return to_phone_number(value)
+
+
+class LazyMACAddressField(LazyDecodingMixin, MACAddressField):
+    """Mac address field decoding to netaddr.EUI on access.
+
+    EUI instances are mutable and not interned.
+    """
+    def decode(self, value):
+        return MACAddressField.to_python(
+            self, int(value) if self.integer else six.text_type(value))
+
+
+def _money(key):
+    return Money(amount=Decimal(key[0]), currency=key[1])
+
+
+class LazyMoneyFieldProxy(MoneyFieldProxy):
+    """Money field descriptor storing database amounts as read and
+    building interned Money values on access.
+    """
+    def __get__(self, obj, owner=None):
+        if obj is None:
+            return self
+        load_deferred(obj, self.field.name, self.currency_field_name)
+        data = obj.__dict__
+        amount = data[self.field.name]
+        if isinstance(amount, Decimal):
+            # keyed by text, preserving the amount exponent
+            return _money_cache.get(
+                (str(amount), data[self.currency_field_name]), _money)
+        return super(LazyMoneyFieldProxy, self).__get__(obj, owner)
+
+    def __set__(self, obj, value):
+        # database amounts need no preparation
+        if value is None or type(value) is Decimal:
+            obj.__dict__[self.field.name] = value
+        else:
+            super(LazyMoneyFieldProxy, self).__set__(obj, value)
+
+
+class LazyMoneyField(MoneyField):
+    """Money field building interned Money values on access.
+
+    Money values are shared between instances and should not be
+    modified in place.
+    """
+    def contribute_to_class(self, cls, name):
+        super(LazyMoneyField, self).contribute_to_class(cls, name)
+        setattr(cls, self.name, LazyMoneyFieldProxy(self))
@@ -0,0 +1,48 @@
+"""
+.. module::  django_core_utils.management.commands.reconcile_counters
+   :synopsis:  django_core_utils counter reconciliation command module.
+
+django_core_utils counter reconciliation command module.
+Recomputes the related count fields of the given, or all installed,
+models in batches, correcting drifted values.
+"""
+from __future__ import absolute_import
+
+from django.apps import apps
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS
+
+from ...counters import (RECONCILE_BATCH_SIZE, counter_fields,
+                         reconcile_counters)
+
+
+class Command(BaseCommand):
+    """Reconcile related count fields command class."""
+    help = "Recompute denormalized related count fields in batches."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "models", nargs="*", metavar="app_label.Model",
+            help="Models to reconcile, all models with counters if omitted.")
+        parser.add_argument(
+            "--batch-size", type=int, default=RECONCILE_BATCH_SIZE,
+            help="Number of instances reconciled per batch.")
+        parser.add_argument(
+            "--database", default=DEFAULT_DB_ALIAS,
+            help="Database to reconcile.")
+
+    def handle(self, *args, **options):
+        if options["models"]:
+            try:
+                models = [apps.get_model(label)
+                          for label in options["models"]]
+            except (LookupError, ValueError) as error:
+                raise CommandError(error)
+        else:
+            models = [model for model in apps.get_models()
+                      if counter_fields(model)]
+        for model in models:
+            corrected = reconcile_counters(
+                model, options["batch_size"], options["database"])
+            self.stdout.write("{}: {} counter values corrected".format(
+                model._meta.label, corrected))
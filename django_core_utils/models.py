@@ -7,15 +7,21 @@ Shared django_core_utils core  models module.
 from __future__ import absolute_import
 
 import logging
+from collections import namedtuple
 
 import inflection
 from django.contrib.sites.models import Site
 from django.db import models
+from django.db.models.query import ValuesListIterable
+from django.utils import timezone
 from django.utils.encoding import python_2_unicode_compatible
 
 from python_core_utils.core import class_name, instance_class_name
 
-from . import constants, fields
+from . import bulk, constants, fields, search
+from .caching import bump_generation, generation
+from .counters import counter_fields
+from .utils import SYNC_CHUNK_SIZE, normalize_name, sync_many_to_many
 
 logger = logging.getLogger(__name__)
 
@@ -55,7 +61,114 @@ def db_table(app_name, name, site_label=None):
         app_name, db_table_for_class(name), site_label)
 
 
-class VersionedModelManager(models.Manager):
+_record_classes = {}
+
+
+def record_class(model, names):
+    """Return the read only record class of model and field attnames.
+
+    Records are tuples exposing the fields and the properties of model,
+    e.g. BasedNamedModel.display_name, as attributes.
+    """
+    key = (model, tuple(names))
+    try:
+        return _record_classes[key]
+    except KeyError:
+        pass
+    attributes = dict(__slots__=())
+    for klass in reversed(model.__mro__):
+        if issubclass(klass, models.Model) and klass is not models.Model:
+            attributes.update(
+                (name, value) for name, value in vars(klass).items()
+                if isinstance(value, property) and name not in names)
+    if model._meta.pk.attname in names:
+        attributes["pk"] = property(
+            lambda record: getattr(record, model._meta.pk.attname))
+    cls = _record_classes[key] = type(
+        "{}Record".format(model.__name__),
+        (namedtuple("{}Values".format(model.__name__), names),), attributes)
+    return cls
+
+
+class RecordIterable(ValuesListIterable):
+    """Iterable yielding a record per row of values_list querysets."""
+    def __iter__(self):
+        queryset = self.queryset
+        query = queryset.query
+        if queryset._fields:
+            # the order of values_list rows
+            names = list(queryset._fields) + [
+                name for name in query.annotation_select
+                if name not in queryset._fields]
+        else:
+            names = list(query.extra_select) + \
+                list(query.values_select) + list(query.annotation_select)
+        record = record_class(queryset.model, names)._make
+        for row in super(RecordIterable, self).__iter__():
+            yield record(row)
+
+
+class VersionedModelQuerySet(models.QuerySet):
+    """Versioned object query set class.
+    """
+
+    def versioned_update(self, user=None, **kwargs):
+        """Update matching instances using a single query.
+
+        Unlike update(), maintains the version and update time, and
+        when a user is given, the update and effective users.
+
+        :param user: User performing the update.
+        :type user: User.
+        :param kwargs: Field values to update.
+        :type kwargs: dict.
+        :returns:  Number of updated rows.
+        """
+        values = dict(version=models.F('version') + 1,
+                      update_time=timezone.now())
+        if user is not None:
+            values.update(update_user=user, effective_user=user)
+        values.update(kwargs)
+        return self.update(**values)
+
+    def soft_delete(self, user=None):
+        """Logically delete matching instances using a single query.
+
+        Avoids loading instances and running the delete collector.
+
+        :param user: User performing the delete.
+        :type user: User.
+        :returns:  Number of deleted rows.
+        """
+        return self.filter(deleted=False).versioned_update(
+            user=user, deleted=True)
+
+    def as_records(self, *fields):
+        """Return a queryset of read only records instead of instances.
+
+        Records are built from values_list rows, avoiding the memory and
+        time cost of model instances in read only reports, and expose
+        the fields, by attname for foreign keys (e.g. site_id), and
+        the model properties.
+
+        :param fields: Field names or lookups, all concrete fields by
+            default.
+        :type fields: list.
+        :returns:  Queryset of records.
+        """
+        opts = self.model._meta
+        attnames = dict((field.name, field.attname)
+                        for field in opts.concrete_fields)
+        attnames['pk'] = opts.pk.attname
+        names = [attnames.get(name, name) for name in fields] \
+            if fields else [field.attname for field in opts.concrete_fields]
+        queryset = self.values_list(*names)
+        queryset._iterable_class = RecordIterable
+        return queryset
+
+
+class VersionedModelManager(
+        models.Manager.from_queryset(VersionedModelQuerySet)):
     """Versioned object manager class.
     """
 
@@ -117,29 +230,184 @@ class VersionedModel(models.Model):
 
     def save(self, *args, **kwargs):
         """Save an instance.
+
+        Counter fields of existing instances are maintained in the
+        database only, and are left out of the update.
         """
         self.version += 1
+        if (not self._state.adding and not args and
+                kwargs.get('update_fields') is None and
+                not kwargs.get('force_insert')):
+            counters = counter_fields(type(self))
+            if counters:
+                deferred = self.get_deferred_fields()
+                kwargs['update_fields'] = [
+                    field.name for field in self._meta.concrete_fields
+                    if not field.primary_key and field not in counters and
+                    field.attname not in deferred]
         super(VersionedModel, self).save(*args, **kwargs)
 
+    def set_related_ids(self, name, target_ids, user=None,
+                        chunk_size=SYNC_CHUNK_SIZE):
+        """Replace many to many related members by id.
+
+        Applies the differences in chunks and, when changed, increments
+        the instance version in the same transaction.
+
+        :param name: Many to many field or related manager name.
+        :param target_ids: Ids of the required members.
+        :param user: User performing the update.
+        :returns:  Tuple of added and removed id sets.
+        """
+        return sync_many_to_many(getattr(self, name), target_ids,
+                                 chunk_size=chunk_size, bump_version=True,
+                                 user=user)
+
     def __str__(self):
         return '{0} object {1.id!s} {1.uuid!s} {1.version!s}'.format(
             instance_class_name(self), self)
 
 
+RESOLVE_GENERATION_KEY_PREFIX = "django_core_utils.generation.resolve"
+NAME_KEY_BATCH_SIZE = 1000
+
+# model -> (generation, field attnames, normalized key -> row values)
+_resolve_cache = {}
+
+
+def resolve_generation_key(model):
+    """Return in memory resolution index generation key for model."""
+    return "{}.{}".format(RESOLVE_GENERATION_KEY_PREFIX,
+                          model._meta.label_lower)
+
+
 class NamedModelManager(VersionedModelManager):
     """Named object manager class.
     """
     def named_instance(self, name):
         """Find a named instance.
+
+        Falls back to name or alias resolution before returning
+        the unknown instance.
         """
         try:
             return self.get(name=name)
         except self.model.DoesNotExist:
+            instance = self.resolve(name)
+            if instance is not None:
+                return instance
             logger.warning(
                 'Failed to retrieve instance of type (%s) named (%s)',
                 class_name(self.model), name)
             return self.get(name=constants.UNKNOWN)
 
+    def search(self, text, limit=None):
+        """Find instances by name, alias or description.
+
+        Uses the full text index of registered models, returning
+        instances ordered by rank, at most limit when given.
+        """
+        return search.search(self.get_queryset(), text, limit)
+
+    def resolve(self, name_or_alias):
+        """Find an instance by normalized name or alias.
+
+        Matching ignores case, accents and whitespace differences and
+        prefers names over aliases.  Models setting resolve_in_memory
+        are resolved from an in memory index of the values of all
+        instances, which is rebuilt after instances are saved or
+        deleted; each call returns a new instance.
+
+        :param name_or_alias: User entered name or alias.
+        :type name_or_alias: str.
+        :returns:  An instance of Model or None.
+        """
+        key = normalize_name(name_or_alias)
+        if key is None:
+            return None
+        if self.model.resolve_in_memory:
+            attnames, index = self._resolve_index()
+            values = index.get(key)
+            if values is None:
+                return None
+            return self.model.from_db(self.db, attnames, values)
+        name_match = models.Case(
+            models.When(name_key=key, then=0), default=1,
+            output_field=models.IntegerField())
+        return self.filter(
+            models.Q(name_key=key) | models.Q(alias_key=key)).order_by(
+                name_match, 'pk').first()
+
+    def _resolve_index(self):
+        current = generation(resolve_generation_key(self.model))
+        cached = _resolve_cache.get(self.model)
+        if cached is None or cached[0] != current:
+            attnames = [field.attname
+                        for field in self.model._meta.concrete_fields]
+            rows = list(self.order_by('-pk').values_list(*attnames))
+            name_key = attnames.index('name_key')
+            alias_key = attnames.index('alias_key')
+            index = {}
+            for row in rows:
+                if row[alias_key]:
+                    index[row[alias_key]] = row
+            for row in rows:
+                if row[name_key]:
+                    index[row[name_key]] = row
+            cached = _resolve_cache[self.model] = (current, attnames, index)
+        return cached[1:]
+
+    def bulk_create(self, objs, *args, **kwargs):
+        objs = list(objs)
+        for obj in objs:
+            obj.set_name_keys()
+        created = super(NamedModelManager, self).bulk_create(
+            objs, *args, **kwargs)
+        if self.model.resolve_in_memory and created:
+            bump_generation(resolve_generation_key(self.model))
+        return created
+
+    def upsert(self, records, key='name', update_fields=None,
+               batch_size=bulk.UPSERT_BATCH_SIZE, user=None, site=None):
+        """Insert or update instances identified by name.
+
+        See :func:`django_core_utils.bulk.upsert`.
+
+        :returns:  dict of created, updated and unchanged counts.
+        """
+        counts = bulk.upsert(self, records, key=key,
+                             update_fields=update_fields,
+                             batch_size=batch_size, user=user, site=site)
+        if self.model.resolve_in_memory and (
+                counts['created'] or counts['updated']):
+            bump_generation(resolve_generation_key(self.model))
+        return counts
+
+    def update_name_keys(self, batch_size=NAME_KEY_BATCH_SIZE):
+        """Populate normalized name keys of existing instances.
+
+        Designed for data migrations; only changed rows are updated.
+
+        :returns:  Number of updated rows.
+        """
+        count = 0
+        queryset = self.order_by('pk').values_list(
+            'pk', 'name', 'alias', 'name_key', 'alias_key')
+        last_pk = None
+        while True:
+            batch = queryset if last_pk is None else queryset.filter(
+                pk__gt=last_pk)
+            rows = list(batch[:batch_size])
+            if not rows:
+                break
+            for pk, name, alias, name_key, alias_key in rows:
+                keys = (normalize_name(name), normalize_name(alias))
+                if keys != (name_key, alias_key):
+                    count += self.filter(pk=pk).update(
+                        name_key=keys[0], alias_key=keys[1])
+            last_pk = rows[-1][0]
+        return count
+
 
 class BasedNamedModel(VersionedModel):
     """Abstract base class for named model instances.
@@ -150,6 +418,10 @@ class BasedNamedModel(VersionedModel):
     alias = fields.name_field(blank=True, null=True, unique=False)
     description = fields.description_field(blank=True, null=True)
 
+    # normalized name and alias lookup keys
+    name_key = fields.name_key_field()
+    alias_key = fields.name_key_field()
+
     class Meta(VersionedModel.Meta):
         """Model meta class declaration."""
         abstract = True
@@ -157,6 +429,34 @@ class BasedNamedModel(VersionedModel):
 
     objects = NamedModelManager()
 
+    # resolve names from an in memory index, for small reference tables
+    resolve_in_memory = False
+
+    def set_name_keys(self):
+        """Populate normalized name and alias lookup keys."""
+        self.name_key = normalize_name(self.name)
+        self.alias_key = normalize_name(self.alias)
+
+    def save(self, *args, **kwargs):
+        """Save an instance.
+        """
+        self.set_name_keys()
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None:
+            kwargs['update_fields'] = set(update_fields).union(
+                ('name_key', 'alias_key'))
+        super(BasedNamedModel, self).save(*args, **kwargs)
+        if self.resolve_in_memory:
+            bump_generation(resolve_generation_key(type(self)))
+
+    def delete(self, *args, **kwargs):
+        """Delete an instance.
+        """
+        result = super(BasedNamedModel, self).delete(*args, **kwargs)
+        if self.resolve_in_memory:
+            bump_generation(resolve_generation_key(type(self)))
+        return result
+
     @property
     def display_name(self):
         """Return display name."""
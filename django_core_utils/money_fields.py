@@ -0,0 +1,243 @@
+"""
+.. module::  django_core_utils.money_fields
+   :synopsis:  django_core_utils integer money model fields module.
+
+django_core_utils integer money model fields module.
+The *money_fields* module implements a money model field storing
+integer minor units (e.g. cents) with a companion currency column, and
+queryset helpers aggregating amounts per currency in SQL or reading
+them as integer arrays, without building a Money instance per row.
+"""
+from __future__ import absolute_import
+
+from collections import defaultdict
+from decimal import Decimal
+
+import moneyed
+from django.core.exceptions import ValidationError
+from django.db import models
+from django.db.models import Avg, Count, Sum
+from django.db.models.expressions import Col
+from django.db.models.lookups import Exact
+from django.utils.translation import gettext as _
+
+from .json_fields import load_deferred
+
+try:
+    import numpy
+except ImportError:  # pragma: no cover
+    numpy = None
+
+CURRENCY_MAX_LENGTH = 3
+DECIMAL_PLACES = 2
+
+
+def currency_field_name(name):
+    """Return the currency companion field name of a money field."""
+    return "{}_currency".format(name)
+
+
+class CurrencyField(models.CharField):
+    """Currency code companion column of a minor unit money field.
+
+    Not added again when already declared, as in migration states.
+    """
+    def contribute_to_class(self, cls, name, *args, **kwargs):
+        if name in [field.name for field in cls._meta.local_fields]:
+            return
+        super(CurrencyField, self).contribute_to_class(
+            cls, name, *args, **kwargs)
+
+
+class MinorUnitMoneyDescriptor(object):
+    """Money field descriptor building Money values on access."""
+    def __init__(self, field):
+        self.field = field
+
+    def __get__(self, instance, owner):
+        if instance is None:
+            return self
+        load_deferred(instance, self.field.attname,
+                      self.field.currency_field_name)
+        units = instance.__dict__[self.field.attname]
+        if units is None:
+            return None
+        return moneyed.Money(
+            self.field.to_major(units),
+            getattr(instance, self.field.currency_field_name))
+
+    def __set__(self, instance, value):
+        if isinstance(value, moneyed.Money):
+            setattr(instance, self.field.currency_field_name,
+                    value.currency.code)
+            value = self.field.to_minor(value.amount)
+        instance.__dict__[self.field.attname] = value
+
+
+class MinorUnitMoneyField(models.BigIntegerField):
+    """Money stored as integer minor units and a currency code.
+
+    Values are read and assigned as Money instances; assigned integers
+    are minor units.  The currency is stored in the <name>_currency
+    companion field.
+
+    :param decimal_places: Number of minor unit decimal places.
+    :param default_currency: Currency code of the companion field.
+    """
+    description = "Money in integer minor units"
+
+    def __init__(self, *args, **kwargs):
+        self.decimal_places = kwargs.pop("decimal_places", DECIMAL_PLACES)
+        self.default_currency = kwargs.pop("default_currency", "USD")
+        default = kwargs.get("default")
+        if isinstance(default, moneyed.Money):
+            kwargs["default"] = self.to_minor(default.amount)
+        super(MinorUnitMoneyField, self).__init__(*args, **kwargs)
+
+    @property
+    def scale(self):
+        """Return the minor units per major unit."""
+        return 10 ** self.decimal_places
+
+    def to_minor(self, amount):
+        """Return a major unit amount as integer minor units.
+
+        :raises ValidationError: if amount has more decimal places.
+        """
+        units = Decimal(amount) * self.scale
+        if units != units.to_integral_value():
+            raise ValidationError(
+                _('amount has more than %(decimal_places)s decimal places'),
+                params=dict(decimal_places=self.decimal_places))
+        return int(units)
+
+    def to_major(self, units):
+        """Return integer minor units as a major unit Decimal."""
+        return Decimal(units).scaleb(-self.decimal_places)
+
+    def deconstruct(self):
+        name, path, args, kwargs = super(
+            MinorUnitMoneyField, self).deconstruct()
+        if self.decimal_places != DECIMAL_PLACES:
+            kwargs["decimal_places"] = self.decimal_places
+        if self.default_currency != "USD":
+            kwargs["default_currency"] = self.default_currency
+        return name, path, args, kwargs
+
+    def contribute_to_class(self, cls, name, *args, **kwargs):
+        super(MinorUnitMoneyField, self).contribute_to_class(
+            cls, name, *args, **kwargs)
+        self.currency_field_name = currency_field_name(name)
+        currency_field = CurrencyField(
+            max_length=CURRENCY_MAX_LENGTH, default=self.default_currency,
+            editable=False)
+        # initialized before the amount, which may assign the currency
+        currency_field.creation_counter = self.creation_counter - 1
+        currency_field.contribute_to_class(cls, self.currency_field_name)
+        setattr(cls, self.attname, MinorUnitMoneyDescriptor(self))
+
+    def get_prep_value(self, value):
+        if isinstance(value, moneyed.Money):
+            # the currency is not part of the value
+            raise ValueError(
+                "Money values are only supported by exact lookups of {}; "
+                "use minor units and {}".format(
+                    self.name, self.currency_field_name))
+        return super(MinorUnitMoneyField, self).get_prep_value(value)
+
+    def pre_save(self, model_instance, add):
+        return model_instance.__dict__[self.attname]
+
+    def value_from_object(self, obj):
+        load_deferred(obj, self.attname)
+        return obj.__dict__[self.attname]
+
+
+@MinorUnitMoneyField.register_lookup
+class MinorUnitMoneyExact(Exact):
+    """Exact lookup also matching the currency of Money values."""
+    def __init__(self, lhs, rhs):
+        self.currency = None
+        if isinstance(rhs, moneyed.Money):
+            self.currency = rhs.currency.code
+            rhs = lhs.output_field.to_minor(rhs.amount)
+        super(MinorUnitMoneyExact, self).__init__(lhs, rhs)
+
+    def as_sql(self, compiler, connection):
+        sql, params = super(MinorUnitMoneyExact, self).as_sql(
+            compiler, connection)
+        if self.currency is None:
+            return sql, params
+        field = self.lhs.output_field
+        currency_sql, currency_params = compiler.compile(Col(
+            self.lhs.alias,
+            field.model._meta.get_field(field.currency_field_name)))
+        return "({} AND {} = %s)".format(sql, currency_sql), \
+            list(params) + list(currency_params) + [self.currency]
+
+
+class MoneyQuerySetMixin(object):
+    """Minor unit money aggregation methods of model querysets.
+    """
+    def _money_field(self, field_name):
+        return self.model._meta.get_field(field_name)
+
+    def money_totals(self, field_name):
+        """Sum, average and count money amounts per currency in SQL.
+
+        :returns:  dict of currency code to dict of sum and avg Money
+            and count.
+        """
+        field = self._money_field(field_name)
+        rows = self.order_by().values(field.currency_field_name).annotate(
+            total=Sum(field.attname), average=Avg(field.attname),
+            count=Count(field.attname))
+        result = {}
+        for row in rows:
+            currency = row[field.currency_field_name]
+            result[currency] = dict(
+                sum=moneyed.Money(field.to_major(row["total"] or 0),
+                                  currency),
+                avg=moneyed.Money(field.to_major(
+                    Decimal(row["average"] or 0).quantize(1)), currency),
+                count=row["count"])
+        return result
+
+    def money_sum(self, field_name):
+        """Sum money amounts per currency in SQL.
+
+        :returns:  dict of currency code to Money.
+        """
+        return dict((currency, totals["sum"]) for currency, totals
+                    in self.money_totals(field_name).items())
+
+    def money_avg(self, field_name):
+        """Average money amounts per currency in SQL.
+
+        :returns:  dict of currency code to Money.
+        """
+        return dict((currency, totals["avg"]) for currency, totals
+                    in self.money_totals(field_name).items())
+
+    def money_arrays(self, field_name):
+        """Read money amounts as integer minor unit arrays per currency.
+
+        Arrays are numpy int64 arrays when numpy is installed, lists
+        otherwise; divide by the field scale for major units.
+
+        :returns:  dict of currency code to minor unit array.
+        """
+        field = self._money_field(field_name)
+        amounts = defaultdict(list)
+        for units, currency in self.order_by().filter(
+                **{"{}__isnull".format(field.attname): False}).values_list(
+                    field.attname, field.currency_field_name).iterator():
+            amounts[currency].append(units)
+        if numpy is None:
+            return dict(amounts)
+        return dict((currency, numpy.array(units, dtype=numpy.int64))
+                    for currency, units in amounts.items())
+
+
+class MoneyQuerySet(MoneyQuerySetMixin, models.QuerySet):
+    """Minor unit money model queryset class."""
@@ -0,0 +1,178 @@
+"""
+.. module::  django_core_utils.network_fields
+   :synopsis:  django_core_utils network address model fields module.
+
+django_core_utils network address model fields module.
+The *network_fields* module implements ip and mac address model fields
+stored as sortable binary and integer values, with lookups compiling
+network and vendor prefix queries to indexed range scans:
+
+    Host.objects.filter(address__in_cidr='10.0.0.0/8')
+    Device.objects.filter(mac__prefix='00:1b:63')
+"""
+from __future__ import absolute_import
+
+import abc
+import binascii
+import re
+
+import netaddr
+from django import forms
+from django.core.exceptions import ValidationError
+from django.db import models
+from django.utils import six
+from django.utils.translation import gettext as _
+
+IP_ADDRESS_BYTES = 16
+MAC_ADDRESS_BITS = 48
+
+
+def pack_ip_address(value):
+    """Return an ip address as 16 bytes, ipv4 as ipv4 mapped ipv6.
+
+    Packed addresses sort in address order within each family.
+    """
+    address = netaddr.IPAddress(value)
+    if address.version == 4:
+        address = address.ipv6(ipv4_compatible=False)
+    value = int(address)
+    return bytes(bytearray(
+        (value >> (8 * shift)) & 0xff
+        for shift in range(IP_ADDRESS_BYTES - 1, -1, -1)))
+
+
+def unpack_ip_address(value):
+    """Return the text form of a packed ip address."""
+    address = netaddr.IPAddress(int(binascii.hexlify(bytes(value)), 16), 6)
+    if address.is_ipv4_mapped():
+        address = address.ipv4()
+    return str(address)
+
+
+class PackedIPAddressField(models.BinaryField):
+    """Ip address stored as 16 sortable bytes.
+
+    Values are read as text, as with GenericIPAddressField.
+    """
+    description = "Packed IP address"
+
+    def __init__(self, *args, **kwargs):
+        kwargs["max_length"] = IP_ADDRESS_BYTES
+        kwargs.setdefault("editable", True)
+        super(PackedIPAddressField, self).__init__(*args, **kwargs)
+
+    def deconstruct(self):
+        name, path, args, kwargs = super(
+            PackedIPAddressField, self).deconstruct()
+        del kwargs["max_length"]
+        return name, path, args, kwargs
+
+    def to_python(self, value):
+        if value is None or isinstance(value, six.string_types):
+            return value
+        if isinstance(value, (bytes, bytearray, memoryview)):
+            return unpack_ip_address(value)
+        return str(netaddr.IPAddress(value))
+
+    def from_db_value(self, value, *args):
+        if value is None:
+            return value
+        return unpack_ip_address(value)
+
+    def get_prep_value(self, value):
+        if value is None or value == "":
+            return None
+        try:
+            return pack_ip_address(value)
+        except (netaddr.AddrFormatError, ValueError, TypeError):
+            raise ValidationError(_("Enter a valid IPv4 or IPv6 address."))
+
+    def value_to_string(self, obj):
+        return self.value_from_object(obj)
+
+    def formfield(self, **kwargs):
+        defaults = dict(form_class=forms.GenericIPAddressField)
+        defaults.update(kwargs)
+        return models.Field.formfield(self, **defaults)
+
+
+class PackedMACAddressField(models.BigIntegerField):
+    """Mac address stored as a 48 bit integer.
+
+    Values are read as netaddr.EUI instances, as with the
+    django-macaddress MACAddressField.
+    """
+    description = "Packed MAC address"
+
+    def to_python(self, value):
+        if value is None or isinstance(value, netaddr.EUI):
+            return value
+        try:
+            return netaddr.EUI(value, version=48)
+        except (netaddr.AddrFormatError, ValueError, TypeError):
+            raise ValidationError(_("Enter a valid MAC address."))
+
+    def from_db_value(self, value, *args):
+        if value is None:
+            return value
+        return netaddr.EUI(value, version=48)
+
+    def get_prep_value(self, value):
+        if value is None or value == "":
+            return None
+        return int(self.to_python(value))
+
+    def value_to_string(self, obj):
+        value = self.value_from_object(obj)
+        return None if value is None else str(value)
+
+    def formfield(self, **kwargs):
+        defaults = dict(form_class=forms.CharField)
+        defaults.update(kwargs)
+        return models.Field.formfield(self, **defaults)
+
+
+@six.add_metaclass(abc.ABCMeta)
+class RangeLookup(models.Lookup):
+    """Lookup compiling to a between range of prepared field values."""
+    @abc.abstractmethod
+    def value_range(self):
+        """Return the first and last matching field values."""
+
+    def as_sql(self, compiler, connection):
+        lhs, params = self.process_lhs(compiler, connection)
+        params = list(params)
+        field = self.lhs.output_field
+        params.extend(field.get_db_prep_value(value, connection)
+                      for value in self.value_range())
+        return "{} BETWEEN %s AND %s".format(lhs), params
+
+
+@PackedIPAddressField.register_lookup
+class InCidr(RangeLookup):
+    """Addresses in a network, e.g. address__in_cidr='10.0.0.0/8'."""
+    lookup_name = "in_cidr"
+    prepare_rhs = False
+
+    def value_range(self):
+        network = netaddr.IPNetwork(self.rhs)
+        return (netaddr.IPAddress(network.first, network.version),
+                netaddr.IPAddress(network.last, network.version))
+
+
+@PackedMACAddressField.register_lookup
+class Prefix(RangeLookup):
+    """Addresses with a prefix of hex digits, e.g. the vendor prefix
+    mac__prefix='00:1b:63'.
+    """
+    lookup_name = "prefix"
+    prepare_rhs = False
+
+    def value_range(self):
+        digits = re.sub(r"[:.-]", "", str(self.rhs))
+        if not re.match(r"^[0-9a-fA-F]{1,12}$", digits):
+            raise ValueError(
+                "Invalid MAC address prefix: {}".format(self.rhs))
+        bits = MAC_ADDRESS_BITS - 4 * len(digits)
+        first = int(digits, 16) << bits
+        return first, first | ((1 << bits) - 1)
@@ -0,0 +1,132 @@
+"""
+.. module::  django_core_utils.paginators
+   :synopsis:  django_core_utils paginators module.
+
+django_core_utils paginators module.
+The *paginators* module implements a paginator for large tables which
+avoids exact COUNT(*) queries.  Unfiltered counts are served from a
+cached per model counter, maintained by signals and bulk helpers, or
+from backend statistics.  Filtered counts are bounded by a threshold.
+"""
+from __future__ import absolute_import
+
+from django.core.cache import cache
+from django.core.paginator import EmptyPage, Paginator
+from django.db import connections
+from django.utils.functional import cached_property
+
+COUNT_KEY_PREFIX = "django_core_utils.count"
+COUNT_TIMEOUT = 3600
+COUNT_THRESHOLD = 10000
+
+
+def count_cache_key(model):
+    """Return row count cache key for model."""
+    return "{}.{}".format(COUNT_KEY_PREFIX, model._meta.label_lower)
+
+
+def cached_count(model):
+    """Return cached model row count or None."""
+    return cache.get(count_cache_key(model))
+
+
+def adjust_cached_count(model, delta):
+    """Adjust cached model row count by delta.
+
+    Intended for signal handlers and bulk helpers; a missing counter
+    is left to be recomputed on demand.
+    """
+    if not delta:
+        return
+    try:
+        cache.incr(count_cache_key(model), delta)
+    except ValueError:
+        pass
+
+
+def estimated_count(queryset):
+    """Return backend row count estimate for the queryset table or None.
+    """
+    connection = connections[queryset.db]
+    if connection.vendor != "postgresql":
+        return None
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT reltuples FROM pg_class WHERE oid = %s::regclass",
+            [queryset.model._meta.db_table])
+        row = cursor.fetchone()
+    if row and row[0] > 0:
+        return int(row[0])
+    return None
+
+
+class BoundedCount(int):
+    """Row count exceeding the counted threshold, one more than it.
+
+    Displayed as "more than <threshold>".
+    """
+    def __str__(self):
+        return "more than {}".format(int(self) - 1)
+
+
+def bounded_count(queryset, threshold=COUNT_THRESHOLD):
+    """Count queryset rows, scanning at most threshold + 1 rows.
+
+    Returns a BoundedCount of threshold + 1 when there are more rows.
+    """
+    count = queryset.order_by()[:threshold + 1].count()
+    if count > threshold:
+        return BoundedCount(count)
+    return count
+
+
+def is_unfiltered(queryset):
+    """Check if queryset selects all the rows of its table."""
+    query = queryset.query
+    return not query.where and not query.distinct and (
+        query.low_mark == 0 and query.high_mark is None)
+
+
+class ApproximateCountPaginator(Paginator):
+    """Paginator avoiding exact counts on large tables.
+
+    Unfiltered querysets are counted from the cached model counter,
+    backend statistics, or an exact count which is then cached.
+    Filtered querysets are counted up to count_threshold rows, beyond
+    which the count is a BoundedCount and pages past the count remain
+    valid, possibly empty.
+    """
+    count_threshold = COUNT_THRESHOLD
+
+    def validate_number(self, number):
+        try:
+            return super(ApproximateCountPaginator, self).validate_number(
+                number)
+        except EmptyPage:
+            if isinstance(self.count, BoundedCount) and int(number) > 1:
+                return int(number)
+            raise
+
+    def page(self, number):
+        if not isinstance(self.count, BoundedCount):
+            return super(ApproximateCountPaginator, self).page(number)
+        number = self.validate_number(number)
+        bottom = (number - 1) * self.per_page
+        return self._get_page(
+            self.object_list[bottom:bottom + self.per_page], number, self)
+
+    @cached_property
+    def count(self):
+        queryset = self.object_list
+        if not hasattr(queryset, "query"):
+            return len(queryset)
+        if not is_unfiltered(queryset):
+            return bounded_count(queryset, self.count_threshold)
+        model = queryset.model
+        count = cached_count(model)
+        if count is None:
+            count = estimated_count(queryset)
+            if count is None:
+                count = queryset.count()
+            cache.set(count_cache_key(model), count, COUNT_TIMEOUT)
+        return count
@@ -20,4 +20,15 @@ class IsCreatorOrReadOnly(permissions.BasePermission):
             return True
 
         # Write permissions are only allowed to the owner of the snippet.
-        return obj.creation_user == request.user
+        # Compare ids to avoid fetching the creation user.
+        return obj.creation_user_id == request.user.pk
+
+    def filter_queryset(self, request, queryset, view):
+        """Restrict queryset to instances the request may write.
+
+        Allows the ownership rule to be applied in SQL, for example
+        by filtered updates, without fetching instances.
+        """
+        if request.method in permissions.SAFE_METHODS:
+            return queryset
+        return queryset.filter(creation_user_id=request.user.pk)
@@ -0,0 +1,191 @@
+"""
+.. module::  django_core_utils.search
+   :synopsis:  django_core_utils named model full text search module.
+
+django_core_utils named model full text search module.
+The *search* module maintains a full text index over the name, alias
+and description of registered named models: an FTS5 virtual table on
+SQLite and an expression GIN index on PostgreSQL.  Other backends, and
+models which are not registered, fall back to icontains lookups.
+
+Registered models are kept in sync by signals; bulk loads should call
+index_instances or rebuild_search_index.  The index is created with
+create_search_index, typically from a data migration.
+"""
+from __future__ import absolute_import
+
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.db.models import Q
+from django.db.models.signals import post_delete, post_save
+
+SEARCH_FIELDS = ("name", "alias", "description")
+BATCH_SIZE = 1000
+PG_CONFIG = "simple"
+
+_registry = set()
+
+
+def register(model):
+    """Register model for full text search, connecting sync signals.
+    """
+    _registry.add(model)
+    post_save.connect(_instance_saved, sender=model,
+                      dispatch_uid="django_core_utils.search.saved")
+    post_delete.connect(_instance_deleted, sender=model,
+                        dispatch_uid="django_core_utils.search.deleted")
+
+
+def is_registered(model):
+    """Check if model is registered for full text search."""
+    return model in _registry
+
+
+def search_table(model):
+    """Return SQLite full text search table name for model."""
+    return "{}_fts".format(model._meta.db_table)
+
+
+def _pg_document(connection, model, qualified=False):
+    qn = connection.ops.quote_name
+    columns = [qn(model._meta.get_field(name).column)
+               for name in SEARCH_FIELDS]
+    if qualified:
+        columns = ["{}.{}".format(qn(model._meta.db_table), column)
+                   for column in columns]
+    return "to_tsvector('{}', {})".format(
+        PG_CONFIG, " || ' ' || ".join(
+            "coalesce({}, '')".format(column) for column in columns))
+
+
+def create_search_index(model, using=DEFAULT_DB_ALIAS, populate=True):
+    """Create the full text index of model, optionally populating it.
+    """
+    connection = connections[using]
+    qn = connection.ops.quote_name
+    with connection.cursor() as cursor:
+        if connection.vendor == "sqlite":
+            cursor.execute(
+                "CREATE VIRTUAL TABLE IF NOT EXISTS {} USING fts5({})".format(
+                    qn(search_table(model)), ", ".join(SEARCH_FIELDS)))
+        elif connection.vendor == "postgresql":
+            cursor.execute(
+                "CREATE INDEX IF NOT EXISTS {} ON {} USING GIN ({})".format(
+                    qn("{}_search".format(model._meta.db_table)),
+                    qn(model._meta.db_table),
+                    _pg_document(connection, model)))
+            return
+        else:
+            return
+    if populate:
+        rebuild_search_index(model, using=using)
+
+
+def index_instances(model, rows, using=DEFAULT_DB_ALIAS):
+    """Add or replace rows in the SQLite full text index.
+
+    Rows are (pk, name, alias, description) tuples.  PostgreSQL
+    expression indexes are maintained by the database.
+    """
+    connection = connections[using]
+    rows = list(rows)
+    if connection.vendor != "sqlite" or not rows:
+        return
+    table = connection.ops.quote_name(search_table(model))
+    with connection.cursor() as cursor:
+        remove_instances(model, [row[0] for row in rows], using)
+        cursor.executemany(
+            "INSERT INTO {} (rowid, {}) VALUES (%s, %s, %s, %s)".format(
+                table, ", ".join(SEARCH_FIELDS)), rows)
+
+
+def remove_instances(model, pks, using=DEFAULT_DB_ALIAS):
+    """Remove rows from the SQLite full text index."""
+    connection = connections[using]
+    if connection.vendor != "sqlite" or not pks:
+        return
+    table = connection.ops.quote_name(search_table(model))
+    with connection.cursor() as cursor:
+        for start in range(0, len(pks), BATCH_SIZE):
+            chunk = pks[start:start + BATCH_SIZE]
+            cursor.execute(
+                "DELETE FROM {} WHERE rowid IN ({})".format(
+                    table, ", ".join(["%s"] * len(chunk))), chunk)
+
+
+def rebuild_search_index(model, batch_size=BATCH_SIZE,
+                         using=DEFAULT_DB_ALIAS):
+    """Rebuild the SQLite full text index of model in batches.
+    """
+    connection = connections[using]
+    if connection.vendor != "sqlite":
+        return
+    with connection.cursor() as cursor:
+        cursor.execute("DELETE FROM {}".format(
+            connection.ops.quote_name(search_table(model))))
+    queryset = model._default_manager.using(using).order_by("pk")
+    last_pk = None
+    while True:
+        batch = queryset if last_pk is None else queryset.filter(
+            pk__gt=last_pk)
+        rows = list(batch.values_list(
+            "pk", *SEARCH_FIELDS)[:batch_size])
+        if not rows:
+            break
+        index_instances(model, rows, using)
+        last_pk = rows[-1][0]
+
+
+def _instance_saved(sender, instance, using=DEFAULT_DB_ALIAS, **kwargs):
+    index_instances(sender, [(instance.pk,) + tuple(
+        getattr(instance, name) for name in SEARCH_FIELDS)], using)
+
+
+def _instance_deleted(sender, instance, using=DEFAULT_DB_ALIAS, **kwargs):
+    remove_instances(sender, [instance.pk], using)
+
+
+def fts_query(text):
+    """Convert user input to an FTS5 prefix query of quoted terms."""
+    return " ".join('"{}"*'.format(term.replace('"', '""'))
+                    for term in text.split())
+
+
+def search(queryset, text, limit=None):
+    """Filter queryset by full text search, ordered by rank.
+
+    The index match is joined to queryset, so its filters apply before
+    the optional limit; a limited queryset can no longer be filtered.
+    """
+    model = queryset.model
+    connection = connections[queryset.db]
+    qn = connection.ops.quote_name
+    if is_registered(model) and connection.vendor == "sqlite":
+        query = fts_query(text)
+        if not query:
+            return queryset.none()
+        table = qn(search_table(model))
+        queryset = queryset.extra(
+            tables=[search_table(model)],
+            where=["{} MATCH %s".format(table),
+                   "{}.rowid = {}.{}".format(
+                       table, qn(model._meta.db_table),
+                       qn(model._meta.pk.column))],
+            params=[query],
+            select=dict(search_rank="{}.rank".format(table)),
+            order_by=["search_rank"])
+    elif is_registered(model) and connection.vendor == "postgresql":
+        document = _pg_document(connection, model, qualified=True)
+        tsquery = "plainto_tsquery('{}', %s)".format(PG_CONFIG)
+        queryset = queryset.extra(
+            where=["{} @@ {}".format(document, tsquery)], params=[text],
+            select=dict(search_rank="ts_rank({}, {})".format(
+                document, tsquery)),
+            select_params=[text], order_by=["-search_rank"])
+    else:
+        condition = Q()
+        for name in SEARCH_FIELDS:
+            condition |= Q(**{"{}__icontains".format(name): text})
+        queryset = queryset.filter(condition)
+    if limit is not None:
+        queryset = queryset[:limit]
+    return queryset
@@ -0,0 +1,49 @@
+"""
+.. module:: django_core_utils.signals
+   :synopsis: django_core_utils signal handlers module.
+
+django_core_utils signal handlers module.
+
+"""
+from __future__ import absolute_import
+
+from django.contrib.auth.models import User
+from django.db.models.signals import post_delete, post_save
+
+from .caching import USER_GENERATION_KEY, bump_generation
+from .counters import register_all_counters
+from .paginators import adjust_cached_count
+
+
+def user_changed(sender, update_fields=None, **kwargs):
+    """Invalidate cached user responses, except on login."""
+    if update_fields is not None and set(update_fields) == {"last_login"}:
+        return
+    bump_generation(USER_GENERATION_KEY)
+
+
+def instance_created(sender, created=False, **kwargs):
+    """Increment cached row count of created instance model."""
+    if created:
+        adjust_cached_count(sender, 1)
+
+
+def instance_deleted(sender, **kwargs):
+    """Decrement cached row count of deleted instance model."""
+    adjust_cached_count(sender, -1)
+
+
+def track_count(model):
+    """Maintain cached row count of model."""
+    post_save.connect(instance_created, sender=model,
+                      dispatch_uid="django_core_utils.instance_created")
+    post_delete.connect(instance_deleted, sender=model,
+                        dispatch_uid="django_core_utils.instance_deleted")
+
+
+def connect_signals():
+    """Connect django_core_utils signal handlers."""
+    for signal in (post_save, post_delete):
+        signal.connect(user_changed, sender=User,
+                       dispatch_uid="django_core_utils.user_changed")
+    register_all_counters()
@@ -51,12 +51,14 @@ class VersionedModelApiTestCase(BaseApiTestCase):
         serializer = serializer_class(instance)
         return serializer.data
 
-    def verify_create(self, url_name, data, model_class, data_format=None):
+    def verify_create(self, url_name, data, model_class, data_format=None,
+                      num_queries=None):
         """Verify post rest api request for model instance creation."""
         url = reverse(url_name)
         data_format = data_format or 'json'
         original_count = model_class.objects.count()
-        response = self.client.post(url, data, format=data_format)
+        response = self.assert_num_queries(
+            num_queries, self.client.post, url, data, format=data_format)
         self.assertEqual(response.status_code,
                          status.HTTP_201_CREATED,
                          response.data)
@@ -78,10 +80,11 @@ class VersionedModelApiTestCase(BaseApiTestCase):
                          dict2,
                          "%s does not match %s" % (dict1, dict2))
 
-    def verify_get(self, url_name, instance, serializer_class, excluded=None):
+    def verify_get(self, url_name, instance, serializer_class, excluded=None,
+                   num_queries=None):
         """Verify rest api get request."""
         url = reverse(url_name, args=[instance.id])
-        response = self.client.get(url)
+        response = self.assert_num_queries(num_queries, self.client.get, url)
         self.assertEqual(
             response.status_code, status.HTTP_200_OK, response.data)
         ref_data = self.instance_to_dict(instance, serializer_class)
@@ -99,20 +102,55 @@ class VersionedModelApiTestCase(BaseApiTestCase):
                                   effective_user=user, site=self.site,
                                   **kwargs)
 
-    def verify_get_defaults(self, excluded=None):
+    def verify_get_defaults(self, excluded=None, num_queries=None):
         """Verify rest api get request using default class data."""
         return self.verify_get(self.url_detail,
                                self.create_instance_default(),
                                self.serializer_class,
-                               excluded)
+                               excluded,
+                               num_queries)
+
+    def verify_list(self, url_name, expected_count=None, params=None,
+                    num_queries=None):
+        """Verify rest api list request.
+
+        The expected count applies to the results of paginated responses.
+        """
+        url = reverse(url_name)
+        response = self.assert_num_queries(
+            num_queries, self.client.get, url, params)
+        self.assertEqual(
+            response.status_code, status.HTTP_200_OK, response.data)
+        if expected_count is not None:
+            results = response.data
+            if isinstance(results, dict) and 'results' in results:
+                results = results['results']
+            self.assertEqual(len(results), expected_count,
+                             "unexpected list length for %s" % url)
+        return response
+
+    def verify_list_scaling(self, url_name=None, count=2, factor=10):
+        """Verify list request query count does not grow with row count.
+
+        Instances are created using create_instance_default.
+        """
+        url_name = url_name or self.url_list
+
+        def populate(number):
+            for _ in range(number):
+                self.create_instance_default()
+
+        return self.verify_query_scaling(
+            populate, lambda: self.verify_list(url_name), count, factor)
 
     def verify_put(self, url_name, instance, data,
-                   serializer_class, excluded=None):
+                   serializer_class, excluded=None, num_queries=None):
         """Verify put rest api request."""
         excluded = excluded or []
 
         url = reverse(url_name, args=[instance.id])
-        response = self.client.put(url, data, format='json')
+        response = self.assert_num_queries(
+            num_queries, self.client.put, url, data, format='json')
         self.assertEqual(
             response.status_code, status.HTTP_200_OK, response.data)
         expected_data = self.instance_to_dict(instance, serializer_class)
@@ -125,17 +163,18 @@ class VersionedModelApiTestCase(BaseApiTestCase):
 
         return response
 
-    def verify_delete(self, url_name, instance):
+    def verify_delete(self, url_name, instance, num_queries=None):
         """Verify delete rest api request."""
         url = reverse(url_name, args=[instance.id])
-        response = self.client.delete(url)
+        response = self.assert_num_queries(
+            num_queries, self.client.delete, url)
         self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
         return response
 
-    def verify_delete_default(self):
+    def verify_delete_default(self, num_queries=None):
         """Verify delete using default parameters."""
         instance = self.create_instance_default()
-        return self.verify_delete(self.url_detail, instance)
+        return self.verify_delete(self.url_detail, instance, num_queries)
 
 
 class NamedModelApiTestCase(VersionedModelApiTestCase):
@@ -149,16 +188,18 @@ class NamedModelApiTestCase(VersionedModelApiTestCase):
         return data
 
     def verify_create(self, url, data, model_class,
-                      expected_name=None, data_format=None):
+                      expected_name=None, data_format=None,
+                      num_queries=None):
         """Verify post request for named model instance creation."""
         response, instance = super(
             NamedModelApiTestCase, self).verify_create(
-                url, data, model_class, data_format=data_format)
+                url, data, model_class, data_format=data_format,
+                num_queries=num_queries)
         if expected_name:
             self.assertEqual(instance.name, expected_name)
         return response, instance
 
-    def verify_create_defaults(self, data=None):
+    def verify_create_defaults(self, data=None, num_queries=None):
         """Verify post request will all required arguments.
 
         Pulls the required parameters from the test class.
@@ -168,7 +209,8 @@ class NamedModelApiTestCase(VersionedModelApiTestCase):
             url=self.url_list,
             data=data,
             model_class=self.model_class,
-            expected_name=self.name)
+            expected_name=self.name,
+            num_queries=num_queries)
 
     def verify_create_defaults_partial(self):
         """Verify post request with partial required arguments.
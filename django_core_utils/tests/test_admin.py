@@ -0,0 +1,203 @@
+"""
+.. module::  django_core_utils.tests.test_admin
+   :synopsis: django_core_utils admin unit test module.
+
+*django_core_utils* admin unit test module.
+"""
+from __future__ import absolute_import, print_function
+
+from django.contrib import admin
+from django.contrib.admin.widgets import ManyToManyRawIdWidget
+from django.contrib.auth.models import User
+from django.test import RequestFactory, TestCase
+
+from . import factories
+from ..admin import (BaseNamedModelAdmin, VersionedModelAdmin,
+                     enable_selected, list_only_fields,
+                     list_select_related_fields, raw_id_related_fields,
+                     restore_selected, soft_delete_selected)
+from ..forms import GroupAdminForm
+from ..models import NamedModel
+from ..utils import current_site
+from .test_utils import ModelTableTestCase
+
+_app_label = 'test_admin'
+
+
+class AdminNamedModel(NamedModel):
+    """Sample named model class."""
+    class Meta(NamedModel.Meta):
+        """Meta model class."""
+        app_label = _app_label
+
+
+class ChangeListFieldsTestCase(TestCase):
+    """Change list query inference unit test class.
+    """
+    def test_select_related(self):
+        self.assertEqual(
+            list_select_related_fields(
+                AdminNamedModel, VersionedModelAdmin.list_display),
+            ('update_user',))
+
+    def test_only_fields(self):
+        model_admin = BaseNamedModelAdmin(AdminNamedModel, admin.site)
+        fields = list_only_fields(model_admin, AdminNamedModel,
+                                  BaseNamedModelAdmin.list_display)
+        self.assertEqual(fields, ('id', 'name', 'alias', 'version',
+                                  'update_time', 'update_user'))
+
+    def test_only_fields_unmapped(self):
+        model_admin = VersionedModelAdmin(AdminNamedModel, admin.site)
+        self.assertIsNone(list_only_fields(
+            model_admin, AdminNamedModel, ('id', '__str__')))
+
+
+class ChangeListTestCase(ModelTableTestCase):
+    """Change list queryset unit test class.
+    """
+    table_models = (AdminNamedModel,)
+
+    def setUp(self):
+        user = User.objects.create_superuser(
+            'admin_user', 'admin_user@example.com', 'pass')
+        for name in ('first', 'second'):
+            AdminNamedModel.objects.create(
+                name=name, creation_user=user, update_user=user,
+                effective_user=user, site=current_site())
+        self.request = RequestFactory().get('/')
+        self.request.user = user
+        self.model_admin = BaseNamedModelAdmin(AdminNamedModel, admin.site)
+
+    def test_results_deferred(self):
+        changelist = self.model_admin.get_changelist_instance(self.request)
+        self.assertEqual(len(changelist.result_list), 2)
+        for instance in changelist.result_list:
+            self.assertIn('uuid', instance.get_deferred_fields())
+
+    def test_action_queryset_loaded(self):
+        changelist = self.model_admin.get_changelist_instance(self.request)
+        for instance in changelist.get_queryset(self.request):
+            self.assertEqual(instance.get_deferred_fields(), set())
+
+
+class RawIdFieldsTestCase(TestCase):
+    """Large relation widgets unit test class.
+    """
+    def test_raw_id_related_fields(self):
+        self.assertEqual(
+            set(raw_id_related_fields(AdminNamedModel)),
+            {'creation_user', 'update_user', 'effective_user', 'site'})
+
+    def test_raw_id_related_fields_excluded(self):
+        self.assertEqual(
+            raw_id_related_fields(AdminNamedModel,
+                                  VersionedModelAdmin.readonly_fields),
+            ())
+
+    def test_group_form_users_widget(self):
+        self.assertIsInstance(GroupAdminForm.base_fields['users'].widget,
+                              ManyToManyRawIdWidget)
+
+
+class RecordingQuerySet(object):
+    """Sample queryset recording set based updates."""
+    model = AdminNamedModel
+
+    def __init__(self):
+        self.filters = []
+        self.updates = []
+
+    def filter(self, **kwargs):
+        self.filters.append(kwargs)
+        return self
+
+    def versioned_update(self, user=None, **kwargs):
+        self.updates.append((user, kwargs))
+        return 2
+
+    def soft_delete(self, user=None):
+        self.updates.append((user, dict(deleted=True)))
+        return 1
+
+
+class RecordingAdmin(object):
+    """Sample model admin recording messages."""
+    def __init__(self):
+        self.messages = []
+
+    def message_user(self, request, message):
+        self.messages.append(message)
+
+
+class Request(object):
+    """Sample request class."""
+    user = 'admin_user'
+
+
+class ActionsTestCase(TestCase):
+    """Set based admin actions unit test class.
+    """
+    def test_enable(self):
+        queryset, model_admin = RecordingQuerySet(), RecordingAdmin()
+        enable_selected(model_admin, Request(), queryset)
+        self.assertEqual(queryset.filters, [dict(enabled=False)])
+        self.assertEqual(queryset.updates,
+                         [('admin_user', dict(enabled=True))])
+        self.assertIn('2', model_admin.messages[0])
+
+    def test_soft_delete(self):
+        queryset, model_admin = RecordingQuerySet(), RecordingAdmin()
+        soft_delete_selected(model_admin, Request(), queryset)
+        self.assertEqual(queryset.updates,
+                         [('admin_user', dict(deleted=True))])
+        self.assertIn('1', model_admin.messages[0])
+
+    def test_registered(self):
+        self.assertIn(soft_delete_selected, VersionedModelAdmin.actions)
+
+
+class RowActionsTestCase(ModelTableTestCase):
+    """Set based admin actions on database rows unit test class.
+    """
+    table_models = (AdminNamedModel,)
+
+    def setUp(self):
+        self.owner, self.admin_user = factories.UserFactory.create_users(
+            count=2)
+        self.instances = [
+            AdminNamedModel.objects.create(
+                name=name, creation_user=self.owner, update_user=self.owner,
+                effective_user=self.owner, site=current_site())
+            for name in ('first', 'second')]
+        self.request = Request()
+        self.request.user = self.admin_user
+        self.model_admin = RecordingAdmin()
+
+    def _run(self, action):
+        action(self.model_admin, self.request, AdminNamedModel.objects.all())
+        return self.model_admin.messages[-1]
+
+    def _rows(self):
+        return list(AdminNamedModel.objects.order_by('name').values_list(
+            'version', 'update_user', 'effective_user'))
+
+    def test_enable(self):
+        AdminNamedModel.objects.filter(name='first').update(enabled=False)
+        self.assertIn(' 1 ', self._run(enable_selected))
+        self.assertEqual(self._rows(), [
+            (2, self.admin_user.pk, self.admin_user.pk),
+            (1, self.owner.pk, self.owner.pk)])
+        self.assertFalse(
+            AdminNamedModel.objects.filter(enabled=False).exists())
+
+    def test_soft_delete_restore(self):
+        self.assertIn(' 2 ', self._run(soft_delete_selected))
+        self.assertIn(' 0 ', self._run(soft_delete_selected))
+        self.assertEqual(
+            AdminNamedModel.objects.filter(deleted=True).count(), 2)
+        self.assertIn(' 2 ', self._run(restore_selected))
+        self.assertEqual(self._rows(), [
+            (3, self.admin_user.pk, self.admin_user.pk)] * 2)
+        self.assertFalse(
+            AdminNamedModel.objects.filter(deleted=True).exists())
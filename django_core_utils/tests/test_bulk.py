@@ -0,0 +1,120 @@
+"""
+.. module::  django_core_utils.tests.test_bulk
+   :synopsis: django_core_utils bulk unit test module.
+
+*django_core_utils* bulk unit test module.
+"""
+from __future__ import absolute_import, print_function
+
+from django.contrib.sites.models import Site
+
+from . import factories
+from .. import bulk
+from ..models import NamedModel
+from .test_utils import ModelTableTestCase
+
+_app_label = 'test_bulk'
+
+
+class Currency(NamedModel):
+    """Sample reference data model class."""
+    class Meta(NamedModel.Meta):
+        """Meta model class."""
+        app_label = _app_label
+
+
+class UpsertTestCase(ModelTableTestCase):
+    """Named model upsert unit test class.
+    """
+    table_models = (Currency,)
+
+    def setUp(self):
+        self.user = factories.UserFactory()
+        self.site = Site.objects.get_current()
+        self.records = [
+            dict(name='USD', alias='US Dollar'),
+            dict(name='EUR', alias='Euro'),
+            dict(name='GBP', alias='Pound')]
+
+    def _upsert(self, records, **kwargs):
+        return Currency.objects.upsert(
+            records, user=self.user, site=self.site, **kwargs)
+
+    def _verify(self):
+        counts = self._upsert(self.records)
+        self.assertEqual(counts, dict(created=3, updated=0, unchanged=0))
+        counts = self._upsert([
+            dict(name='USD', alias='Dollar'),
+            dict(name='EUR', alias='Euro'),
+            dict(name='JPY', alias='Yen')], batch_size=2)
+        self.assertEqual(counts, dict(created=1, updated=1, unchanged=1))
+
+        usd = Currency.objects.get(name='USD')
+        self.assertEqual(usd.alias, 'Dollar')
+        self.assertEqual(usd.alias_key, 'dollar')
+        self.assertEqual(usd.version, 2)
+        self.assertEqual(usd.update_user, self.user)
+        self.assertEqual(Currency.objects.get(name='EUR').version, 1)
+        jpy = Currency.objects.get(name='JPY')
+        self.assertEqual((jpy.version, jpy.name_key), (1, 'jpy'))
+        self.assertEqual(Currency.objects.count(), 4)
+
+    def test_upsert(self):
+        self._verify()
+
+    def test_upsert_fallback(self):
+        native = bulk.supports_native_upsert
+        bulk.supports_native_upsert = lambda connection: False
+        try:
+            self._verify()
+        finally:
+            bulk.supports_native_upsert = native
+
+    def _verify_duplicates(self):
+        counts = self._upsert([
+            dict(name='USD', alias='Dollar'), dict(name='EUR', alias='Euro'),
+            dict(name='USD', alias='US Dollar')])
+        self.assertEqual(counts, dict(created=2, updated=0, unchanged=0))
+        self.assertEqual(Currency.objects.get(name='USD').alias, 'US Dollar')
+
+    def test_duplicate_keys(self):
+        self._verify_duplicates()
+
+    def test_duplicate_keys_fallback(self):
+        native = bulk.supports_native_upsert
+        bulk.supports_native_upsert = lambda connection: False
+        try:
+            self._verify_duplicates()
+        finally:
+            bulk.supports_native_upsert = native
+
+    def _verify_anonymous_update(self):
+        self._upsert(self.records)
+        counts = Currency.objects.upsert([
+            dict(name='USD', alias='Dollar'), dict(name='EUR', alias='Euro'),
+            dict(name='GBP', alias='Sterling')])
+        self.assertEqual(counts, dict(created=0, updated=2, unchanged=1))
+        self.assertEqual(
+            list(Currency.objects.order_by('name').values_list(
+                'name', 'alias', 'alias_key', 'version', 'update_user')),
+            [('EUR', 'Euro', 'euro', 1, self.user.pk),
+             ('GBP', 'Sterling', 'sterling', 2, self.user.pk),
+             ('USD', 'Dollar', 'dollar', 2, self.user.pk)])
+
+    def test_anonymous_update(self):
+        self._verify_anonymous_update()
+
+    def test_anonymous_update_fallback(self):
+        native = bulk.supports_native_upsert
+        bulk.supports_native_upsert = lambda connection: False
+        try:
+            self._verify_anonymous_update()
+        finally:
+            bulk.supports_native_upsert = native
+
+    def test_unchanged_queries(self):
+        self._upsert(self.records)
+        # a single select, within the transaction savepoint
+        with self.assertNumQueries(3):
+            counts = self._upsert(self.records)
+        self.assertEqual(counts['unchanged'], 3)
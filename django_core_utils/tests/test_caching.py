@@ -0,0 +1,70 @@
+"""
+.. module::  django_core_utils.tests.test_caching
+   :synopsis: django_core_utils caching unit test module.
+
+*django_core_utils* caching unit test module.
+"""
+from __future__ import absolute_import, print_function
+
+from django.contrib.auth.models import update_last_login
+from django.core.cache import cache
+from django.test import TestCase
+from rest_framework.test import APIRequestFactory
+
+from . import factories
+from ..caching import USER_GENERATION_KEY, bump_generation, generation
+from ..signals import connect_signals
+from ..views import UserList
+
+
+class GenerationTestCase(TestCase):
+    """Generation counter unit test class.
+    """
+    def setUp(self):
+        cache.clear()
+
+    def test_bump(self):
+        current = generation(USER_GENERATION_KEY)
+        self.assertEqual(generation(USER_GENERATION_KEY), current)
+        self.assertEqual(bump_generation(USER_GENERATION_KEY), current + 1)
+
+
+class UserListCacheTestCase(TestCase):
+    """Cached user list unit test class.
+    """
+    def setUp(self):
+        cache.clear()
+        connect_signals()
+        factories.UserFactory.create_users(count=3)
+
+    def _get(self, **extra):
+        request = APIRequestFactory().get('/users/', **extra)
+        response = UserList.as_view()(request)
+        response.render()
+        return response
+
+    def test_cached(self):
+        response = self._get()
+        self.assertEqual(response.data['count'], 3)
+        with self.assertNumQueries(0):
+            cached = self._get()
+        self.assertEqual(cached.data, response.data)
+        self.assertEqual(cached['ETag'], response['ETag'])
+
+    def test_not_modified(self):
+        etag = self._get()['ETag']
+        response = self._get(HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+    def test_invalidated_on_save(self):
+        etag = self._get()['ETag']
+        factories.UserFactory(username='another_user')
+        response = self._get()
+        self.assertEqual(response.data['count'], 4)
+        self.assertNotEqual(response['ETag'], etag)
+
+    def test_kept_on_login(self):
+        user = factories.UserFactory(username='another_user')
+        current = generation(USER_GENERATION_KEY)
+        update_last_login(None, user)
+        self.assertEqual(generation(USER_GENERATION_KEY), current)
@@ -0,0 +1,151 @@
+"""
+.. module::  django_core_utils.tests.test_counters
+   :synopsis: django_core_utils counters unit test module.
+
+*django_core_utils* counters unit test module.
+"""
+from __future__ import absolute_import, print_function
+
+from django.contrib.auth.models import User
+from django.contrib.sites.models import Site
+from django.core.management import CommandError, call_command
+from django.db.models.signals import m2m_changed
+from django.utils import timezone
+from django.utils.six import StringIO
+
+from . import factories
+from .. import counters, fields
+from ..management.commands import reconcile_counters
+from ..models import NamedModel
+from ..utils import sync_many_to_many
+from .test_utils import ModelTableTestCase
+
+_app_label = 'test_counters'
+
+
+class Club(NamedModel):
+    """Sample child model class."""
+    league = fields.foreign_key_field(
+        'League', on_delete=fields.models.CASCADE)
+
+    class Meta(NamedModel.Meta):
+        """Meta model class."""
+        app_label = _app_label
+
+
+class League(NamedModel):
+    """Sample model with related counts."""
+    members = fields.many_to_many_field(User, related_name='leagues')
+    member_count = fields.counter_field('members')
+    club_count = fields.counter_field((Club, 'league'))
+
+    class Meta(NamedModel.Meta):
+        """Meta model class."""
+        app_label = _app_label
+
+
+class CountersTestCase(ModelTableTestCase):
+    """Related count fields unit test class.
+    """
+    table_models = (League, Club)
+
+    @classmethod
+    def setUpClass(cls):
+        super(CountersTestCase, cls).setUpClass()
+        counters.register_counters(League)
+
+    def setUp(self):
+        self.users = factories.UserFactory.create_users(count=4)
+        self.defaults = dict(
+            creation_user=self.users[0], update_user=self.users[0],
+            effective_user=self.users[0], site=Site.objects.get_current())
+        self.leagues = [League.objects.create(name=name, **self.defaults)
+                        for name in ('east', 'west')]
+
+    def _counts(self, name):
+        return dict(League.objects.values_list('name', name))
+
+    def _club(self, name, league):
+        return Club.objects.create(name=name, league=league, **self.defaults)
+
+    def test_foreign_key(self):
+        east, west = self.leagues
+        clubs = [self._club(name, east) for name in ('a', 'b', 'c')]
+        self.assertEqual(self._counts('club_count'), dict(east=3, west=0))
+        club = Club.objects.get(pk=clubs[0].pk)
+        club.league = west
+        club.save()
+        club.save()
+        self.assertEqual(self._counts('club_count'), dict(east=2, west=1))
+        clubs[1].delete()
+        self.assertEqual(self._counts('club_count'), dict(east=1, west=1))
+
+    def test_owner_save(self):
+        east = self.leagues[0]
+        east.members.add(self.users[0])
+        self._club('a', east)
+        east.alias = 'x'
+        east.save()
+        self.assertEqual(
+            League.objects.filter(pk=east.pk).values_list(
+                'member_count', 'club_count', 'alias', 'version').get(),
+            (1, 1, 'x', 2))
+
+    def test_raw(self):
+        now = timezone.now()
+        club = Club(name='a', league=self.leagues[0], creation_time=now,
+                    update_time=now, **self.defaults)
+        club.save_base(raw=True)
+        self.assertEqual(self._counts('club_count'), dict(east=0, west=0))
+
+    def test_unobserved_remove(self):
+        east = self.leagues[0]
+        east.members.add(self.users[0])
+        m2m_changed.send(
+            sender=League.members.through, instance=east,
+            action='post_remove', reverse=False, model=User,
+            pk_set={self.users[0].pk}, using='default')
+        self.assertEqual(self._counts('member_count'), dict(east=1, west=0))
+
+    def test_upsert(self):
+        east, west = self.leagues
+        Club.objects.upsert(
+            [dict(name='a', league=east), dict(name='b', league=east),
+             dict(name='c', league=west)], user=self.users[0],
+            site=self.defaults['site'])
+        Club.objects.upsert([dict(name='a', league=east)],
+                            user=self.users[0], site=self.defaults['site'])
+        self.assertEqual(self._counts('club_count'), dict(east=2, west=1))
+
+    def test_many_to_many(self):
+        east, west = self.leagues
+        east.members.add(*self.users)
+        east.members.remove(self.users[0], self.users[0])
+        west.members.add(self.users[1])
+        self.users[2].leagues.add(west)
+        self.assertEqual(self._counts('member_count'), dict(east=3, west=2))
+        self.users[1].leagues.clear()
+        self.assertEqual(self._counts('member_count'), dict(east=2, west=1))
+        sync_many_to_many(east.members, [self.users[0].pk], chunk_size=1)
+        self.assertEqual(self._counts('member_count'), dict(east=1, west=1))
+        west.members.clear()
+        self.assertEqual(self._counts('member_count'), dict(east=1, west=0))
+
+    def test_reconcile(self):
+        east, west = self.leagues
+        self._club('a', west)
+        east.members.add(*self.users[:2])
+        League.objects.update(member_count=7, club_count=0)
+        corrected = counters.reconcile_counters(League, batch_size=1)
+        self.assertEqual(corrected, 3)
+        self.assertEqual(self._counts('member_count'), dict(east=2, west=0))
+        self.assertEqual(self._counts('club_count'), dict(east=0, west=1))
+        self.assertEqual(counters.reconcile_counters(League), 0)
+
+    def test_command(self):
+        # test models are not installed, nor reachable by label
+        output = StringIO()
+        call_command(reconcile_counters.Command(), stdout=output)
+        self.assertEqual(output.getvalue(), '')
+        with self.assertRaises(CommandError):
+            call_command(reconcile_counters.Command(), 'test_counters.League')
@@ -6,13 +6,19 @@
 """
 from __future__ import absolute_import, print_function
 
+from decimal import Decimal
 from inspect import getargspec, getmembers, isfunction
 
+import moneyed
 from django.core.exceptions import ValidationError
-from django.db import models
+from django.db import connection, models
 from django.test import TestCase
 
-from .. import fields
+from .. import compressed_fields, fields, json_fields
+from .. import lazy_fields, money_fields
+from .test_utils import ModelTableTestCase
+
+_app_label = 'test_fields'
 
 
 def _is_no_args(fn):
@@ -185,6 +191,115 @@ class JsonFieldTestCase(FieldTestCase):
         self.assertEqual(field.default, default)
 
 
+class Document(models.Model):
+    """Sample json document model class."""
+    data = fields.json_field(indexed_paths=['status', 'owner.id'])
+    extra = fields.json_field(lazy=True, null=True)
+
+    class Meta(object):
+        """Meta model class."""
+        app_label = _app_label
+
+
+class JsonStorageTestCase(ModelTableTestCase):
+    """
+    Json field storage unit test class.
+    """
+    table_models = (Document,)
+
+    def setUp(self):
+        Document.objects.create(
+            data=dict(status='open', owner=dict(id=1)), extra=[1, 2])
+        Document.objects.create(data=dict(status='closed', owner=dict(id=2)))
+
+    def test_indexed_paths(self):
+        field = Document._meta.get_field('data_owner_id')
+        self.assertTrue(field.db_index)
+        self.assertEqual(Document._meta.get_field('data').indexed_field_names,
+                         ['data_status', 'data_owner_id'])
+        self.assertEqual(
+            Document.objects.filter(data_status='open').count(), 1)
+        self.assertEqual(
+            Document.objects.get(data_owner_id='2').data['status'], 'closed')
+
+    def test_key_transform(self):
+        self.assertEqual(
+            Document.objects.get(data__owner__id=1).data_status, 'open')
+        self.assertEqual(
+            Document.objects.filter(data__status='closed').count(), 1)
+
+    def test_lazy(self):
+        instance = Document.objects.get(data_status='open')
+        self.assertIsInstance(instance.__dict__['extra'],
+                              json_fields.EncodedValue)
+        self.assertEqual(instance.extra, [1, 2])
+        other = Document.objects.get(data_status='open')
+        other.save()
+        self.assertEqual(Document.objects.get(pk=other.pk).extra, [1, 2])
+
+    def test_deferred(self):
+        instance = Document.objects.defer('data', 'extra').get(
+            data_status='open')
+        self.assertEqual(instance.get_deferred_fields(), {'data', 'extra'})
+        with self.assertNumQueries(1):
+            self.assertEqual(instance.extra, [1, 2])
+        self.assertEqual(instance.data['owner'], dict(id=1))
+        self.assertEqual(instance.get_deferred_fields(), set())
+
+
+class Host(models.Model):
+    """Sample network host model class."""
+    address = fields.packed_ip_address_field()
+    mac = fields.packed_mac_address_field(null=True)
+
+    class Meta(object):
+        """Meta model class."""
+        app_label = _app_label
+
+
+class PackedAddressTestCase(ModelTableTestCase):
+    """
+    Packed ip and mac address field unit test class.
+    """
+    table_models = (Host,)
+
+    def setUp(self):
+        for address, mac in (('10.0.0.1', '00:1b:63:84:45:e6'),
+                             ('10.255.0.1', '00:1b:63:00:00:01'),
+                             ('11.0.0.1', '00:1c:00:00:00:01'),
+                             ('2001:db8::1', None)):
+            Host.objects.create(address=address, mac=mac)
+
+    def test_values(self):
+        host = Host.objects.get(address='10.0.0.1')
+        self.assertEqual(host.address, '10.0.0.1')
+        self.assertEqual(str(host.mac), '00-1B-63-84-45-E6')
+        self.assertEqual(
+            list(Host.objects.order_by('address').values_list(
+                'address', flat=True)),
+            ['10.0.0.1', '10.255.0.1', '11.0.0.1', '2001:db8::1'])
+
+    def test_in_cidr(self):
+        self.assertEqual(
+            Host.objects.filter(address__in_cidr='10.0.0.0/8').count(), 2)
+        self.assertEqual(
+            Host.objects.filter(address__in_cidr='2001:db8::/32').count(), 1)
+
+    def test_prefix(self):
+        self.assertEqual(
+            Host.objects.filter(mac__prefix='00:1b:63').count(), 2)
+        self.assertEqual(
+            Host.objects.filter(mac__prefix='00-1C-00').count(), 1)
+        self.assertEqual(
+            Host.objects.filter(mac__prefix='00:1b:63:84').count(), 1)
+        self.assertEqual(Host.objects.filter(mac__prefix='00:1').count(), 3)
+        self.assertEqual(Host.objects.filter(
+            mac__prefix='00:1b:63:00:00:01').count(), 1)
+        for prefix in ('00:1g', '00:1b:63:84:45:e6:00', ''):
+            with self.assertRaises(ValueError):
+                Host.objects.filter(mac__prefix=prefix).count()
+
+
 class MoneyFieldTestCase(FieldTestCase):
     """
     Money field unit test class.
@@ -208,3 +323,196 @@ class MoneyFieldTestCase(FieldTestCase):
         self.assertEqual(field.max_digits, max_digits)
         self.assertEqual(field.decimal_places, decimal_places)
         self.assertEqual(field.default_currency, default_currency)
+
+
+class Payment(models.Model):
+    """Sample minor unit money model class."""
+    amount = fields.minor_unit_money_field()
+
+    objects = models.Manager.from_queryset(money_fields.MoneyQuerySet)()
+
+    class Meta(object):
+        """Meta model class."""
+        app_label = _app_label
+
+
+class MinorUnitMoneyTestCase(ModelTableTestCase):
+    """
+    Minor unit money field unit test class.
+    """
+    table_models = (Payment,)
+
+    def setUp(self):
+        for amount, currency in (('10.25', 'USD'), ('4.75', 'USD'),
+                                 ('3.00', 'EUR')):
+            Payment.objects.create(amount=moneyed.Money(amount, currency))
+
+    def test_values(self):
+        payment = Payment.objects.get(amount_currency='EUR')
+        self.assertEqual(payment.amount, moneyed.Money('3.00', 'EUR'))
+        self.assertEqual(payment.__dict__['amount'], 300)
+        self.assertEqual(Payment().amount, moneyed.Money('0', 'USD'))
+
+    def test_totals(self):
+        self.assertEqual(Payment.objects.money_sum('amount'), dict(
+            USD=moneyed.Money('15.00', 'USD'),
+            EUR=moneyed.Money('3.00', 'EUR')))
+        self.assertEqual(Payment.objects.money_avg('amount')['USD'],
+                         moneyed.Money('7.50', 'USD'))
+        self.assertEqual(
+            Payment.objects.money_totals('amount')['USD']['count'], 2)
+
+    def test_arrays(self):
+        arrays = Payment.objects.money_arrays('amount')
+        self.assertEqual(sorted(arrays['USD']), [475, 1025])
+
+    def test_lookups(self):
+        self.assertEqual(Payment.objects.filter(
+            amount=moneyed.Money('3.00', 'EUR')).count(), 1)
+        self.assertFalse(Payment.objects.filter(
+            amount=moneyed.Money('3.00', 'USD')).exists())
+        self.assertEqual(Payment.objects.filter(amount=300).count(), 1)
+        with self.assertRaises(ValueError):
+            Payment.objects.filter(amount__gt=moneyed.Money('3', 'EUR'))
+
+    def test_precision(self):
+        field = Payment._meta.get_field('amount')
+        self.assertEqual(field.to_minor(Decimal('1.50')), 150)
+        with self.assertRaises(ValidationError):
+            field.to_minor(Decimal('1.505'))
+
+    def test_deferred(self):
+        payment = Payment.objects.defer('amount', 'amount_currency').get(
+            amount_currency='EUR')
+        with self.assertNumQueries(1):
+            self.assertEqual(payment.amount, moneyed.Money('3.00', 'EUR'))
+
+
+class Article(models.Model):
+    """Sample compressed text model class."""
+    description = fields.text_field(blank=True, null=True)
+    body = fields.compressed_text_field()
+
+    class Meta(object):
+        """Meta model class."""
+        app_label = _app_label
+
+
+class CompressedTextTestCase(ModelTableTestCase):
+    """
+    Compressed text field unit test class.
+    """
+    table_models = (Article,)
+    text = u'caf\xe9 ' * 1000
+
+    def test_round_trip(self):
+        Article.objects.create(body=self.text)
+        Article.objects.create(body=u'short')
+        long_body, short_body = [
+            article.__dict__['body']
+            for article in Article.objects.order_by('pk')]
+        self.assertIsInstance(long_body, compressed_fields.EncodedBytes)
+        self.assertEqual(long_body[:1], compressed_fields.HEADER_ZLIB)
+        self.assertLess(len(long_body), 100)
+        self.assertEqual(short_body[:1], compressed_fields.HEADER_RAW)
+        article = Article.objects.order_by('pk').first()
+        self.assertEqual(article.body, self.text)
+
+    def test_compress_column(self):
+        Article.objects.create(description=self.text)
+        Article.objects.create(description=None)
+        Article.objects.create(description=u'short')
+        self.assertEqual(compressed_fields.compress_column(
+            Article, 'description', 'body', batch_size=1), 2)
+        self.assertEqual([article.body for article in Article.objects.order_by(
+            'pk')], [self.text, None, u'short'])
+
+    def test_compress_column_null_batch(self):
+        for description in (None, None, self.text):
+            Article.objects.create(description=description)
+        operations = connection.ops
+        # batch sizes of backends without parameter limits
+        operations.bulk_batch_size = lambda fields, objs: len(objs)
+        try:
+            self.assertEqual(compressed_fields.compress_column(
+                Article, 'description', 'body', batch_size=2), 1)
+        finally:
+            del operations.bulk_batch_size
+        self.assertEqual([article.body for article in Article.objects.order_by(
+            'pk')], [None, None, self.text])
+
+    def test_compress_column_queries(self):
+        for index in range(5):
+            Article.objects.create(description=self.text)
+        # a select and, within a savepoint, an update per batch
+        with self.assertNumQueries(5):
+            self.assertEqual(compressed_fields.compress_column(
+                Article, 'description', 'body'), 5)
+        self.assertEqual(set(article.body for article
+                             in Article.objects.all()), {self.text})
+
+    def test_deferred(self):
+        Article.objects.create(body=self.text)
+        article = Article.objects.defer('body').get()
+        with self.assertNumQueries(1):
+            self.assertEqual(article.body, self.text)
+
+
+class Contact(models.Model):
+    """Sample lazily decoded fields model class."""
+    timezone = fields.timezone_field(lazy=True)
+    phone = fields.phone_number_field(lazy=True)
+    balance = fields.money_field(lazy=True)
+    mac = fields.mac_address_field(lazy=True)
+
+    class Meta(object):
+        """Meta model class."""
+        app_label = _app_label
+
+
+class LazyFieldsTestCase(ModelTableTestCase):
+    """
+    Lazily decoded third party fields unit test class.
+    """
+    table_models = (Contact,)
+
+    def setUp(self):
+        for mac in ('00:1b:63:84:45:e6', '00:1b:63:84:45:e7'):
+            Contact.objects.create(
+                timezone='Europe/Paris', phone='+33142685300',
+                balance=moneyed.Money('12.50', 'EUR'), mac=mac)
+
+    def test_not_decoded(self):
+        contact = Contact.objects.order_by('pk').first()
+        for name in ('timezone', 'phone', 'mac'):
+            self.assertIsInstance(contact.__dict__[name],
+                                  lazy_fields.LazyDecodingMixin.encoded_type)
+        field = Contact._meta.get_field('phone')
+        self.assertEqual(field.value_to_string(contact), '+33142685300')
+        contact.save()
+        self.assertEqual(
+            Contact.objects.get(pk=contact.pk).phone.as_e164,
+            '+33142685300')
+
+    def test_decoded(self):
+        first, second = Contact.objects.order_by('pk')
+        self.assertEqual(first.timezone.zone, 'Europe/Paris')
+        self.assertIs(first.timezone, second.timezone)
+        self.assertEqual(first.balance, moneyed.Money('12.50', 'EUR'))
+        self.assertIs(first.balance, second.balance)
+        self.assertEqual(first.phone.as_e164, '+33142685300')
+        self.assertEqual(int(first.mac), 0x001b638445e6)
+        first.phone = '+33142685301'
+        self.assertEqual(first.phone.as_e164, '+33142685301')
+
+    def test_deferred(self):
+        names = ('timezone', 'phone', 'balance', 'mac')
+        contact = Contact.objects.defer(*names).order_by('pk').first()
+        for name in names:
+            self.assertIn(name, contact.get_deferred_fields())
+            with self.assertNumQueries(1):
+                getattr(contact, name)
+        self.assertEqual(contact.timezone.zone, 'Europe/Paris')
+        self.assertEqual(contact.phone.as_e164, '+33142685300')
+        self.assertEqual(contact.balance, moneyed.Money('12.50', 'EUR'))
+        self.assertEqual(int(contact.mac), 0x001b638445e6)
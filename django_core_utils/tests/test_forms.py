@@ -0,0 +1,47 @@
+"""
+.. module::  django_core_utils.tests.test_forms
+   :synopsis: django_core_utils forms unit test module.
+
+*django_core_utils* forms unit test module.
+"""
+from __future__ import absolute_import, print_function
+
+from django.test import TestCase
+
+from . import factories
+from ..forms import GroupAdminForm
+from ..utils import sync_many_to_many
+
+
+class GroupMembershipTestCase(TestCase):
+    """Group membership update unit test class.
+    """
+    def setUp(self):
+        self.users = factories.UserFactory.create_users(count=4)
+        self.group = factories.GroupFactory()
+        self.group.user_set.add(*self.users[:2])
+
+    def _member_ids(self):
+        return set(self.group.user_set.values_list('pk', flat=True))
+
+    def test_sync(self):
+        target = [user.pk for user in self.users[1:]]
+        added, removed = sync_many_to_many(self.group.user_set, target)
+        self.assertEqual(added, set(target[1:]))
+        self.assertEqual(removed, {self.users[0].pk})
+        self.assertEqual(self._member_ids(), set(target))
+
+    def test_sync_unchanged(self):
+        target = [user.pk for user in self.users[:2]]
+        with self.assertNumQueries(1):
+            sync_many_to_many(self.group.user_set, target)
+
+    def test_form_save(self):
+        ids = [self.users[1].pk, self.users[3].pk]
+        form = GroupAdminForm(
+            data=dict(name=self.group.name,
+                      users=','.join(str(pk) for pk in ids)),
+            instance=self.group)
+        self.assertTrue(form.is_valid(), form.errors)
+        form.save()
+        self.assertEqual(self._member_ids(), set(ids))
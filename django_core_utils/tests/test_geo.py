@@ -0,0 +1,96 @@
+"""
+.. module::  django_core_utils.tests.test_geo
+   :synopsis: django_core_utils geo unit test module.
+
+*django_core_utils* geo unit test module.
+"""
+from __future__ import absolute_import, print_function
+
+from django.test import TestCase
+
+from .. import geo
+from .test_utils import ModelTableTestCase
+
+_app_label = 'test_geo'
+
+_cities = dict(
+    london=(51.507222, -0.1275),
+    paris=(48.856613, 2.352222),
+    brussels=(50.846667, 4.3525),
+    new_york=(40.712778, -74.006111),
+    sydney=(-33.865, 151.209444))
+
+
+class Place(geo.GeoLocatedModel):
+    """Sample geo located model class."""
+    class Meta(geo.GeoLocatedModel.Meta):
+        """Meta model class."""
+        app_label = _app_label
+
+
+class GeohashTestCase(TestCase):
+    """Geohash unit test class.
+    """
+    def test_encode(self):
+        self.assertEqual(geo.geohash_encode(57.64911, 10.40744, 11),
+                         'u4pruydqqvj')
+
+    def test_neighbourhood(self):
+        cells = geo.cell_neighbourhood(57.64911, 10.40744, 5)
+        self.assertEqual(len(cells), 9)
+        self.assertIn('u4pru', cells)
+
+    def test_distances(self):
+        london, paris = _cities['london'], _cities['paris']
+        km = geo.distances(london[0], london[1], [paris[0]], [paris[1]])
+        self.assertAlmostEqual(km[0], 343.5, delta=1)
+
+
+class ProximityTestCase(ModelTableTestCase):
+    """Proximity query unit test class.
+    """
+    table_models = (Place,)
+
+    def setUp(self):
+        for latitude, longitude in _cities.values():
+            Place.objects.create(latitude=latitude, longitude=longitude)
+        self.london = _cities['london']
+
+    def test_geohash_set(self):
+        place = Place.objects.order_by('pk').first()
+        self.assertEqual(place.geohash, geo.geohash_encode(
+            place.latitude, place.longitude))
+
+    def test_within_radius(self):
+        places = Place.objects.within_radius(
+            self.london[0], self.london[1], 330)
+        self.assertEqual(len(places), 2)
+        self.assertAlmostEqual(places[1].distance, 320.8, delta=1)
+        places = Place.objects.within_radius(
+            self.london[0], self.london[1], 350)
+        self.assertEqual(len(places), 3)
+
+    def test_within_radius_high_latitude(self):
+        # the radius spans a cell width at the center latitude only, the
+        # place lies slightly poleward, beyond a neighbour cell to the west
+        place = Place.objects.create(latitude=64.9582, longitude=22.4966)
+        places = Place.objects.within_radius(65.0, 33.7500001, 528.6)
+        self.assertEqual([instance.pk for instance in places], [place.pk])
+
+    def test_within_radius_batches(self):
+        Place.objects.bulk_create([
+            Place(latitude=self.london[0], longitude=self.london[1],
+                  geohash=geo.geohash_encode(*self.london))
+            for index in range(1200)])
+        # a values query and three instance batches
+        with self.assertNumQueries(4):
+            places = Place.objects.within_radius(
+                self.london[0], self.london[1], 1)
+        self.assertEqual(len(places), 1201)
+
+    def test_nearest(self):
+        places = Place.objects.nearest(self.london[0], self.london[1], 3)
+        self.assertEqual([place.distance < 1 for place in places],
+                         [True, False, False])
+        self.assertAlmostEqual(places[1].distance, 320.8, delta=1)
+        self.assertEqual(len(Place.objects.nearest(0, 0, 10)), 5)
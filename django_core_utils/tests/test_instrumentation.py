@@ -0,0 +1,113 @@
+"""
+.. module::  django_core_utils.tests.test_instrumentation
+   :synopsis: django_core_utils instrumentation unit test module.
+
+*django_core_utils* instrumentation unit test module.
+"""
+from __future__ import absolute_import, print_function
+
+import re
+import time
+
+from django.db import connection
+from django.test import TestCase, override_settings
+from rest_framework import serializers
+from rest_framework.generics import GenericAPIView
+from rest_framework.response import Response
+from rest_framework.test import APIRequestFactory
+from rest_framework.views import APIView
+
+from ..instrumentation import (BUDGET_ACTION_RAISE, SERVER_TIMING_HEADER,
+                               QueryBudgetExceeded, QueryBudgetMixin,
+                               QueryRecorder)
+
+
+def _execute_queries(count):
+    with connection.cursor() as cursor:
+        for _ in range(count):
+            cursor.execute("SELECT 1")
+
+
+class SampleView(QueryBudgetMixin, APIView):
+    """Sample instrumented view class."""
+    query_budget = 2
+    query_count = 2
+
+    def get(self, request):
+        _execute_queries(self.query_count)
+        return Response({"status": "ok"})
+
+
+class SlowSerializer(serializers.Serializer):
+    """Sample serializer with slow output."""
+    status = serializers.CharField()
+
+    def to_representation(self, instance):
+        time.sleep(0.02)
+        return super(SlowSerializer, self).to_representation(instance)
+
+    def update(self, instance, validated_data):
+        instance.update(validated_data)
+        return instance
+
+
+class SerializerView(QueryBudgetMixin, GenericAPIView):
+    """Sample instrumented view serializing an instance."""
+    serializer_class = SlowSerializer
+
+    def get(self, request):
+        return Response(self.get_serializer(dict(status="ok")).data)
+
+    def put(self, request):
+        serializer = self.get_serializer(dict(status="ok"), request.data)
+        serializer.is_valid(raise_exception=True)
+        serializer.save()
+        return Response(serializer.data)
+
+
+class QueryRecorderTestCase(TestCase):
+    """Query recorder unit test class.
+    """
+    def test_count(self):
+        with QueryRecorder() as recorder:
+            _execute_queries(3)
+        self.assertEqual(recorder.count, 3, "invalid query count")
+        self.assertTrue(recorder.duration >= 0)
+
+
+class QueryBudgetMixinTestCase(TestCase):
+    """Query budget mixin unit test class.
+    """
+    def _get(self, **initkwargs):
+        request = APIRequestFactory().get("/sample/")
+        return SampleView.as_view(**initkwargs)(request)
+
+    def test_server_timing(self):
+        response = self._get()
+        self.assertEqual(response.status_code, 200)
+        header = response[SERVER_TIMING_HEADER]
+        self.assertIn('desc="2 queries"', header)
+        self.assertIn("render;dur=", header)
+
+    def test_serialize_timing(self):
+        for request, status in (
+                (APIRequestFactory().get("/sample/"), "ok"),
+                (APIRequestFactory().put(
+                    "/sample/", dict(status="done"), format="json"),
+                 "done")):
+            response = SerializerView.as_view()(request)
+            self.assertEqual(response.data, dict(status=status))
+            duration = re.search(r"serialize;dur=([\d.]+)",
+                                 response[SERVER_TIMING_HEADER]).group(1)
+            self.assertTrue(float(duration) >= 20)
+
+    @override_settings(DEBUG=True)
+    def test_budget_exceeded_raise(self):
+        with self.assertRaises(QueryBudgetExceeded):
+            self._get(query_count=3, query_budget_action=BUDGET_ACTION_RAISE)
+
+    @override_settings(DEBUG=False, QUERY_BUDGET_ENFORCE=False)
+    def test_budget_not_enforced(self):
+        response = self._get(query_count=3,
+                             query_budget_action=BUDGET_ACTION_RAISE)
+        self.assertEqual(response.status_code, 200)
@@ -8,11 +8,21 @@
 """
 from __future__ import absolute_import, print_function
 
+import uuid
+
+from django.contrib.auth.models import User
+from django.contrib.sites.models import Site
+from django.db.models.functions import Length
+from django.db.models.signals import m2m_changed
 from django.test import TestCase
 
+from . import factories
+from .. import constants, fields
 from ..models import (NamedModel, VersionedModel, db_table,
                       db_table_for_app_and_class, db_table_for_class,
                       pluralize, verbose_class_name)
+from ..utils import normalize_name
+from .test_utils import ModelTableTestCase
 
 _app_label = 'test_inflection'
 
@@ -70,6 +80,99 @@ class VersionedModelTestCase(TestCase):
         self.assertTrue(str(instance).startswith(expected))
 
 
+class VersionedQuerySetTestCase(ModelTableTestCase):
+    """Versioned model queryset unit test class.
+    """
+    table_models = (MyModel,)
+
+    def setUp(self):
+        self.user, self.other = factories.UserFactory.create_users(count=2)
+        self.instances = [
+            MyModel.objects.create(
+                creation_user=self.user, update_user=self.user,
+                effective_user=self.user, site=Site.objects.get_current())
+            for index in range(2)]
+
+    def test_versioned_update(self):
+        instance = self.instances[0]
+        count = MyModel.objects.filter(pk=instance.pk).versioned_update(
+            user=self.other, enabled=False)
+        self.assertEqual(count, 1)
+        updated = MyModel.objects.get(pk=instance.pk)
+        self.assertEqual((updated.version, updated.enabled), (2, False))
+        self.assertGreater(updated.update_time, instance.update_time)
+        self.assertEqual(updated.update_user, self.other)
+        self.assertEqual(updated.effective_user, self.other)
+        self.assertEqual(updated.creation_user, self.user)
+        self.assertEqual(
+            MyModel.objects.get(pk=self.instances[1].pk).version, 1)
+
+    def test_soft_delete(self):
+        self.assertEqual(MyModel.objects.all().soft_delete(), 2)
+        self.assertEqual(MyModel.objects.all().soft_delete(), 0)
+        self.assertEqual(
+            set(MyModel.objects.values_list('deleted', 'version')),
+            {(True, 2)})
+
+
+class Team(VersionedModel):
+    """Sample versioned model with members."""
+    members = fields.many_to_many_field(User, related_name='teams')
+
+    class Meta(VersionedModel.Meta):
+        """Meta model class."""
+        app_label = _app_label
+
+
+class SetRelatedIdsTestCase(ModelTableTestCase):
+    """Versioned model related ids update unit test class.
+    """
+    table_models = (Team,)
+
+    def setUp(self):
+        self.users = factories.UserFactory.create_users(count=5)
+        user = self.users[0]
+        self.team = Team.objects.create(
+            creation_user=user, update_user=user, effective_user=user,
+            site=Site.objects.get_current())
+        self.team.members.add(*self.users[:3])
+        self.changes = []
+        m2m_changed.connect(self._changed, sender=Team.members.through)
+
+    def tearDown(self):
+        m2m_changed.disconnect(self._changed, sender=Team.members.through)
+
+    def _changed(self, action, pk_set, **kwargs):
+        self.changes.append((action, len(pk_set)))
+
+    def test_chunked(self):
+        ids = [user.pk for user in self.users[2:]]
+        added, removed = self.team.set_related_ids(
+            'members', ids, user=self.users[1], chunk_size=1)
+        self.assertEqual((len(added), len(removed)), (2, 2))
+        self.assertEqual(set(Team.members.through.objects.filter(
+            team=self.team).values_list('user_id', flat=True)), set(ids))
+        self.assertEqual([action for action, _ in self.changes],
+                         ['pre_remove', 'post_remove'] * 2 +
+                         ['pre_add', 'post_add'] * 2)
+        team = Team.objects.get(pk=self.team.pk)
+        self.assertEqual(team.version, 2)
+        self.assertEqual(self.team.version, 2)
+        self.assertEqual(team.update_user, self.users[1])
+
+    def test_unchanged(self):
+        ids = [user.pk for user in self.users[:3]]
+        with self.assertNumQueries(1):
+            self.team.set_related_ids('members', ids)
+        self.assertEqual(Team.objects.get(pk=self.team.pk).version, 1)
+
+    def test_string_ids(self):
+        ids = [str(user.pk) for user in self.users[:3]]
+        with self.assertNumQueries(1):
+            added, removed = self.team.set_related_ids('members', ids)
+        self.assertEqual((added, removed), (set(), set()))
+
+
 class MyNamedModel(NamedModel):
     """Sample named model class."""
     class Meta(NamedModel.Meta):
@@ -84,3 +187,136 @@ class NamedModelTestCase(TestCase):
         myname = 'myname'
         instance = MyNamedModel(name=myname)
         self.assertEqual(str(instance), myname, "invalid str result")
+
+    def test_set_name_keys(self):
+        instance = MyNamedModel(name=u'  S\xe3o   Paulo ', alias='SP')
+        instance.set_name_keys()
+        self.assertEqual(instance.name_key, 'sao paulo')
+        self.assertEqual(instance.alias_key, 'sp')
+
+
+class MyResolvedModel(NamedModel):
+    """Sample named model resolved in memory."""
+    resolve_in_memory = True
+
+    class Meta(NamedModel.Meta):
+        """Meta model class."""
+        app_label = _app_label
+
+
+class ResolveTestCase(ModelTableTestCase):
+    """Named model resolution unit test class.
+    """
+    table_models = (MyNamedModel, MyResolvedModel)
+
+    def setUp(self):
+        user = factories.UserFactory()
+        defaults = dict(creation_user=user, update_user=user,
+                        effective_user=user, site=Site.objects.get_current())
+        for model in self.table_models:
+            # alias matches sort before the name match
+            for name, alias in (('Aa', 'Zed'), ('Ab', u'z\xe9d'),
+                                ('Zed', None), (constants.UNKNOWN, None)):
+                model.objects.create(name=name, alias=alias, **defaults)
+
+    def test_resolve(self):
+        for model in self.table_models:
+            self.assertEqual(model.objects.resolve(' ZED ').name, 'Zed')
+            self.assertEqual(model.objects.resolve('aa').name, 'Aa')
+            self.assertIsNone(model.objects.resolve('none'))
+
+    def test_resolve_alias(self):
+        for model in self.table_models:
+            model.objects.filter(name='Zed').delete()
+            self.assertEqual(model.objects.resolve('zed').name, 'Aa')
+
+    def test_in_memory_copies(self):
+        first = MyResolvedModel.objects.resolve('zed')
+        first.alias = 'changed'
+        second = MyResolvedModel.objects.resolve('zed')
+        self.assertIsNot(first, second)
+        self.assertIsNone(second.alias)
+        with self.assertNumQueries(0):
+            MyResolvedModel.objects.resolve('aa')
+
+    def test_in_memory_bulk_create(self):
+        self.assertIsNone(MyResolvedModel.objects.resolve('new'))
+        instance = MyResolvedModel.objects.get(name='Aa')
+        instance.pk, instance.uuid, instance.name = None, uuid.uuid4(), 'New'
+        MyResolvedModel.objects.bulk_create([instance])
+        self.assertEqual(MyResolvedModel.objects.resolve('new').name, 'New')
+
+    def test_named_instance(self):
+        manager = MyNamedModel.objects
+        self.assertEqual(manager.named_instance('Ab').alias, u'z\xe9d')
+        self.assertEqual(manager.named_instance('zed').name, 'Zed')
+        self.assertEqual(manager.named_instance('none').name,
+                         constants.UNKNOWN)
+
+    def test_update_name_keys(self):
+        MyNamedModel.objects.filter(name__in=['Aa', 'Zed']).update(
+            name_key=None, alias_key='stale')
+        self.assertEqual(
+            MyNamedModel.objects.update_name_keys(batch_size=1), 2)
+        self.assertEqual(
+            list(MyNamedModel.objects.order_by('name').values_list(
+                'name_key', 'alias_key')),
+            [('aa', 'zed'), ('ab', 'zed'), ('unknown', None),
+             ('zed', None)])
+        self.assertEqual(MyNamedModel.objects.update_name_keys(), 0)
+
+
+class RecordsTestCase(ModelTableTestCase):
+    """Versioned model queryset records unit test class.
+    """
+    table_models = (MyNamedModel,)
+
+    def setUp(self):
+        user = factories.UserFactory()
+        self.site = Site.objects.get_current()
+        for name, alias in (('a', 'Alpha'), ('b', None)):
+            MyNamedModel.objects.create(
+                name=name, alias=alias, creation_user=user, update_user=user,
+                effective_user=user, site=self.site)
+
+    def test_records(self):
+        records = list(MyNamedModel.objects.order_by('name').as_records())
+        self.assertEqual([record.display_name for record in records],
+                         ['Alpha', 'b'])
+        record = records[0]
+        self.assertEqual(record.site_id, self.site.pk)
+        self.assertEqual(record.pk, record.id)
+        self.assertEqual(record.version, 1)
+        self.assertFalse(hasattr(record, '__dict__'))
+        with self.assertRaises(AttributeError):
+            record.name = 'c'
+
+    def test_fields(self):
+        queryset = MyNamedModel.objects.as_records(
+            'pk', 'name', 'alias', 'site')
+        record = queryset.filter(name='b').get()
+        self.assertEqual(record._fields, ('id', 'name', 'alias', 'site_id'))
+        self.assertEqual(record.display_name, 'b')
+        self.assertIs(type(record), type(queryset.first()))
+
+    def test_annotations(self):
+        record = MyNamedModel.objects.annotate(size=Length('name')).filter(
+            name='b').as_records('size', 'name', 'alias').get()
+        self.assertEqual(record._fields, ('size', 'name', 'alias'))
+        self.assertEqual((record.size, record.name), (1, 'b'))
+        record = MyNamedModel.objects.as_records('name', 'alias').annotate(
+            size=Length('name')).first()
+        self.assertEqual(record._fields, ('name', 'alias', 'size'))
+        self.assertEqual(record.size, 1)
+
+
+class NormalizeNameTestCase(TestCase):
+    """Name normalization unit test class.
+    """
+    def test_normalize(self):
+        self.assertEqual(normalize_name(u'Cura\xe7ao'), 'curacao')
+        self.assertEqual(normalize_name(u'STRASSE  x'), 'strasse x')
+
+    def test_empty(self):
+        self.assertIsNone(normalize_name(None))
+        self.assertIsNone(normalize_name('   '))
@@ -0,0 +1,73 @@
+"""
+.. module::  django_core_utils.tests.test_paginators
+   :synopsis: django_core_utils paginators unit test module.
+
+*django_core_utils* paginators unit test module.
+"""
+from __future__ import absolute_import, print_function
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.paginator import EmptyPage
+from django.db.models.signals import post_delete, post_save
+from django.test import TestCase
+
+from . import factories
+from ..paginators import ApproximateCountPaginator, cached_count
+from ..signals import instance_created, instance_deleted, track_count
+
+
+class SmallThresholdPaginator(ApproximateCountPaginator):
+    """Sample paginator class."""
+    count_threshold = 2
+
+
+class ApproximateCountPaginatorTestCase(TestCase):
+    """Approximate count paginator unit test class.
+    """
+    def setUp(self):
+        cache.clear()
+        factories.UserFactory.create_users(count=3)
+
+    def tearDown(self):
+        post_save.disconnect(instance_created, sender=User,
+                             dispatch_uid="django_core_utils.instance_created")
+        post_delete.disconnect(
+            instance_deleted, sender=User,
+            dispatch_uid="django_core_utils.instance_deleted")
+
+    def test_unfiltered_cached(self):
+        queryset = User.objects.order_by('pk')
+        self.assertEqual(ApproximateCountPaginator(queryset, 2).count, 3)
+        with self.assertNumQueries(0):
+            self.assertEqual(
+                ApproximateCountPaginator(queryset, 2).count, 3)
+
+    def test_filtered_bounded(self):
+        queryset = User.objects.filter(
+            username__startswith='test_user').order_by('pk')
+        paginator = SmallThresholdPaginator(queryset, 1)
+        self.assertEqual(paginator.count, 3)
+        self.assertEqual(str(paginator.count), 'more than 2')
+        self.assertEqual(str(ApproximateCountPaginator(queryset, 1).count),
+                         '3')
+
+    def test_pages_past_bound(self):
+        queryset = User.objects.filter(
+            username__startswith='test_user').order_by('pk')
+        paginator = SmallThresholdPaginator(queryset, 1)
+        self.assertEqual(paginator.num_pages, 3)
+        paginator = SmallThresholdPaginator(queryset, 2)
+        self.assertEqual(paginator.num_pages, 2)
+        self.assertEqual(len(paginator.page(2).object_list), 1)
+        self.assertEqual(len(paginator.page(3).object_list), 0)
+        with self.assertRaises(EmptyPage):
+            paginator.page(0)
+
+    def test_tracked_count(self):
+        track_count(User)
+        ApproximateCountPaginator(User.objects.order_by('pk'), 2).count
+        user = factories.UserFactory(username='another_user')
+        self.assertEqual(cached_count(User), 4)
+        user.delete()
+        self.assertEqual(cached_count(User), 3)
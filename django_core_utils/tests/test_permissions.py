@@ -0,0 +1,66 @@
+"""
+.. module::  django_core_utils.tests.test_permissions
+   :synopsis: django_core_utils permissions unit test module.
+
+*django_core_utils* permissions unit test module.
+"""
+from __future__ import absolute_import, print_function
+
+from django.contrib.auth.models import User
+from django.test import TestCase
+from rest_framework.test import APIRequestFactory
+
+from ..filters import IsCreatorFilterBackend
+from ..models import VersionedModel
+from ..permissions import IsCreatorOrReadOnly
+
+_app_label = 'test_permissions'
+
+
+class OwnedModel(VersionedModel):
+    """Sample model class."""
+    class Meta(VersionedModel.Meta):
+        """Meta model class."""
+        app_label = _app_label
+
+
+class Owned(object):
+    """Sample owned object class."""
+    def __init__(self, creation_user_id):
+        self.creation_user_id = creation_user_id
+
+
+class IsCreatorOrReadOnlyTestCase(TestCase):
+    """IsCreatorOrReadOnly unit test class.
+    """
+    def setUp(self):
+        self.factory = APIRequestFactory()
+        self.permission = IsCreatorOrReadOnly()
+
+    def _request(self, method, user_id):
+        request = getattr(self.factory, method)('/')
+        request.user = User(pk=user_id)
+        return request
+
+    def test_read(self):
+        request = self._request('get', 1)
+        self.assertTrue(
+            self.permission.has_object_permission(request, None, Owned(2)))
+
+    def test_write(self):
+        request = self._request('put', 1)
+        self.assertTrue(
+            self.permission.has_object_permission(request, None, Owned(1)))
+        self.assertFalse(
+            self.permission.has_object_permission(request, None, Owned(2)))
+
+    def test_filter_queryset(self):
+        queryset = OwnedModel.objects.all()
+        read = self._request('get', 1)
+        self.assertIs(
+            IsCreatorFilterBackend().filter_queryset(read, queryset, None),
+            queryset)
+        write = self._request('delete', 1)
+        filtered = IsCreatorFilterBackend().filter_queryset(
+            write, queryset, None)
+        self.assertIn('"creation_user_id" = 1', str(filtered.query))
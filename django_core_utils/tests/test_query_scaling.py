@@ -0,0 +1,134 @@
+"""
+.. module::  django_core_utils.tests.test_query_scaling
+   :synopsis: django_core_utils query count test helpers unit test module.
+
+*django_core_utils* query count test helpers unit test module.
+"""
+from __future__ import absolute_import, print_function
+
+import factory
+from django.conf.urls import url
+from django.test import override_settings
+from django.utils import six
+from rest_framework import generics, serializers
+from rest_framework.pagination import PageNumberPagination
+
+from . import factories
+from ..models import NamedModel
+from ..serializers import NamedModelSerializer
+from .api_test_utils import VersionedModelApiTestCase
+from .test_utils import ModelTableTestCase, VersionedModelTestCase
+
+_app_label = 'test_query_scaling'
+
+
+class ScalingModel(NamedModel):
+    """Sample named model class."""
+    class Meta(NamedModel.Meta):
+        """Meta model class."""
+        app_label = _app_label
+
+
+class ScalingModelFactory(factories.NamedModelFactory):
+    """Sample named model factory class."""
+    class Meta(object):
+        """Model meta class."""
+        model = ScalingModel
+        django_get_or_create = ('name',)
+
+    name = factory.Sequence(lambda number: 'scaling_{}'.format(number))
+
+
+class ScalingModelSerializer(NamedModelSerializer):
+    """Sample named model serializer class."""
+    class Meta(NamedModelSerializer.Meta):
+        """Meta class definition."""
+        model = ScalingModel
+
+
+class UpdateUsernameSerializer(ScalingModelSerializer):
+    """Sample serializer reading a related instance per row."""
+    update_username = serializers.SerializerMethodField()
+
+    class Meta(ScalingModelSerializer.Meta):
+        """Meta class definition."""
+        fields = ScalingModelSerializer.Meta.fields + ('update_username',)
+
+    def get_update_username(self, instance):
+        return instance.update_user.username
+
+
+class ScalingPagination(PageNumberPagination):
+    """Sample pagination class."""
+    page_size = 100
+
+
+class ScalingList(generics.ListAPIView):
+    """Sample paginated list view."""
+    queryset = ScalingModel.objects.order_by('id')
+    serializer_class = ScalingModelSerializer
+    pagination_class = ScalingPagination
+
+
+class UpdateUsernameList(ScalingList):
+    """Sample paginated list view issuing a query per row."""
+    serializer_class = UpdateUsernameSerializer
+
+
+urlpatterns = [
+    url(r'^scaling/$', ScalingList.as_view(), name='scaling-list'),
+    url(r'^usernames/$', UpdateUsernameList.as_view(),
+        name='username-list'),
+]
+
+
+class QueryScalingTestCase(ModelTableTestCase, VersionedModelTestCase):
+    """Query count helpers unit test class.
+    """
+    table_models = (ScalingModel,)
+
+    def _usernames(self):
+        return [instance.update_user.username
+                for instance in ScalingModel.objects.all()]
+
+    def test_assert_num_queries(self):
+        self.assertEqual(self.assert_num_queries(
+            1, ScalingModel.objects.count), 0)
+        with self.assertRaises(AssertionError):
+            self.assert_num_queries(0, ScalingModel.objects.count)
+        self.assertEqual(self.assert_num_queries(
+            None, ScalingModel.objects.count), 0)
+
+    def test_query_scaling(self):
+        count = self.verify_list_query_scaling(ScalingModelFactory)
+        self.assertEqual(count, 1)
+
+    def test_query_scaling_failure(self):
+        with six.assertRaisesRegex(self, AssertionError,
+                                   'query count grew'):
+            self.verify_list_query_scaling(
+                ScalingModelFactory, action=self._usernames)
+
+
+@override_settings(ROOT_URLCONF=__name__)
+class ApiQueryScalingTestCase(ModelTableTestCase,
+                              VersionedModelApiTestCase):
+    """Api query count helpers unit test class.
+    """
+    table_models = (ScalingModel,)
+    factory_class = ScalingModelFactory
+    url_list = 'scaling-list'
+
+    def test_list_paginated(self):
+        for _ in range(3):
+            self.create_instance_default()
+        response = self.verify_list(self.url_list, expected_count=3)
+        self.assertEqual(response.data['count'], 3)
+
+    def test_list_scaling(self):
+        self.verify_list_scaling()
+
+    def test_list_scaling_failure(self):
+        with six.assertRaisesRegex(self, AssertionError,
+                                   'query count grew'):
+            self.verify_list_scaling('username-list')
@@ -0,0 +1,83 @@
+"""
+.. module::  django_core_utils.tests.test_search
+   :synopsis: django_core_utils search unit test module.
+
+*django_core_utils* search unit test module.
+"""
+from __future__ import absolute_import, print_function
+
+from django.contrib.sites.models import Site
+from django.test import TestCase
+
+from . import factories
+from .. import search
+from ..models import NamedModel
+from .test_utils import ModelTableTestCase
+
+_app_label = 'test_search'
+
+
+class SearchedModel(NamedModel):
+    """Sample searched model class."""
+    class Meta(NamedModel.Meta):
+        """Meta model class."""
+        app_label = _app_label
+
+
+class FtsQueryTestCase(TestCase):
+    """Full text query conversion unit test class.
+    """
+    def test_terms(self):
+        self.assertEqual(search.fts_query(' united  sta'),
+                         '"united"* "sta"*')
+
+    def test_quotes(self):
+        self.assertEqual(search.fts_query('a"b'), '"a""b"*')
+
+
+class SearchTestCase(ModelTableTestCase):
+    """Model table full text search unit test class.
+    """
+    table_models = (SearchedModel,)
+
+    def setUp(self):
+        search.register(SearchedModel)
+        search.create_search_index(SearchedModel, populate=False)
+        user = factories.UserFactory()
+        defaults = dict(creation_user=user, update_user=user,
+                        effective_user=user, site=Site.objects.get_current())
+        for index in range(150):
+            SearchedModel.objects.create(
+                name='city {}'.format(index), description='town', **defaults)
+        SearchedModel.objects.create(
+            name='capital', alias='city city', description='town city',
+            **defaults)
+
+    def test_filtered(self):
+        self.assertEqual(SearchedModel.objects.search('city').count(), 151)
+        queryset = SearchedModel.objects.filter(name__in=[
+            'city 149', 'capital', 'village'])
+        self.assertEqual(
+            [instance.name for instance in search.search(queryset, 'city')],
+            ['capital', 'city 149'])
+        self.assertEqual(search.search(SearchedModel.objects.filter(
+            name='city 3'), 'town').count(), 1)
+
+    def test_limit(self):
+        self.assertEqual(
+            [instance.name for instance
+             in SearchedModel.objects.search('city', limit=1)], ['capital'])
+        self.assertFalse(SearchedModel.objects.search('absent').exists())
+
+    def test_terms(self):
+        self.assertEqual(
+            [instance.name for instance
+             in SearchedModel.objects.search('cap tow')], ['capital'])
+
+    def test_reindex_and_remove(self):
+        capital = SearchedModel.objects.get(name='capital')
+        search.index_instances(
+            SearchedModel, [(capital.pk, 'capital', None, 'town')])
+        self.assertEqual(SearchedModel.objects.search('city').count(), 150)
+        search.remove_instances(SearchedModel, [capital.pk])
+        self.assertFalse(SearchedModel.objects.search('capital').exists())
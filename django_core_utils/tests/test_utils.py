@@ -14,7 +14,9 @@ from random import choice, randrange
 import inflection
 from django.conf import settings
 from django.contrib.auth.models import User
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 
 from python_core_utils.core import class_name, instance_class_name
 
@@ -68,6 +70,32 @@ class TestCaseMixin(object):
     def force_debug(self, value=True):
         settings.DEBUG = value
 
+    def assert_num_queries(self, num_queries, func, *args, **kwargs):
+        """Call func, checking query count when num_queries is given."""
+        if num_queries is None:
+            return func(*args, **kwargs)
+        with self.assertNumQueries(num_queries):
+            return func(*args, **kwargs)
+
+    def verify_query_scaling(self, populate, action, count=2, factor=10):
+        """Verify action query count does not grow with row count.
+
+        The action is run after populate(count) and again once
+        count * factor rows exist; the second run may not issue more
+        queries than the first.
+        """
+        populate(count)
+        with CaptureQueriesContext(connection) as small:
+            action()
+        populate(count * factor - count)
+        with CaptureQueriesContext(connection) as large:
+            action()
+        self.assertTrue(
+            len(large) <= len(small),
+            "query count grew from {} to {} with {} and {} rows".format(
+                len(small), len(large), count, count * factor))
+        return len(small)
+
     def assert_instance_equal(self, reference, other, attrs=None):
         """Compare two object instances for the given attributes"""
         if attrs:
@@ -90,6 +118,29 @@ class BaseModelTestCase(TestCaseMixin, TestCase):
         TestCase.tearDown(self)
 
 
+class ModelTableTestCase(TestCase):
+    """Test case creating the tables of test models.
+
+    Test models are not installed, their tables are created before and
+    dropped after the test case transaction.
+    """
+    table_models = ()
+
+    @classmethod
+    def setUpClass(cls):
+        with connection.schema_editor() as editor:
+            for model in cls.table_models:
+                editor.create_model(model)
+        super(ModelTableTestCase, cls).setUpClass()
+
+    @classmethod
+    def tearDownClass(cls):
+        super(ModelTableTestCase, cls).tearDownClass()
+        with connection.schema_editor() as editor:
+            for model in reversed(cls.table_models):
+                editor.delete_model(model)
+
+
 class VersionedModelTestCase(BaseModelTestCase):
     """Versioned model unit test class.
     """
@@ -200,12 +251,16 @@ class VersionedModelTestCase(BaseModelTestCase):
         """
         pass
 
-    def verify_create(self, factory_class, **kwargs):
-        """Verify instance creation."""
+    def verify_create(self, factory_class, num_queries=None, **kwargs):
+        """Verify instance creation.
+
+        When num_queries is given, the creation query count is checked.
+        """
         model_class = factory_class.model_class()
         model_class_name = class_name(model_class)
 
-        instance = factory_class(**kwargs)
+        instance = self.assert_num_queries(
+            num_queries, factory_class, **kwargs)
         self.verify_instance(instance)
         instance.full_clean()
         self.assertEqual(
@@ -214,23 +269,46 @@ class VersionedModelTestCase(BaseModelTestCase):
             "Missing %s instances after create" % model_class_name)
         return instance
 
-    def verify_versioned_model_crud(self, factory_class, **kwargs):
+    def verify_versioned_model_crud(self, factory_class,
+                                    query_counts=None, **kwargs):
         """Verify versioned model simple crud operations.
+
+        query_counts optionally maps 'create', 'get', 'save' and 'delete'
+        to the expected query count of each operation.
         """
-        instance = self.verify_create(factory_class, **kwargs)
+        query_counts = query_counts or {}
+        instance = self.verify_create(
+            factory_class, num_queries=query_counts.get('create'), **kwargs)
         model_class = factory_class.model_class()
         model_class_name = class_name(model_class)
 
-        fetched = model_class.objects.get(pk=instance.id)
-        fetched.save()
+        fetched = self.assert_num_queries(
+            query_counts.get('get'), model_class.objects.get, pk=instance.id)
+        self.assert_num_queries(query_counts.get('save'), fetched.save)
         self.assertEqual(
             fetched.version, 2,
             "%s version mismatch after save" % model_class_name)
-        fetched.delete()
+        self.assert_num_queries(query_counts.get('delete'), fetched.delete)
         self.assertEqual(
             model_class.objects.count(),
             0,
             "%s instance mismatch after delete" % model_class_name)
+
+    def verify_list_query_scaling(self, factory_class, action=None,
+                                  count=2, factor=10):
+        """Verify listing query count does not grow with row count.
+
+        The default action evaluates all instances and their string
+        representation.
+        """
+        model_class = factory_class.model_class()
+
+        def default_action():
+            return [str(instance) for instance in model_class.objects.all()]
+
+        return self.verify_query_scaling(
+            lambda number: create_instances(factory_class, number),
+            action or default_action, count, factor)
 #
 #     def check_creation(self, model_class_name, count=1, version=1, **kwargs):
 #         klass = self.factory_for(model_class_name)
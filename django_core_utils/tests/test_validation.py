@@ -0,0 +1,87 @@
+"""
+.. module::  django_core_utils.tests.test_validation
+   :synopsis: django_core_utils validation unit test module.
+
+*django_core_utils* validation unit test module.
+"""
+from __future__ import absolute_import, print_function
+
+from unittest import skipIf
+
+from django.db import models
+from django.test import TestCase
+
+from .. import fields
+from ..validation import numpy, validate_columns
+
+_app_label = 'test_validation'
+
+
+class Site(models.Model):
+    """Sample validated model class."""
+    code = fields.char_field(max_length=4)
+    latitude = fields.latitude_field()
+    longitude = fields.longitude_field()
+    coverage = fields.percentage_field(null=True)
+    url = fields.uri_field(blank=True, null=True)
+
+    class Meta(object):
+        """Meta model class."""
+        app_label = _app_label
+
+
+class ValidateColumnsTestCase(TestCase):
+    """Columnar validation unit test class.
+    """
+    def test_valid(self):
+        self.assertEqual(validate_columns(Site, dict(
+            code=['ab', 'abcd'],
+            latitude=[10.5, -89],
+            longitude=[120, -179.5],
+            coverage=[None, 100],
+            url=['https://example.com', 'ftp://example.com/file'])), {})
+
+    def test_errors(self):
+        report = validate_columns(Site, dict(
+            code=['ab', 'abcde', None],
+            latitude=[91, 0, 0],
+            coverage=[0, 101, 50],
+            url=['not a url', 'not a url', None]))
+        self.assertEqual(set(report), {0, 1, 2})
+        self.assertEqual(set(report[0]), {'latitude', 'url'})
+        self.assertEqual(set(report[1]), {'code', 'coverage', 'url'})
+        self.assertEqual(list(report[2]), ['code'])
+        self.assertIn('latitude', report[0]['latitude'][0])
+
+    def test_field_definitions(self):
+        report = validate_columns(
+            dict(percent=fields.percentage_field()),
+            dict(percent=[50, -1]))
+        self.assertEqual(list(report), [1])
+
+
+@skipIf(numpy is None, 'numpy is not installed')
+class ValidateArraysTestCase(TestCase):
+    """Columnar numpy array validation unit test class.
+    """
+    def test_integers(self):
+        report = validate_columns(Site, dict(
+            latitude=numpy.array([10, 91, -89]),
+            coverage=numpy.array([0, 50, 101], dtype=numpy.int8)))
+        self.assertEqual(list(report), [1, 2])
+        self.assertEqual(list(report[1]), ['latitude'])
+        self.assertEqual(list(report[2]), ['coverage'])
+
+    def test_decimal_digits(self):
+        report = validate_columns(Site, dict(
+            longitude=numpy.array([45.123, 1.1234567, 179.25, 1234.5])))
+        self.assertEqual(sorted(report), [1, 3])
+        self.assertIn('decimal places', report[1]['longitude'][0])
+        self.assertEqual(len(report[3]['longitude']), 2)
+
+    def test_text(self):
+        report = validate_columns(Site, dict(
+            code=numpy.array(['ab', 'abcde']),
+            url=numpy.array(['https://example.com', 'not a url'])))
+        self.assertEqual(report, {1: dict(
+            code=report[1]['code'], url=report[1]['url'])})
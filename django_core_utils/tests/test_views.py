@@ -0,0 +1,209 @@
+"""
+.. module::  django_core_utils.tests.test_views
+   :synopsis: django_core_utils views unit test module.
+
+*django_core_utils* views unit test module.
+"""
+from __future__ import absolute_import, print_function
+
+from django.contrib.sites.models import Site
+from django.http import QueryDict
+from django.test import TestCase
+from rest_framework import permissions
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from . import factories
+from ..models import VersionedModel
+from ..permissions import IsCreatorOrReadOnly
+from ..serializers import VersionedModelSerializer
+from ..views import (NOT_FOUND, ObjectDetailView, ObjectListView,
+                     instance_detail, multi_get_data, multi_get_lookup,
+                     requires_instance)
+from .test_utils import ModelTableTestCase
+
+_app_label = 'test_views'
+
+
+class Note(VersionedModel):
+    """Sample versioned model class."""
+    class Meta(VersionedModel.Meta):
+        """Meta model class."""
+        app_label = _app_label
+
+
+class NoteSerializer(VersionedModelSerializer):
+    """Sample versioned model serializer class."""
+    class Meta(VersionedModelSerializer.Meta):
+        """Meta class definition."""
+        model = Note
+
+
+class NoteList(ObjectListView):
+    """Sample soft deleted list view class."""
+    queryset = Note.objects.order_by('id')
+    serializer_class = NoteSerializer
+    soft_delete = True
+
+
+class NoteDetail(ObjectDetailView):
+    """Sample soft deleting detail view class."""
+    queryset = Note.objects.all()
+    serializer_class = NoteSerializer
+    permission_classes = (permissions.IsAuthenticated, IsCreatorOrReadOnly)
+    soft_delete = True
+
+
+class IsCreator(permissions.BasePermission):
+    """Sample permission restricting all access to creators."""
+    def has_object_permission(self, request, view, obj):
+        return obj.creation_user_id == request.user.pk
+
+
+class ChunkedNoteList(NoteList):
+    """Sample multi-get list view with small chunks."""
+    permission_classes = (permissions.IsAuthenticated, IsCreator)
+    multi_get_chunk_size = 2
+
+
+class MultiGetTestCase(TestCase):
+    """Multi-get helpers unit test class.
+    """
+    def test_lookup_ids(self):
+        lookup = multi_get_lookup(QueryDict('ids=3, 1,,2'))
+        self.assertEqual(lookup, ('id', 'pk', ['3', '1', '2']),
+                         "invalid ids lookup %s" % (lookup,))
+
+    def test_lookup_uuids(self):
+        key_name, field_name, values = multi_get_lookup(
+            QueryDict('uuids=a,b'))
+        self.assertEqual((key_name, field_name), ('uuid', 'uuid'))
+        self.assertEqual(values, ['a', 'b'])
+
+    def test_lookup_model(self):
+        lookup = multi_get_lookup(QueryDict('ids=3,x'), Note)
+        self.assertEqual(lookup, ('id', 'pk', [3, 'x']))
+
+    def test_lookup_absent(self):
+        self.assertIsNone(multi_get_lookup(QueryDict('name=x')))
+
+    def test_data_order_and_markers(self):
+        first, second = object(), object()
+        instances = [second, None, first, second]
+        values = ['2', '7', '1', '2']
+        calls = []
+
+        def serialize(found):
+            calls.append(found)
+            return [{'id': values[instances.index(instance)]}
+                    for instance in found]
+
+        data = multi_get_data(instances, serialize, 'id', values)
+        self.assertEqual(len(calls), 1, "expected single serialization")
+        self.assertEqual(calls[0], [second, first])
+        self.assertEqual(data, [{'id': '2'},
+                                {'id': '7', NOT_FOUND: True},
+                                {'id': '1'},
+                                {'id': '2'}])
+
+
+class RequiresInstanceTestCase(TestCase):
+    """Soft delete permission inspection unit test class.
+    """
+    def test_model_level_permission(self):
+        self.assertFalse(requires_instance(permissions.IsAuthenticated()))
+
+    def test_object_level_permission(self):
+        self.assertTrue(
+            requires_instance(permissions.DjangoObjectPermissions()))
+
+
+class ViewTestCase(ModelTableTestCase):
+    """Versioned model views base unit test class.
+    """
+    table_models = (Note,)
+
+    def setUp(self):
+        self.factory = APIRequestFactory()
+        self.owner, self.other = factories.UserFactory.create_users(count=2)
+        self.notes = [
+            Note.objects.create(
+                creation_user=self.owner, update_user=self.owner,
+                effective_user=self.owner, site=Site.objects.get_current())
+            for index in range(3)]
+
+    def _request(self, method, path='/', user=None, **kwargs):
+        request = getattr(self.factory, method)(path, **kwargs)
+        force_authenticate(request, user=user or self.owner)
+        return request
+
+    def _detail(self, method, note, user=None):
+        return NoteDetail.as_view()(
+            self._request(method, user=user), pk=note.pk)
+
+    def _list(self, path='/', user=None):
+        return NoteList.as_view()(self._request('get', path, user=user))
+
+
+class SoftDeleteViewTestCase(ViewTestCase):
+    """Soft deleting views unit test class.
+    """
+    def test_soft_delete(self):
+        note = self.notes[0]
+        response = self._detail('delete', note, user=self.owner)
+        self.assertEqual(response.status_code, 204)
+        deleted = Note.objects.get(pk=note.pk)
+        self.assertTrue(deleted.deleted)
+        self.assertEqual(deleted.version, 2)
+        self.assertGreater(deleted.update_time, note.update_time)
+        self.assertEqual(self._detail('delete', note).status_code, 404)
+
+    def test_hidden(self):
+        note = self.notes[0]
+        self._detail('delete', note)
+        self.assertEqual(self._detail('get', note).status_code, 404)
+        self.assertEqual([item['id'] for item in self._list().data],
+                         [other.pk for other in self.notes[1:]])
+        data = self._list('/?ids={}'.format(note.pk)).data
+        self.assertEqual(data, [{'id': note.pk, NOT_FOUND: True}])
+
+    def test_non_owner(self):
+        note = self.notes[0]
+        response = self._detail('delete', note, user=self.other)
+        self.assertEqual(response.status_code, 404)
+        unchanged = Note.objects.get(pk=note.pk)
+        self.assertEqual((unchanged.deleted, unchanged.version), (False, 1))
+
+    def test_function_view(self):
+        note = self.notes[0]
+        request = self._request('delete')
+        request.user = self.owner
+        for status_code in (204, 404):
+            response = instance_detail(request, note.pk, Note,
+                                       NoteSerializer, soft_delete=True)
+            self.assertEqual(response.status_code, status_code)
+        response = instance_detail(self._request('get'), note.pk, Note,
+                                   NoteSerializer, soft_delete=True)
+        self.assertEqual(response.status_code, 404)
+        self.assertEqual(Note.objects.get(pk=note.pk).update_user,
+                         self.owner)
+
+
+class MultiGetViewTestCase(ViewTestCase):
+    """Multi-get list view unit test class.
+    """
+    def test_chunked_order_and_permissions(self):
+        first, second, third = self.notes
+        Note.objects.filter(pk=second.pk).update(creation_user=self.other)
+        path = '/?ids={},{},999,{},x,{}'.format(
+            third.pk, first.pk, second.pk, third.pk)
+        request = self._request('get', path)
+        with self.assertNumQueries(2):
+            response = ChunkedNoteList.as_view()(request)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            [item.get('id') for item in response.data],
+            [third.pk, first.pk, 999, second.pk, 'x', third.pk])
+        self.assertEqual(
+            [NOT_FOUND in item for item in response.data],
+            [False, False, True, True, True, False])
+        self.assertIsInstance(response.data[2]['id'], int)
@@ -5,8 +5,15 @@
 The *utils* module is a collection of Django utility functions.
 
 """
+import unicodedata
+
 from django.contrib.sites.models import Site
+from django.db import transaction
+from django.db.models.signals import m2m_changed
 from django.utils import timezone
+from django.utils.encoding import force_text
+
+SYNC_CHUNK_SIZE = 500
 
 
 def current_site(request=None):
@@ -21,3 +28,93 @@ def oldest_timestamp():
     return timezone.now().replace(year=2000, month=1, day=1,
                                   hour=0, minute=0, second=0,
                                   microsecond=0)
+
+
+def normalize_name(value):
+    """Return a case, accent and whitespace insensitive name key.
+    """
+    if value is None:
+        return None
+    value = unicodedata.normalize('NFKD', force_text(value))
+    value = ''.join(char for char in value
+                    if not unicodedata.combining(char))
+    value = getattr(value, 'casefold', value.lower)()
+    return ' '.join(value.split()) or None
+
+
+def _send_m2m_changed(manager, action, pk_set):
+    m2m_changed.send(
+        sender=manager.through, action=action, instance=manager.instance,
+        reverse=manager.reverse, model=manager.model, pk_set=pk_set,
+        using=manager.db)
+
+
+def sync_many_to_many(manager, target_ids, chunk_size=SYNC_CHUNK_SIZE,
+                      bump_version=False, user=None):
+    """Replace the members of a many to many relation.
+
+    Applies the differences only: current ids are read from the
+    through table with a single id only query, new members are added
+    with bulk inserts and stale ones removed with deletes of at most
+    chunk_size rows, so the cost is proportional to the number of
+    changes rather than members.  m2m_changed signals are sent for
+    each chunk, as by add() and remove().  Changes are applied in a
+    transaction, which optionally also increments the version and
+    update time of the relation owner.
+
+    :param manager: Many to many related manager.
+    :param target_ids: Ids of the required members.
+    :param chunk_size: Maximum number of rows inserted or deleted per
+        query.
+    :param bump_version: Increment the owner version when changed.
+    :param user: User recorded as owner update and effective user.
+    :returns: Tuple of added and removed id sets.
+    """
+    through = manager.through
+    source_attname = through._meta.get_field(
+        manager.source_field_name).attname
+    target_field = through._meta.get_field(manager.target_field_name)
+    target_attname = target_field.attname
+    source_id = manager.related_val[0]
+    rows = through._default_manager.using(manager.db).filter(
+        **{source_attname: source_id})
+    current_ids = set(rows.values_list(target_attname, flat=True))
+    target_ids = set(target_field.to_python(pk) for pk in target_ids)
+    removed = current_ids - target_ids
+    added = target_ids - current_ids
+    if not removed and not added:
+        return added, removed
+    with transaction.atomic(using=manager.db):
+        removed_ids = sorted(removed)
+        for start in range(0, len(removed_ids), chunk_size):
+            chunk = set(removed_ids[start:start + chunk_size])
+            _send_m2m_changed(manager, 'pre_remove', chunk)
+            rows.filter(**{'{}__in'.format(target_attname): chunk}).delete()
+            _send_m2m_changed(manager, 'post_remove', chunk)
+        added_ids = sorted(added)
+        for start in range(0, len(added_ids), chunk_size):
+            chunk = set(added_ids[start:start + chunk_size])
+            _send_m2m_changed(manager, 'pre_add', chunk)
+            through._default_manager.using(manager.db).bulk_create([
+                through(**{source_attname: source_id, target_attname: pk})
+                for pk in chunk])
+            _send_m2m_changed(manager, 'post_add', chunk)
+        if bump_version:
+            bump_instance_version(manager.instance, user)
+    return added, removed
+
+
+def bump_instance_version(instance, user=None):
+    """Increment the version and update time of a saved instance
+    with a single update query, mirrored on the instance.
+
+    :param instance: Versioned model instance.
+    :param user: User recorded as update and effective user.
+    """
+    update_time = timezone.now()
+    type(instance)._default_manager.filter(pk=instance.pk).versioned_update(
+        user=user, update_time=update_time)
+    instance.version += 1
+    instance.update_time = update_time
+    if user is not None:
+        instance.update_user = instance.effective_user = user
@@ -0,0 +1,207 @@
+"""
+.. module::  django_core_utils.validation
+   :synopsis:  django_core_utils columnar validation module.
+
+django_core_utils columnar validation module.
+The *validation* module validates batches of column values against the
+validators of model fields, for bulk imports where full_clean per
+instance is too slow.  Range and length checks are evaluated over whole
+columns, vectorized with numpy when the column is a numeric or text
+array, as are decimal digit checks of numeric arrays; other
+validators, such as regular expressions, run once per distinct value.
+Error messages are those of the field validators.
+"""
+from __future__ import absolute_import
+
+from collections import defaultdict
+from decimal import Decimal
+
+from django.core import validators
+from django.core.exceptions import ValidationError
+
+from . import fields
+
+try:
+    import numpy
+except ImportError:  # pragma: no cover
+    numpy = None
+
+# (validator function, (low, high, inclusive))
+RANGE_VALIDATORS = (
+    (fields.latitude_validator, (-90, 90, False)),
+    (fields.longitude_validator, (-180, 180, False)),
+    (fields.percent_validator, (0, 100, True)),
+)
+
+
+def _is_array(values, kinds):
+    return numpy is not None and isinstance(values, numpy.ndarray) and \
+        values.dtype.kind in kinds
+
+
+def _range(validator):
+    """Return (low, high, inclusive) of range validators or None."""
+    for function, value_range in RANGE_VALIDATORS:
+        if validator is function:
+            return value_range
+    if isinstance(validator, validators.MinValueValidator):
+        return validator.limit_value, None, True
+    if isinstance(validator, validators.MaxValueValidator):
+        return None, validator.limit_value, True
+    return None
+
+
+def range_failures(values, low, high, inclusive=True):
+    """Return indexes of values outside a range, ignoring None."""
+    if _is_array(values, "iuf"):
+        valid = numpy.ones(len(values), dtype=bool)
+        if low is not None:
+            valid &= values >= low if inclusive else values > low
+        if high is not None:
+            valid &= values <= high if inclusive else values < high
+        return numpy.flatnonzero(~valid).tolist()
+    failures = []
+    for index, value in enumerate(values):
+        if value is None:
+            continue
+        if low is not None and (value < low if inclusive else value <= low):
+            failures.append(index)
+        elif high is not None and (
+                value > high if inclusive else value >= high):
+            failures.append(index)
+    return failures
+
+
+def length_failures(values, max_length):
+    """Return indexes of values longer than max_length, ignoring None."""
+    if _is_array(values, "U"):
+        return numpy.flatnonzero(
+            numpy.char.str_len(values) > max_length).tolist()
+    return [index for index, value in enumerate(values)
+            if value is not None and len(value) > max_length]
+
+
+def decimal_failures(values, max_digits, decimal_places):
+    """Return indexes of numeric array values with more than
+    decimal_places decimal places or max_digits - decimal_places whole
+    digits.
+    """
+    invalid = ~(numpy.abs(values) < float(10 ** (max_digits -
+                                                 decimal_places)))
+    if values.dtype.kind == "f":
+        scaled = values * float(10 ** decimal_places)
+        invalid |= ~numpy.isclose(scaled, numpy.round(scaled),
+                                  rtol=1e-12, atol=1e-6)
+    return numpy.flatnonzero(invalid).tolist()
+
+
+def exact_decimal(value):
+    """Return the decimal of a number, floats by their shortest repr."""
+    if isinstance(value, float):
+        return Decimal(repr(value))
+    return Decimal(value)
+
+
+def distinct_failures(values, validator, convert=None):
+    """Return indexes of values failing a validator, run once per
+    distinct value, optionally converted first.  Empty values are
+    ignored.
+    """
+    failed = {}
+    failures = []
+    for index, value in enumerate(values):
+        if value in validators.EMPTY_VALUES:
+            continue
+        try:
+            hash(value)
+            key = value
+        except TypeError:
+            key = index
+        if key not in failed:
+            try:
+                validator(convert(value) if convert else value)
+                failed[key] = False
+            except ValidationError:
+                failed[key] = True
+        if failed[key]:
+            failures.append(index)
+    return failures
+
+
+def _messages(validator, value):
+    try:
+        validator(value)
+    except ValidationError as error:
+        return error.messages
+    return []
+
+
+def _model_fields(model_or_fields):
+    if isinstance(model_or_fields, dict):
+        return model_or_fields
+    return dict((field.name, field)
+                for field in model_or_fields._meta.concrete_fields)
+
+
+def _convert(field, name, values, report):
+    """Convert list values to python, reporting empty and invalid
+    values, which are replaced by None.
+    """
+    converted = []
+    for index, value in enumerate(values):
+        if value is None and not field.null:
+            report[index][name].append(field.error_messages["null"])
+        elif value in validators.EMPTY_VALUES and value is not None and \
+                not field.blank:
+            report[index][name].append(field.error_messages["blank"])
+        elif value not in validators.EMPTY_VALUES:
+            try:
+                converted.append(field.to_python(value))
+                continue
+            except ValidationError as error:
+                report[index][name].extend(error.messages)
+        converted.append(None)
+    return converted
+
+
+def validate_columns(model_or_fields, columns):
+    """Validate columns of values against model field validators.
+
+    :param model_or_fields: Model class, or dict of field name to field
+        instance, e.g. as returned by field factory functions.
+    :param columns: dict of field name to a list or numpy array of
+        values, all of the same length.  Numeric arrays of decimal
+        fields are checked for the decimal places and whole digits of
+        their values, unlike floats in lists which are converted with
+        the field max_digits precision.
+    :returns:  dict of row index to dict of field name to error
+        messages, for rows with errors.
+    """
+    model_fields = _model_fields(model_or_fields)
+    report = defaultdict(lambda: defaultdict(list))
+    for name, values in columns.items():
+        field = model_fields[name]
+        if _is_array(values, "iufU"):
+            # python scalars, for validators and to_python
+            column = values.tolist()
+        else:
+            values = column = _convert(field, name, values, report)
+        for validator in field.validators:
+            convert = field.to_python
+            value_range = _range(validator)
+            if value_range is not None:
+                failures = range_failures(values, *value_range)
+            elif isinstance(validator, validators.MaxLengthValidator):
+                failures = length_failures(values, validator.limit_value)
+            elif isinstance(validator, validators.DecimalValidator) and \
+                    _is_array(values, "iuf"):
+                failures = decimal_failures(
+                    values, validator.max_digits, validator.decimal_places)
+                convert = exact_decimal
+            else:
+                failures = distinct_failures(column, validator,
+                                             field.to_python)
+            for index in failures:
+                report[index][name].extend(
+                    _messages(validator, convert(column[index])))
+    return dict((index, dict(errors)) for index, errors in report.items())
@@ -15,21 +15,140 @@ That is the reason why the implementation below supports these options.
 from __future__ import absolute_import
 
 from django.contrib.auth.models import User
-from rest_framework import generics, mixins, status
+from django.core.exceptions import ValidationError
+from django.http import Http404
+from rest_framework import generics, mixins, permissions, status
 from rest_framework.generics import GenericAPIView
+from rest_framework.pagination import PageNumberPagination
 from rest_framework.response import Response
 
 from . import constants
+from .caching import USER_GENERATION_KEY, CachedResponseMixin
 from .serializers import UserSerializer
 
+MULTI_GET_CHUNK_SIZE = 500
+NOT_FOUND = "not_found"
+
+_multi_get_params = (
+    (constants.QUERY_PARAM_IDS, "id", "pk"),
+    (constants.QUERY_PARAM_UUIDS, "uuid", "uuid"))
+
+
+def _lookup_field(model, field_name):
+    opts = model._meta
+    return opts.pk if field_name == "pk" else opts.get_field(field_name)
+
+
+def _to_python(field, value):
+    """Convert value to the field type, None if not convertible."""
+    try:
+        return field.to_python(value)
+    except ValidationError:
+        return None
+
+
+def multi_get_lookup(query_params, model=None):
+    """Parse multi-get query parameters.
+
+    Returns a (key name, field name, values) tuple for requests carrying
+    a comma separated ``ids`` or ``uuids`` parameter, None otherwise.
+    Given the model, values are converted to the lookup field type,
+    those which cannot be converted are kept as is.
+    """
+    for param, key_name, field_name in _multi_get_params:
+        raw = query_params.get(param)
+        if raw:
+            values = [value.strip() for value in raw.split(",")
+                      if value.strip()]
+            if model is not None:
+                field = _lookup_field(model, field_name)
+                keys = [_to_python(field, value) for value in values]
+                values = [value if key is None else key
+                          for key, value in zip(keys, values)]
+            return key_name, field_name, values
+    return None
+
+
+def fetch_in_order(queryset, field_name, values,
+                   chunk_size=MULTI_GET_CHUNK_SIZE):
+    """Fetch instances matching values, preserving the input order.
+
+    One IN query is issued per chunk of distinct values.  The result
+    is aligned with values, holding None for values without a match
+    or which cannot be converted to the field type.
+    """
+    field = _lookup_field(queryset.model, field_name)
+    keys = [_to_python(field, value) for value in values]
+    distinct_keys = list(set(key for key in keys if key is not None))
+    found = {}
+    for start in range(0, len(distinct_keys), chunk_size):
+        chunk = distinct_keys[start:start + chunk_size]
+        lookup = {"{}__in".format(field_name): chunk}
+        for instance in queryset.filter(**lookup):
+            found[getattr(instance, field.attname)] = instance
+    return [found.get(key) for key in keys]
+
+
+def multi_get_data(instances, serialize, key_name, values):
+    """Serialize multi-get results in input order.
+
+    Instances are serialized in a single pass; missing entries are
+    replaced with an explicit not found marker.
+    """
+    unique = []
+    positions = {}
+    for instance in instances:
+        if instance is not None and id(instance) not in positions:
+            positions[id(instance)] = len(unique)
+            unique.append(instance)
+    serialized = serialize(unique) if unique else []
+    return [serialized[positions[id(instance)]] if instance is not None
+            else {key_name: value, NOT_FOUND: True}
+            for instance, value in zip(instances, values)]
+
+
+def request_user(request):
+    """Return the authenticated request user or None.
+    """
+    user = getattr(request, "user", None)
+    if user is not None and user.is_authenticated:
+        return user
+    return None
+
+
+def requires_instance(permission):
+    """Check if permission implements an object level check.
+
+    Such permissions cannot be evaluated without fetching the instance
+    unless they also provide a filter_queryset method.
+    """
+    method = type(permission).has_object_permission
+    base = permissions.BasePermission.has_object_permission
+    return (getattr(method, "__func__", method) is not
+            getattr(base, "__func__", base))
+
 
 def instance_list(request, model_class,
-                  serializer_class, content_format=None):
+                  serializer_class, content_format=None,
+                  soft_delete=False):
     """
     List all versioned model instances, or create a new instance.
+
+    With soft_delete, deleted instances are excluded.
     """
+    queryset = model_class.objects.all()
+    if soft_delete:
+        queryset = queryset.filter(deleted=False)
     if request.method == constants.HTTP_GET:
-        instances = model_class.objects.all()
+        lookup = multi_get_lookup(request.query_params, model_class)
+        if lookup:
+            key_name, field_name, values = lookup
+            instances = fetch_in_order(queryset, field_name, values)
+            return Response(multi_get_data(
+                instances,
+                lambda found: serializer_class(found, many=True).data,
+                key_name, values))
+        instances = queryset
         serializer = serializer_class(instances, many=True)
         return Response(serializer.data)
 
@@ -44,11 +163,26 @@ def instance_list(request, model_class,
 
 
 def instance_detail(request, pk, model_class,
-                    serializer_class, content_format=None):
+                    serializer_class, content_format=None,
+                    soft_delete=False):
     """Fetch, update or delete versioned model instance.
+
+    With soft_delete, delete requests mark the instance as deleted
+    using a single update query instead of deleting it, and deleted
+    instances are not found.
     """
+    queryset = model_class.objects.all()
+    if soft_delete:
+        queryset = queryset.filter(deleted=False)
+    if request.method == constants.HTTP_DELETE and soft_delete:
+        count = queryset.filter(pk=pk).soft_delete(
+            user=request_user(request))
+        if not count:
+            return Response(status=status.HTTP_404_NOT_FOUND)
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
     try:
-        snippet = model_class.objects.get(pk=pk)
+        snippet = queryset.get(pk=pk)
     except model_class.DoesNotExist:
         return Response(status=status.HTTP_404_NOT_FOUND)
 
@@ -69,7 +203,55 @@ def instance_detail(request, pk, model_class,
         return Response(status=status.HTTP_204_NO_CONTENT)
 
 
-class ObjectListView(GenericAPIView):
+class ExcludeDeletedMixin(object):
+    """Mixin excluding soft deleted instances from view querysets when
+    soft_delete is set.
+    """
+    soft_delete = False
+
+    def get_queryset(self):
+        queryset = super(ExcludeDeletedMixin, self).get_queryset()
+        if self.soft_delete:
+            queryset = queryset.filter(deleted=False)
+        return queryset
+
+
+class MultiGetMixin(object):
+    """Mixin adding multi-get support to list views.
+
+    ``?ids=1,2,3`` or ``?uuids=...`` fetches the requested objects in
+    chunked IN queries and returns them in input order, with not found
+    markers for missing objects.  Object permissions are checked as
+    in the detail views, objects failing them are marked as not found.
+    """
+    multi_get_chunk_size = MULTI_GET_CHUNK_SIZE
+
+    def has_object_permissions(self, request, instance):
+        """Check if the request passes the object permissions of instance.
+        """
+        return all(permission.has_object_permission(request, self, instance)
+                   for permission in self.get_permissions())
+
+    def multi_get(self, request):
+        """Return multi-get response or None for regular list requests.
+        """
+        queryset = self.filter_queryset(self.get_queryset())
+        lookup = multi_get_lookup(request.query_params, queryset.model)
+        if lookup is None:
+            return None
+        key_name, field_name, values = lookup
+        instances = [
+            instance if instance is not None and
+            self.has_object_permissions(request, instance) else None
+            for instance in fetch_in_order(queryset, field_name, values,
+                                           self.multi_get_chunk_size)]
+        return Response(multi_get_data(
+            instances,
+            lambda found: self.get_serializer(found, many=True).data,
+            key_name, values))
+
+
+class ObjectListView(ExcludeDeletedMixin, MultiGetMixin, GenericAPIView):
     """Base class for versioned model listing of all objects,
     or create a new object.
     Derived classes are expected to define two class level attributes:
@@ -78,6 +260,9 @@ class ObjectListView(GenericAPIView):
     """
 
     def get(self, request, content_format=None):
+        response = self.multi_get(request)
+        if response is not None:
+            return response
         objects = self.get_queryset()
         serializer = self.get_serializer(objects, many=True)
         return Response(serializer.data)
@@ -90,7 +275,37 @@ class ObjectListView(GenericAPIView):
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 
-class ObjectDetailView(GenericAPIView):
+class SoftDeleteMixin(ExcludeDeletedMixin):
+    """Mixin adding soft delete support to detail views.
+
+    When soft_delete is set, delete requests run a single update
+    marking the instance as deleted, bumping its version and update
+    time, and deleted instances are not found.  Permissions providing
+    filter_queryset are applied to the update; other object level
+    permissions require fetching the instance first.  Hard deletes
+    remain available through the admin.
+    """
+
+    def perform_soft_delete(self, request):
+        """Soft delete the instance, returning the response."""
+        perms = self.get_permissions()
+        if any(not hasattr(permission, "filter_queryset") and
+               requires_instance(permission) for permission in perms):
+            queryset = self.get_queryset().filter(pk=self.get_object().pk)
+        else:
+            lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+            queryset = self.filter_queryset(self.get_queryset()).filter(
+                **{self.lookup_field: self.kwargs[lookup_url_kwarg]})
+            for permission in perms:
+                if hasattr(permission, "filter_queryset"):
+                    queryset = permission.filter_queryset(
+                        request, queryset, self)
+        if not queryset.soft_delete(user=request_user(request)):
+            raise Http404
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+
+class ObjectDetailView(SoftDeleteMixin, GenericAPIView):
     """Base class for versioned models to get, update or delete an instance.
     Derived classes are expected to define to class level attributes:
     - queryset = ModelClass.objects.all()
@@ -113,12 +328,16 @@ class ObjectDetailView(GenericAPIView):
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
     def delete(self, request, pk, content_format=None):
+        if self.soft_delete:
+            return self.perform_soft_delete(request)
         snippet = self.get_object()
         snippet.delete()
         return Response(status=status.HTTP_204_NO_CONTENT)
 
 
-class ObjectListMixin(mixins.ListModelMixin,
+class ObjectListMixin(ExcludeDeletedMixin,
+                      MultiGetMixin,
+                      mixins.ListModelMixin,
                       mixins.CreateModelMixin,
                       generics.GenericAPIView):
     """Base class for versioned models list and post using mixins.
@@ -130,13 +349,17 @@ class ObjectListMixin(mixins.ListModelMixin,
     # serializer_class = SerializerClass
 
     def get(self, request, *args, **kwargs):
+        response = self.multi_get(request)
+        if response is not None:
+            return response
         return self.list(request, *args, **kwargs)
 
     def post(self, request, *args, **kwargs):
         return self.create(request, *args, **kwargs)
 
 
-class ObjectDetailMixin(mixins.RetrieveModelMixin,
+class ObjectDetailMixin(SoftDeleteMixin,
+                        mixins.RetrieveModelMixin,
                         mixins.UpdateModelMixin,
                         mixins.DestroyModelMixin,
                         generics.GenericAPIView):
@@ -153,16 +376,34 @@ class ObjectDetailMixin(mixins.RetrieveModelMixin,
         return self.update(request, partial=True, *args, **kwargs)
 
     def delete(self, request, *args, **kwargs):
+        if self.soft_delete:
+            return self.perform_soft_delete(request)
         return self.destroy(request, *args, **kwargs)
 
 
-class UserList(generics.ListAPIView):
-    """List all users, or create a new user instance."""
-    queryset = User.objects.all()
+class UserPagination(PageNumberPagination):
+    """User list pagination class."""
+    page_size = 100
+    page_size_query_param = "page_size"
+    max_page_size = 1000
+
+
+class UserList(CachedResponseMixin, generics.ListAPIView):
+    """List all users, or create a new user instance.
+
+    Responses are paginated and cached until a user is saved or deleted.
+    """
+    queryset = User.objects.order_by("id")
     serializer_class = UserSerializer
+    pagination_class = UserPagination
+    cache_generation_key = USER_GENERATION_KEY
 
 
-class UserDetail(generics.RetrieveAPIView):
-    """Fetch, update or delete versioned model instance."""
+class UserDetail(CachedResponseMixin, generics.RetrieveAPIView):
+    """Fetch, update or delete versioned model instance.
+
+    Responses are cached until a user is saved or deleted.
+    """
     queryset = User.objects.all()
     serializer_class = UserSerializer
+    cache_generation_key = USER_GENERATION_KEY